@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'blog_project.settings')
+# Read endpoints run as coroutines under ASGI (see posts/asyncviews.py)
+os.environ.setdefault('API_ASYNC_READS', '1')
 
 application = get_asgi_application()
@@ -0,0 +1,145 @@
+"""
+Read replicas with read-your-writes stickiness.
+
+ReplicaMiddleware decides, once per request, where reads go: safe-method
+requests to the API paths in DATABASE_REPLICA_PATHS read from one of the
+DATABASE_REPLICAS aliases (picked at random, then kept for the whole
+request); everything else reads from the primary. ReplicaRouter applies
+that choice to the apps in DATABASE_REPLICA_APPS and sends every write to
+the primary.
+
+After a successful write the client gets a signed `db_pin` cookie valid for
+DATABASE_PIN_SECONDS; while it is valid its reads stay on the primary, so a
+user always sees their own writes even when the replicas lag behind.
+"""
+import contextvars
+import random
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.core import signing
+
+PIN_COOKIE = "db_pin"
+PIN_SALT = "blog_project.replicas.pin"
+SAFE_METHODS = ("GET", "HEAD", "OPTIONS")
+
+# Replica alias the current request reads from, or None for the primary
+_read_alias = contextvars.ContextVar("read_alias", default=None)
+
+
+def get_primary():
+    return getattr(settings, "DATABASE_PRIMARY", "default")
+
+
+def get_replicas():
+    return list(getattr(settings, "DATABASE_REPLICAS", []))
+
+
+def get_replica_paths():
+    return getattr(settings, "DATABASE_REPLICA_PATHS", ())
+
+
+def get_replica_apps():
+    return getattr(settings, "DATABASE_REPLICA_APPS", ())
+
+
+def get_pin_seconds():
+    return getattr(settings, "DATABASE_PIN_SECONDS", 5)
+
+
+def get_read_alias():
+    """
+    Replica alias the current request reads from, or None for the primary.
+    """
+    return _read_alias.get()
+
+
+def is_pinned(request):
+    return request.get_signed_cookie(
+        PIN_COOKIE, default=None, salt=PIN_SALT, max_age=get_pin_seconds()
+    ) is not None
+
+
+def choose_read_alias(request):
+    """
+    Replica alias for this request's reads, or None to read the primary.
+    """
+    replicas = get_replicas()
+    if not replicas or request.method not in SAFE_METHODS:
+        return None
+    if not request.path.startswith(tuple(get_replica_paths())):
+        return None
+    if is_pinned(request):
+        return None
+    return random.choice(replicas)
+
+
+class ReplicaMiddleware:
+    # Runs natively in both modes so async views keep their event loop; the
+    # context variable follows the request into sync_to_async calls.
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.async_mode = iscoroutinefunction(get_response)
+        if self.async_mode:
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if self.async_mode:
+            return self.__acall__(request)
+
+        token = _read_alias.set(choose_read_alias(request))
+        try:
+            response = self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.process_response(request, response)
+
+    async def __acall__(self, request):
+        token = _read_alias.set(choose_read_alias(request))
+        try:
+            response = await self.get_response(request)
+        finally:
+            _read_alias.reset(token)
+        return self.process_response(request, response)
+
+    def process_response(self, request, response):
+        if request.method not in SAFE_METHODS and response.status_code < 400 and get_replicas():
+            response.set_signed_cookie(
+                PIN_COOKIE,
+                "1",
+                salt=PIN_SALT,
+                max_age=get_pin_seconds(),
+                httponly=True,
+                samesite="Lax",
+            )
+        return response
+
+
+class ReplicaRouter:
+
+    def db_for_read(self, model, **hints):
+        # Related objects follow the instance they were reached from
+        instance = hints.get("instance")
+        if instance is not None and instance._state.db:
+            return instance._state.db
+
+        alias = _read_alias.get()
+        if alias is not None and model._meta.app_label in get_replica_apps():
+            return alias
+        return get_primary()
+
+    def db_for_write(self, model, **hints):
+        return get_primary()
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replicas hold the same rows as the primary
+        pool = {get_primary(), *get_replicas()}
+        if obj1._state.db in pool and obj2._state.db in pool:
+            return True
+        return None
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return None
@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -49,6 +50,7 @@ INSTALLED_APPS = [
 
 MIDDLEWARE = [
     'django.middleware.security.SecurityMiddleware',
+    'blog_project.replicas.ReplicaMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
     'django.middleware.csrf.CsrfViewMiddleware',
@@ -119,6 +121,84 @@ DATABASES = {
     }
 }
 
+# Read replicas (blog_project/replicas.py). List extra DATABASES aliases in
+# DATABASE_REPLICAS to send safe-method API reads to them; a client that just
+# wrote reads from the primary for DATABASE_PIN_SECONDS.
+DATABASE_ROUTERS = ['blog_project.replicas.ReplicaRouter']
+DATABASE_PRIMARY = 'default'
+DATABASE_REPLICAS = []
+DATABASE_REPLICA_PATHS = ['/api/posts/', '/api/feed/', '/api/users/me/']
+DATABASE_REPLICA_APPS = ['posts', 'comments', 'likes', 'user']
+DATABASE_PIN_SECONDS = 5
+
+
+# Cache
+# https://docs.djangoproject.com/en/5.0/topics/cache/
+# LocMem is per process; use FileBasedCache/Redis to share entries between workers.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'blog-cache',
+        # 'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        # 'LOCATION': BASE_DIR / '.cache',
+    }
+}
+
+# Post list response cache (posts/cache.py)
+POSTS_LIST_CACHE_ENABLED = True
+POSTS_LIST_CACHE_ALIAS = 'default'
+POSTS_LIST_CACHE_TIMEOUT = 60  # seconds
+
+# Text search configuration used for the posts full-text index (PostgreSQL)
+POSTS_SEARCH_CONFIG = 'simple'
+
+# Maximum number of items accepted by /api/posts/bulk/ in one request
+POSTS_BULK_MAX_ITEMS = 1000
+
+# Post detail views are counted in memory and written in one batched UPDATE
+# after POSTS_VIEW_FLUSH_EVENTS views or POSTS_VIEW_FLUSH_INTERVAL seconds
+POSTS_VIEW_COUNTER_ENABLED = True
+POSTS_VIEW_FLUSH_INTERVAL = 10  # seconds
+POSTS_VIEW_FLUSH_EVENTS = 1000
+
+# Maximum comments/likes per post returned by `?embed=` on post lists
+POSTS_EMBED_MAX_ITEMS = 10
+
+# Write team-only posts into the team feed table used by /api/feed/
+POSTS_TEAM_FEED_ENABLED = True
+
+# Trending posts: each like/comment's weight halves every POSTS_TRENDING_HALF_LIFE
+# seconds. Run `manage.py rescale_trending` periodically (e.g. daily).
+POSTS_TRENDING_HALF_LIFE = 6 * 3600
+POSTS_TRENDING_WEIGHTS = {'like': 1.0, 'comment': 2.0}
+
+# Partition posts, comments and likes by month on created_at when migrating
+# (PostgreSQL only; see posts/partitioning.py). Run `manage.py
+# maintain_partitions` periodically to keep future partitions ready.
+POSTS_PARTITIONING_ENABLED = False
+
+# Serve GET list/retrieve of posts, comments and likes with async views and
+# the async ORM (posts/asyncviews.py). blog_project/asgi.py turns this on;
+# read per request, and while off every request goes to the synchronous view.
+API_ASYNC_READS = os.environ.get('API_ASYNC_READS', '0') == '1'
+
+# Live comment streams (/api/posts/{id}/comments/stream/, ASGI only; see
+# comments/stream.py). Use 'comments.stream.SQLiteTransport' when several
+# worker processes on one host serve streams.
+COMMENTS_STREAM_TRANSPORT = 'comments.stream.LocalTransport'
+COMMENTS_STREAM_SQLITE_PATH = BASE_DIR / 'comment_stream.sqlite3'
+COMMENTS_STREAM_HEARTBEAT = 15  # seconds between keepalive comments
+COMMENTS_STREAM_MAX_AGE = 300  # seconds before a stream ends and the client reconnects
+COMMENTS_STREAM_QUEUE_SIZE = 100  # events buffered per listener
+COMMENTS_STREAM_REPLAY_LIMIT = 100  # comments replayed after Last-Event-ID
+
+# Paginated lists: `?count=capped` counts up to this many rows and
+# `?count=cached` keeps exact counts for this long
+PAGINATION_COUNT_CAP = 1000
+PAGINATION_COUNT_CACHE_ALIAS = 'default'
+PAGINATION_COUNT_CACHE_TIMEOUT = 30  # seconds
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.0/ref/settings/#auth-password-validators
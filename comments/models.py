@@ -28,6 +28,13 @@ class Comment(models.Model):
         help_text="Timestamp when the comment was created"
     )
 
+    class Meta:
+        indexes = [
+            # Backs the nested list: one post's comments in either
+            # direction of (created_at, id), including keyset seeks
+            models.Index(fields=["post", "created_at", "id"], name="comment_post_created_idx"),
+        ]
+
     def clean(self):
 
         if not self.content or not self.content.strip():
@@ -1,7 +1,14 @@
-from rest_framework.pagination import PageNumberPagination
+from posts.pagination import PageOrCursorPagination, QuerysetKeysetPagination
 
-class CommentPagination(PageNumberPagination):
+class CommentPagination(PageOrCursorPagination):
+    """
+    Page numbers by default; `?pagination=cursor` seeks along
+    comment_post_created_idx in the list's order (oldest first, or newest
+    first with `?ordering=-created_at`).
+    """
 
     page_size = 5
     page_size_query_param = "page_size"
-    max_page_size = 50
\ No newline at end of file
+    max_page_size = 50
+
+    keyset_class = QuerysetKeysetPagination
@@ -1,5 +1,7 @@
 from rest_framework import serializers
+from django.db import transaction
 from .models import Comment
+from . import stream
 
 class CommentSerializer(serializers.ModelSerializer):
 
@@ -20,20 +22,33 @@ class CommentSerializer(serializers.ModelSerializer):
                 "Request and post must be provided in serializer context."
             )
 
-        if not post.can_user_read(request.user):
+        # CommentViewSet annotates `can_read` in SQL; other callers fall back
+        # to the in-memory form of the same policy.
+        can_read = getattr(post, "can_read", None)
+        if can_read is None:
+            can_read = post.can_user_read(request.user)
+
+        if not can_read:
             raise serializers.ValidationError(
                 "You do not have permission to comment on this post."
             )
 
         return attrs
 
+    @transaction.atomic
     def create(self, validated_data):
 
         request = self.context.get("request")
         post = self.context.get("post")
 
-        return Comment.objects.create(
+        comment = Comment.objects.create(
             user=request.user,
             post=post,
             content=validated_data["content"]
         )
+
+        # Live listeners only hear about committed comments
+        transaction.on_commit(
+            lambda: stream.publish(post.pk, comment.pk, self.to_representation(comment))
+        )
+        return comment
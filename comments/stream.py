@@ -0,0 +1,257 @@
+"""
+Live comment events for `/api/posts/{post_pk}/comments/stream/`.
+
+`CommentSerializer.create` publishes every new comment once its
+transaction commits. The hub keeps one channel per post in each process:
+an event is serialized once and the same bytes are handed to every
+listener of that post, however many there are.
+
+Messages reach the hubs through a transport (COMMENTS_STREAM_TRANSPORT):
+
+- LocalTransport (default): delivers in the publishing process only. Enough
+  for a single ASGI worker.
+- SQLiteTransport: appends messages to a small SQLite file that every
+  process on the host polls (COMMENTS_STREAM_SQLITE_PATH), so comments
+  written by any worker reach listeners on all of them. It stands in for a
+  network broker. Another transport only needs `send(message)`,
+  `start(deliver)` and `stop()`.
+
+A listener whose queue fills up (COMMENTS_STREAM_QUEUE_SIZE) is cut off
+after the events it already has. EventSource clients reconnect with
+`Last-Event-ID`, and the view replays what they missed from the database.
+"""
+import asyncio
+import json
+import logging
+import os
+import sqlite3
+import tempfile
+import threading
+import time
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+logger = logging.getLogger(__name__)
+
+
+def get_queue_size():
+    return getattr(settings, "COMMENTS_STREAM_QUEUE_SIZE", 100)
+
+
+def encode_event(event_id, data):
+    """
+    One SSE `comment` event.
+    """
+    payload = json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":"))
+    return f"id: {event_id}\nevent: comment\ndata: {payload}\n\n".encode()
+
+
+# ============================================================
+# Transports
+# ============================================================
+
+class LocalTransport:
+    """
+    In-process only: a sent message is delivered right away.
+    """
+
+    def __init__(self):
+        self.deliver = None
+
+    def start(self, deliver):
+        self.deliver = deliver
+
+    def stop(self):
+        self.deliver = None
+
+    def send(self, message):
+        if self.deliver is not None:
+            self.deliver(message)
+
+
+class SQLiteTransport:
+    """
+    Messages go through a table in a SQLite file shared by the processes of
+    one host. Each process polls for rows newer than the last one it saw
+    from a background thread, started only once it has a listener.
+    """
+
+    def __init__(self, path=None, poll_interval=None, retention=None):
+        self.path = path or getattr(
+            settings,
+            "COMMENTS_STREAM_SQLITE_PATH",
+            os.path.join(tempfile.gettempdir(), "blog_comment_stream.sqlite3"),
+        )
+        self.poll_interval = poll_interval or getattr(settings, "COMMENTS_STREAM_POLL_INTERVAL", 0.25)
+        # Rows only need to outlive one poll of every process
+        self.retention = retention or 60
+        self.local = threading.local()
+        self.deliver = None
+        self.thread = None
+        self.stopping = threading.Event()
+
+    def connect(self):
+        connection = getattr(self.local, "connection", None)
+        if connection is None:
+            connection = sqlite3.connect(self.path, timeout=5, isolation_level=None)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute(
+                "CREATE TABLE IF NOT EXISTS comment_events ("
+                "seq INTEGER PRIMARY KEY AUTOINCREMENT, "
+                "message TEXT NOT NULL, "
+                "created REAL NOT NULL)"
+            )
+            self.local.connection = connection
+        return connection
+
+    def send(self, message):
+        connection = self.connect()
+        now = time.time()
+        connection.execute(
+            "INSERT INTO comment_events (message, created) VALUES (?, ?)",
+            (json.dumps(message, cls=DjangoJSONEncoder), now),
+        )
+        connection.execute("DELETE FROM comment_events WHERE created < ?", (now - self.retention,))
+
+    def start(self, deliver):
+        self.deliver = deliver
+        if self.thread is not None:
+            return
+        # Only messages sent from now on
+        (last,) = self.connect().execute("SELECT COALESCE(MAX(seq), 0) FROM comment_events").fetchone()
+        self.stopping.clear()
+        self.thread = threading.Thread(target=self.poll, args=(last,), name="comment-stream", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopping.set()
+        if self.thread is not None:
+            self.thread.join()
+        self.thread = None
+
+    def poll(self, last):
+        while not self.stopping.wait(self.poll_interval):
+            try:
+                rows = self.connect().execute(
+                    "SELECT seq, message FROM comment_events WHERE seq > ? ORDER BY seq", (last,),
+                ).fetchall()
+            except sqlite3.Error:
+                logger.exception("Could not read comment events from %s", self.path)
+                continue
+            for seq, raw in rows:
+                last = seq
+                self.deliver(json.loads(raw))
+
+
+def get_transport():
+    path = getattr(settings, "COMMENTS_STREAM_TRANSPORT", "comments.stream.LocalTransport")
+    return import_string(path)()
+
+
+# ============================================================
+# Hub
+# ============================================================
+
+class Subscription:
+    """
+    One listener of one post, bound to the event loop it subscribed from.
+    Holds (event id, encoded event) pairs.
+    """
+
+    def __init__(self, post_id, maxsize):
+        self.post_id = post_id
+        self.loop = asyncio.get_running_loop()
+        self.queue = asyncio.Queue(maxsize)
+        self.overflowed = False
+
+    def offer(self, item):
+        # Called from any thread
+        try:
+            self.loop.call_soon_threadsafe(self.put, item)
+        except RuntimeError:
+            # Loop already closed; the listener is gone
+            pass
+
+    def put(self, item):
+        if self.overflowed:
+            return
+        try:
+            self.queue.put_nowait(item)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+
+class Hub:
+    """
+    Per-process fan-out of comment events, keyed by post.
+    """
+
+    def __init__(self, transport=None):
+        self.transport = transport
+        self.lock = threading.Lock()
+        self.channels = {}
+        self.started = False
+
+    def get_transport(self):
+        if self.transport is None:
+            self.transport = get_transport()
+        return self.transport
+
+    def subscribe(self, post_id):
+        """
+        Must be called from the listener's event loop.
+        """
+        subscription = Subscription(post_id, get_queue_size())
+        with self.lock:
+            self.channels.setdefault(post_id, set()).add(subscription)
+            start = not self.started
+            self.started = True
+        if start:
+            self.get_transport().start(self.dispatch)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        with self.lock:
+            channel = self.channels.get(subscription.post_id)
+            if channel is None:
+                return
+            channel.discard(subscription)
+            if not channel:
+                del self.channels[subscription.post_id]
+
+    def listener_count(self, post_id=None):
+        with self.lock:
+            if post_id is not None:
+                return len(self.channels.get(post_id, ()))
+            return sum(len(channel) for channel in self.channels.values())
+
+    def publish(self, post_id, event_id, data):
+        """
+        Send one comment to every process's listeners of the post.
+        """
+        try:
+            self.get_transport().send({"post": post_id, "id": event_id, "data": data})
+        except Exception:
+            # Listeners catch up with Last-Event-ID; the write already committed
+            logger.exception("Could not publish comment %s", event_id)
+
+    def dispatch(self, message):
+        """
+        Deliver a transport message to this process's listeners.
+        """
+        with self.lock:
+            listeners = list(self.channels.get(message["post"], ()))
+        if not listeners:
+            return
+        item = (message["id"], encode_event(message["id"], message["data"]))
+        for subscription in listeners:
+            subscription.offer(item)
+
+
+hub = Hub()
+
+
+def publish(post_id, event_id, data):
+    hub.publish(post_id, event_id, data)
@@ -0,0 +1,195 @@
+import asyncio
+import time
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIClient
+
+from comments import stream
+from comments.models import Comment
+from comments.views import comment_stream, event_stream
+from posts.models import Post
+
+User = get_user_model()
+
+
+def message(post_id, event_id, content="c"):
+    return {"post": post_id, "id": event_id, "data": {"id": event_id, "content": content}}
+
+
+class TestHub:
+
+    def test_one_encoded_event_reaches_every_listener_of_the_post(self):
+        hub = stream.Hub(stream.LocalTransport())
+
+        async def run():
+            first, second, other = hub.subscribe(1), hub.subscribe(1), hub.subscribe(2)
+            hub.publish(1, 7, {"id": 7, "content": "hi"})
+            items = [await asyncio.wait_for(s.queue.get(), 1) for s in (first, second)]
+            return items, other.queue.qsize()
+
+        (one, two), other_size = async_to_sync(run)()
+
+        assert one[0] == 7
+        assert one[1].startswith(b"id: 7\nevent: comment\ndata: ")
+        # Encoded once, shared by both listeners
+        assert one[1] is two[1]
+        assert other_size == 0
+
+    def test_unsubscribe_drops_empty_channels(self):
+        hub = stream.Hub(stream.LocalTransport())
+
+        async def run():
+            subscription = hub.subscribe(1)
+            assert hub.listener_count(1) == 1
+            hub.unsubscribe(subscription)
+
+        async_to_sync(run)()
+
+        assert hub.listener_count() == 0
+        assert hub.channels == {}
+
+    def test_listener_that_falls_behind_is_marked_overflowed(self, settings):
+        settings.COMMENTS_STREAM_QUEUE_SIZE = 2
+        hub = stream.Hub(stream.LocalTransport())
+
+        async def run():
+            subscription = hub.subscribe(1)
+            for event_id in range(3):
+                hub.dispatch(message(1, event_id))
+            await asyncio.sleep(0)
+            return subscription
+
+        subscription = async_to_sync(run)()
+
+        assert subscription.overflowed
+        assert subscription.queue.qsize() == 2
+
+
+class TestSQLiteTransport:
+
+    def test_messages_reach_other_processes_transports(self, tmp_path):
+        path = tmp_path / "events.sqlite3"
+        sender = stream.SQLiteTransport(path=path)
+        receiver = stream.SQLiteTransport(path=path, poll_interval=0.01)
+        received = []
+
+        sender.send(message(1, 1, "before start"))
+        receiver.start(received.append)
+        try:
+            sender.send(message(1, 2))
+            deadline = time.monotonic() + 2
+            while not received and time.monotonic() < deadline:
+                time.sleep(0.01)
+        finally:
+            receiver.stop()
+
+        assert received == [message(1, 2)]
+
+
+@pytest.mark.django_db
+class TestCommentStream:
+
+    def setup_method(self):
+        self.factory = AsyncRequestFactory()
+        self.author = User.objects.create_user(email="author@test.com", password="123")
+        self.post = Post.objects.create(author=self.author, title="Post", content="Content", privacy_read="public")
+        self.hidden = Post.objects.create(author=self.author, title="Hidden", content="Content", privacy_read="author")
+
+    @pytest.fixture(autouse=True)
+    def local_hub(self, settings, monkeypatch):
+        settings.API_ASYNC_READS = True
+        self.hub = stream.Hub(stream.LocalTransport())
+        monkeypatch.setattr(stream, "hub", self.hub)
+
+    def open(self, post_id, chunks, publish=None, headers=None):
+        """
+        The status and the first `chunks` chunks of a stream; `publish` runs
+        once the stream is open. The stream is always closed afterwards.
+        """
+        async def run():
+            request = self.factory.get(f"/api/posts/{post_id}/comments/stream/", headers=headers)
+            response = await comment_stream(request, post_pk=post_id)
+            if not response.streaming:
+                return response.status_code, []
+            content = response.streaming_content
+            try:
+                received = [await content.__anext__()]
+                if publish is not None:
+                    publish()
+                while len(received) < chunks:
+                    received.append(await asyncio.wait_for(content.__anext__(), 1))
+            finally:
+                await content.aclose()
+            return response.status_code, received
+
+        return async_to_sync(run)()
+
+    def test_live_comment_is_streamed(self):
+        status, chunks = self.open(
+            self.post.id, 2, publish=lambda: self.hub.publish(self.post.id, 5, {"id": 5, "content": "new"}),
+        )
+
+        assert status == 200
+        assert chunks[0].startswith(b"retry: ")
+        assert chunks[1] == stream.encode_event(5, {"id": 5, "content": "new"})
+
+    def test_last_event_id_replays_missed_comments_from_the_database(self):
+        seen = Comment.objects.create(user=self.author, post=self.post, content="seen")
+        missed = [
+            Comment.objects.create(user=self.author, post=self.post, content=f"missed {i}")
+            for i in range(2)
+        ]
+
+        status, chunks = self.open(self.post.id, 3, headers={"Last-Event-ID": str(seen.id)})
+
+        assert status == 200
+        assert [chunk.split(b"\n")[0] for chunk in chunks[1:]] == [f"id: {c.id}".encode() for c in missed]
+        assert b'"content":"missed 0"' in chunks[1]
+
+    def test_hidden_or_missing_post_is_404(self):
+        assert self.open(self.hidden.id, 1)[0] == 404
+        assert self.open(999999, 1)[0] == 404
+        assert self.hub.listener_count() == 0
+
+    def test_only_served_under_asgi(self, settings):
+        settings.API_ASYNC_READS = False
+
+        assert self.open(self.post.id, 1)[0] == 501
+
+    def test_closing_the_stream_unsubscribes(self):
+        async def run():
+            subscription = self.hub.subscribe(self.post.id)
+            events = event_stream(subscription, [])
+            await events.__anext__()
+            await events.aclose()
+
+        async_to_sync(run)()
+
+        assert self.hub.listener_count() == 0
+
+
+@pytest.mark.django_db
+class TestCommentPublishing:
+    """
+    Goes through the URLconf with the default settings, outside the async
+    fixture of TestCommentStream.
+    """
+
+    def setup_method(self):
+        self.author = User.objects.create_user(email="author@test.com", password="123")
+        self.post = Post.objects.create(author=self.author, title="Post", content="Content", privacy_read="public")
+
+    def test_created_comment_is_published_after_commit(self, monkeypatch, django_capture_on_commit_callbacks):
+        published = []
+        monkeypatch.setattr(stream, "publish", lambda *args: published.append(args))
+        client = APIClient()
+        client.force_authenticate(user=self.author)
+
+        with django_capture_on_commit_callbacks(execute=True):
+            response = client.post(f"/api/posts/{self.post.id}/comments/", data={"content": "Hi"}, format="json")
+
+        assert response.status_code == 201
+        assert published == [(self.post.id, response.data["id"], response.data)]
@@ -1,5 +1,7 @@
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 
@@ -140,3 +142,138 @@ class TestCommentViewSet:
         assert len(response.data["results"]) == 10  # Assuming CommentPagination.page_size = 20
         assert "next" in response.data
         assert "previous" in response.data
+
+
+@pytest.mark.django_db
+class TestCommentPostResolution:
+    """
+    The parent post is loaded only to create a comment, in one query, and
+    list pages check its visibility inside the page query.
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(email="author@test.com", password="123")
+        self.other = User.objects.create_user(email="other@test.com", password="123")
+        self.post = Post.objects.create(author=self.author, title="Post", content="Content", privacy_read="public")
+        self.hidden = Post.objects.create(author=self.author, title="Hidden", content="Content", privacy_read="author")
+
+    def selects(self, ctx, table):
+        return [
+            q["sql"] for q in ctx.captured_queries
+            if q["sql"].upper().startswith("SELECT") and f'FROM "{table}"' in q["sql"]
+        ]
+
+    def test_create_loads_the_post_once_with_author_and_team(self):
+        self.client.force_authenticate(user=self.other)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.post(
+                f"/api/posts/{self.post.id}/comments/", data={"content": "Hi"}, format="json",
+            )
+
+        assert response.status_code == status.HTTP_201_CREATED
+        post_selects = self.selects(ctx, "posts_post")
+        assert len(post_selects) == 1
+        assert "user_team" in post_selects[0]
+        assert not self.selects(ctx, "user_customuser")
+
+    def test_cannot_comment_on_a_hidden_post(self):
+        self.client.force_authenticate(user=self.other)
+
+        response = self.client.post(
+            f"/api/posts/{self.hidden.id}/comments/", data={"content": "Hi"}, format="json",
+        )
+
+        assert response.status_code == status.HTTP_400_BAD_REQUEST
+        assert not Comment.objects.exists()
+
+    def test_list_does_not_load_the_post(self):
+        Comment.objects.create(user=self.author, post=self.post, content="c")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/api/posts/{self.post.id}/comments/")
+
+        assert response.status_code == status.HTTP_200_OK
+        # count + page rows, each already limited to a readable post
+        assert len(ctx.captured_queries) == 2
+
+    def test_list_of_hidden_or_missing_post_is_404(self):
+        Comment.objects.create(user=self.author, post=self.hidden, content="c")
+
+        assert self.client.get(f"/api/posts/{self.hidden.id}/comments/").status_code == 404
+        assert self.client.get("/api/posts/999999/comments/").status_code == 404
+        assert self.client.get(f"/api/posts/{self.post.id}/comments/").status_code == 200
+
+        self.client.force_authenticate(user=self.author)
+        assert self.client.get(f"/api/posts/{self.hidden.id}/comments/").status_code == 200
+
+    def test_404_costs_no_more_queries_than_a_page(self):
+        Comment.objects.create(user=self.author, post=self.hidden, content="c")
+        self.client.force_authenticate(user=self.other)
+
+        for post_id in (self.hidden.id, 999999):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f"/api/posts/{post_id}/comments/")
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+            # the empty count, then one existence check on the post
+            assert len(ctx.captured_queries) <= 2
+
+
+@pytest.mark.django_db
+class TestCommentCursorPagination:
+    """
+    `?pagination=cursor` walks a post's comments in either direction along
+    (created_at, id), with a fixed number of queries per page.
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.user = User.objects.create_user(email="user@test.com", password="123")
+        self.post = Post.objects.create(author=self.user, title="Post", content="Content", privacy_read="public")
+        self.comments = [
+            Comment.objects.create(user=self.user, post=self.post, content=f"Comment {i}")
+            for i in range(7)
+        ]
+        self.url = f"/api/posts/{self.post.id}/comments/"
+
+    def walk(self, url):
+        ids, pages = [], []
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == status.HTTP_200_OK
+            assert "count" not in response.data
+            ids.extend(row["id"] for row in response.data["results"])
+            pages.append(response.data)
+            url = response.data["next"]
+        return ids, pages
+
+    def test_oldest_first_by_default(self):
+        ids, pages = self.walk(f"{self.url}?pagination=cursor&page_size=3")
+
+        assert ids == [comment.id for comment in self.comments]
+        assert len(pages) == 3
+
+    def test_newest_first(self):
+        ids, _ = self.walk(f"{self.url}?pagination=cursor&page_size=3&ordering=-created_at")
+
+        assert ids == [comment.id for comment in reversed(self.comments)]
+
+    def test_previous_link_returns_the_earlier_page(self):
+        first = self.client.get(f"{self.url}?pagination=cursor&page_size=3").data
+        second = self.client.get(first["next"]).data
+
+        back = self.client.get(second["previous"]).data
+
+        assert [row["id"] for row in back["results"]] == [row["id"] for row in first["results"]]
+
+    def test_query_count_does_not_depend_on_page_size(self):
+        counts = []
+        for page_size in (2, 7):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f"{self.url}?pagination=cursor&page_size={page_size}")
+            assert response.status_code == status.HTTP_200_OK
+            counts.append(len(ctx.captured_queries))
+
+        # One page query; authors come from the join
+        assert counts == [1, 1]
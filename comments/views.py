@@ -1,3 +1,134 @@
-from django.shortcuts import render
+"""
+Server-Sent Events stream of a post's new comments (comments.stream).
+"""
+import asyncio
 
-# Create your views here.
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.http import Http404, JsonResponse, StreamingHttpResponse
+from rest_framework.authentication import BasicAuthentication, SessionAuthentication
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+
+from posts import asyncviews, policy
+from posts.models import Post
+
+from . import stream
+from .models import Comment
+from .serializers import CommentSerializer
+
+LAST_EVENT_ID_PARAM = "last_event_id"
+
+# How long EventSource waits before reconnecting, in milliseconds
+RETRY_MS = 3000
+
+
+def get_heartbeat():
+    return getattr(settings, "COMMENTS_STREAM_HEARTBEAT", 15)
+
+
+def get_max_age():
+    return getattr(settings, "COMMENTS_STREAM_MAX_AGE", 300)
+
+
+def get_replay_limit():
+    return getattr(settings, "COMMENTS_STREAM_REPLAY_LIMIT", 100)
+
+
+def get_last_event_id(request):
+    # EventSource sends the header on reconnects; the parameter is for
+    # clients that cannot set headers
+    raw = request.headers.get("Last-Event-ID") or request.GET.get(LAST_EVENT_ID_PARAM)
+    try:
+        return int(raw)
+    except (TypeError, ValueError):
+        return None
+
+
+def load_replay(request, post_id, last_event_id):
+    """
+    Authenticate like the API, check the post is readable, and load the
+    comments written after `last_event_id` as encoded events.
+    """
+    user = Request(request, authenticators=[SessionAuthentication(), BasicAuthentication()]).user
+
+    if not policy.READ.filter(Post.objects.filter(pk=post_id), user).exists():
+        raise Http404
+    if last_event_id is None:
+        return []
+
+    comments = (
+        Comment.objects.select_related("user")
+        .filter(post_id=post_id, id__gt=last_event_id)
+        .order_by("id")[:get_replay_limit()]
+    )
+    return [
+        (comment.pk, stream.encode_event(comment.pk, CommentSerializer(comment).data))
+        for comment in comments
+    ]
+
+
+async def event_stream(subscription, replay):
+    """
+    The replayed events, then live ones until the listener falls behind or
+    the connection reaches COMMENTS_STREAM_MAX_AGE. The client reconnects
+    either way, which also checks the post's visibility again.
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + get_max_age()
+    replayed = set()
+    try:
+        yield f"retry: {RETRY_MS}\n\n".encode()
+        for event_id, payload in replay:
+            replayed.add(event_id)
+            yield payload
+
+        while True:
+            timeout = min(get_heartbeat(), deadline - loop.time())
+            if timeout <= 0:
+                return
+            try:
+                event_id, payload = await asyncio.wait_for(subscription.queue.get(), timeout)
+            except asyncio.TimeoutError:
+                yield b": keepalive\n\n"
+                continue
+
+            # Committed between subscribing and the replay query
+            if event_id not in replayed:
+                yield payload
+            if subscription.overflowed and subscription.queue.empty():
+                return
+    finally:
+        stream.hub.unsubscribe(subscription)
+
+
+async def comment_stream(request, post_pk):
+    """
+    GET /api/posts/{post_pk}/comments/stream/ as `text/event-stream`.
+    Each event is a `comment` with the comment's id and its JSON as in the
+    comment list. Only served under ASGI.
+    """
+    if request.method != "GET":
+        return JsonResponse({"detail": f'Method "{request.method}" not allowed.'}, status=405)
+    if not asyncviews.is_enabled():
+        return JsonResponse({"detail": "Comment streams are only served under ASGI."}, status=501)
+
+    # Subscribe before the replay query so no comment falls in between
+    subscription = stream.hub.subscribe(post_pk)
+    try:
+        replay = await sync_to_async(load_replay)(request, post_pk, get_last_event_id(request))
+    except Http404:
+        stream.hub.unsubscribe(subscription)
+        return JsonResponse({"detail": "Not found."}, status=404)
+    except APIException as exc:
+        stream.hub.unsubscribe(subscription)
+        return JsonResponse({"detail": exc.detail}, status=exc.status_code)
+    except BaseException:
+        stream.hub.unsubscribe(subscription)
+        raise
+
+    response = StreamingHttpResponse(event_stream(subscription, replay), content_type="text/event-stream")
+    response["Cache-Control"] = "no-cache"
+    # Keep reverse proxies (nginx) from buffering the events
+    response["X-Accel-Buffering"] = "no"
+    return response
@@ -8,7 +8,12 @@ from .models import Comment
 from .serializers import CommentSerializer
 from .permissions import CanCreateComment, CanDeleteComment
 from .pagination import CommentPagination
+from posts import policy
 from posts.models import Post
+from posts.asyncviews import AsyncReadMixin
+from posts.nested import ParentPostMixin
+from posts.conditional import ConditionalGetMixin
+from posts.filters import IntegerParam, QueryParamFilterBackend, created_range
 
 # ============================================================
 # SCHEMA / DOCUMENTATION WITH DRF SPECTACULAR
@@ -21,11 +26,15 @@ from posts.models import Post
         Query parameters:
         - post: ID of the post to filter comments (optional)
         - page: page number for pagination (optional)
-        - page_size: number of items per page (optional, default 20)
+        - page_size: number of items per page (optional, default 5)
+        - pagination=cursor: keyset pages with next/previous cursor links
+          and no count; one query per page at any depth
         
-        Ordering: newest comments first.
+        Ordering: oldest comments first; `?ordering=-created_at` for newest
+        first.
         Permissions:
-        - Anyone can list comments.
+        - Anyone who can read the post can list its comments; otherwise the
+          response is 404, as for a missing post.
         """,
         parameters=[
             OpenApiParameter(
@@ -46,12 +55,13 @@ from posts.models import Post
                 name="page_size",
                 type=int,
                 location=OpenApiParameter.QUERY,
-                description="Number of comments per page (default 20, max 50)",
+                description="Number of comments per page (default 5, max 50)",
                 required=False,
             ),
         ],
         responses={
             200: CommentSerializer(many=True),
+            404: OpenApiResponse(description="Post not found or not readable"),
         },
     ),
     retrieve=extend_schema(
@@ -96,7 +106,7 @@ from posts.models import Post
     ),
 )
 
-class CommentViewSet(ModelViewSet):
+class CommentViewSet(ParentPostMixin, AsyncReadMixin, ConditionalGetMixin, ModelViewSet):
     """
     ViewSet for managing comments.
 
@@ -108,12 +118,15 @@ class CommentViewSet(ModelViewSet):
 
     Features:
     - Pagination using CommentPagination
+    - ETag validation on list and retrieve (304 when unchanged)
+    - Async list and retrieve under ASGI (posts.asyncviews)
     - Automatic assignment of the authenticated user and related post
         when creating a comment
     - Custom permissions handled via CanCreateComment and CanDeleteComment
 
     Permissions:
-    - Anyone can list or retrieve
+    - Anyone who can read the post can list or retrieve its comments
+      (404 otherwise, decided in the page query)
     - Only users who can read the post can create comments
     - Only comment author or staff can delete
     """
@@ -122,46 +135,61 @@ class CommentViewSet(ModelViewSet):
     serializer_class = CommentSerializer
     pagination_class = CommentPagination
 
+    filter_backends = [QueryParamFilterBackend]
+    filter_params = {
+        "user": IntegerParam("user_id", "Filter by comment author ID"),
+        **created_range(),
+    }
+    # Both match comment_post_created_idx / the primary key, so cursor
+    # pages are index range scans in either direction
+    ordering_columns = {
+        "created_at": ("created_at", "id"),
+        "id": ("id",),
+    }
+
     authentication_classes = [SessionAuthentication, BasicAuthentication]
     permission_classes = [IsAuthenticatedOrReadOnly]
 
     def get_queryset(self):
         """
-        Returns comments ordered by creation date (newest first).
-
-        Optional filtering:
-        - `post` query parameter: filter comments belonging to a specific post
+        Returns the comments of the post in the URL, oldest first, only if
+        the user may read that post (posts.nested).
         """
-        queryset = Comment.objects.all().order_by("created_at")
-        post_id = self.kwargs.get("post_pk")
-        if post_id:
-            queryset = queryset.filter(post_id=post_id)
-        return queryset
+        # user_email is read from the joined user, never lazily
+        queryset = Comment.objects.select_related("user").order_by("created_at", "id")
+        return self.filter_by_parent(queryset)
 
-        # post_id = self.kwargs.get("post_pk")
-        # return Comment.objects.filter(post_id=post_id).order_by("-created_at")
+    def get_row_version(self, obj):
+        """
+        Comments are created and deleted, not edited through the API; the
+        content is still part of the version so admin edits are picked up.
+        """
+        return obj.pk, obj.content
 
     def get_serializer_context(self):
         """
-        Extend the serializer context to include the related Post object
-        based on `post` provided in request data or query params.
-
-        This allows the serializer to automatically assign the correct
-        post when creating a comment.
+        Extend the serializer context with the Post being commented on, for
+        create only; list and retrieve never need it.
         """
-
-        # context = super().get_serializer_context()
-        # post_id = self.kwargs.get("post_pk")
-        # if post_id:
-        #     context["post"] = Post.objects.get(id=post_id)
-        # return context
-
         context = super().get_serializer_context()
-        post_id = self.kwargs.get("post_pk") or self.request.data.get("post") or self.request.query_params.get("post")
-        if post_id:
-            context["post"] = get_object_or_404(Post, id=post_id)
+        if self.action == "create":
+            context["post"] = self.get_post()
         return context
 
+    def get_post(self):
+        """
+        The post to comment on, resolved on first use in one query: author
+        and team joined, visibility decided in SQL as `can_read`.
+        """
+        if getattr(self, "_post", None) is None:
+            post_id = self.get_parent_id() or self.request.data.get("post") or self.request.query_params.get("post")
+            self._post = get_object_or_404(
+                Post.objects.select_related("author__team").annotate(
+                    can_read=policy.READ.expression(self.request.user)
+                ),
+                id=post_id,
+            )
+        return self._post
 
     def perform_create(self, serializer):
         """
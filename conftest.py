@@ -0,0 +1,23 @@
+import pytest
+from django.core.cache import cache
+
+
+@pytest.fixture(autouse=True)
+def clear_cache():
+    # Cached responses and generation counters must not leak between tests
+    cache.clear()
+    yield
+    cache.clear()
+
+
+@pytest.fixture(autouse=True)
+def view_counter(settings):
+    # The counter is process-wide and flushed from request_finished: start
+    # every test empty and only flush on time when a test asks for it, so
+    # its UPDATEs never land in another test's query count
+    from posts import viewcounts
+
+    settings.POSTS_VIEW_FLUSH_INTERVAL = 3600
+    viewcounts.counter.reset()
+    yield viewcounts.counter
+    viewcounts.counter.reset()
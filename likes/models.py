@@ -23,6 +23,7 @@ class Like(models.Model):
 
     class Meta:
         
+        # On partitioned tables a side table enforces it (posts.partitioning)
         unique_together = ("user", "post")
         
     def __str__(self):
@@ -1,6 +1,6 @@
-from rest_framework.pagination import PageNumberPagination
+from posts.pagination import CountModePagination
 
-class LikePagination(PageNumberPagination):
+class LikePagination(CountModePagination):
 
     page_size = 15
     page_size_query_param = "page_size"
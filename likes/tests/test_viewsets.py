@@ -1,5 +1,9 @@
+import threading
+
 import pytest
 from django.contrib.auth import get_user_model
+from django.db import connection, connections
+from django.test.utils import CaptureQueriesContext
 from rest_framework.test import APIClient
 from rest_framework import status
 
@@ -80,3 +84,107 @@ class TestLikeViewSet:
         assert response.status_code == status.HTTP_403_FORBIDDEN
         assert Like.objects.count() == 1
 
+
+@pytest.mark.django_db
+class TestLikeListVisibility:
+    """
+    The likes of a post are listed only when the user may read the post;
+    the check is part of the page query, so a 404 costs no more than a
+    page.
+    """
+
+    def setup_method(self):
+        self.client = APIClient()
+        self.author = User.objects.create_user(email="author@test.com", password="123")
+        self.other = User.objects.create_user(email="other@test.com", password="123")
+        self.post = Post.objects.create(author=self.author, title="Post", content="Content", privacy_read="public")
+        self.hidden = Post.objects.create(author=self.author, title="Hidden", content="Content", privacy_read="author")
+        Like.objects.create(user=self.author, post=self.post)
+        Like.objects.create(user=self.author, post=self.hidden)
+
+    def test_list_of_readable_post_checks_visibility_in_the_page_query(self):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/api/posts/{self.post.id}/likes/")
+
+        assert response.status_code == status.HTTP_200_OK
+        assert len(response.data["results"]) == 1
+        # count + page rows, each already limited to a readable post
+        assert len(ctx.captured_queries) == 2
+        assert not any(q["sql"].upper().startswith('SELECT "POSTS_POST"') for q in ctx.captured_queries)
+
+    def test_hidden_or_missing_post_is_404_without_extra_queries(self):
+        self.client.force_authenticate(user=self.other)
+
+        for post_id in (self.hidden.id, 999999):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.get(f"/api/posts/{post_id}/likes/")
+            assert response.status_code == status.HTTP_404_NOT_FOUND
+            # the empty count, then one existence check on the post
+            assert len(ctx.captured_queries) <= 2
+
+    def test_hidden_post_likes_cannot_be_retrieved(self):
+        like = Like.objects.get(post=self.hidden)
+        self.client.force_authenticate(user=self.other)
+
+        response = self.client.get(f"/api/posts/{self.hidden.id}/likes/{like.id}/")
+        assert response.status_code == status.HTTP_404_NOT_FOUND
+
+        self.client.force_authenticate(user=self.author)
+        response = self.client.get(f"/api/posts/{self.hidden.id}/likes/{like.id}/")
+        assert response.status_code == status.HTTP_200_OK
+
+
+requires_row_locks = pytest.mark.skipif(
+    not connection.features.has_select_for_update, reason="needs SELECT ... FOR UPDATE",
+)
+
+
+@requires_row_locks
+@pytest.mark.django_db(transaction=True)
+class TestConcurrentLikes:
+    """
+    Liking locks the post row before the duplicate check, which is the only
+    guard left once likes_like is partitioned and loses its unique
+    constraint.
+    """
+
+    def setup_method(self):
+        self.user = User.objects.create_user(email="user@test.com", password="123")
+        self.post = Post.objects.create(
+            author=self.user, title="Post", content="Content", privacy_read=Post.PrivacyChoices.PUBLIC,
+        )
+
+    def test_like_locks_the_post_row(self):
+        client = APIClient()
+        client.force_authenticate(user=self.user)
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = client.post(f"/api/posts/{self.post.id}/likes/", format="json")
+
+        assert response.status_code == status.HTTP_201_CREATED
+        post_selects = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith('SELECT "posts_post"')]
+        assert "FOR UPDATE" in post_selects[0].upper()
+
+    def test_simultaneous_likes_create_one_row(self):
+        barrier = threading.Barrier(2)
+        statuses = []
+
+        def like():
+            client = APIClient()
+            client.force_authenticate(user=self.user)
+            try:
+                barrier.wait()
+                statuses.append(client.post(f"/api/posts/{self.post.id}/likes/", format="json").status_code)
+            finally:
+                connections.close_all()
+
+        threads = [threading.Thread(target=like) for _ in range(2)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert sorted(statuses) == [status.HTTP_201_CREATED, status.HTTP_400_BAD_REQUEST]
+        assert Like.objects.filter(post=self.post, user=self.user).count() == 1
+        self.post.refresh_from_db()
+        assert self.post.likes_count == 1
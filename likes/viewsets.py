@@ -5,18 +5,30 @@ from rest_framework.exceptions import ValidationError
 from .pagination import LikePagination
 from rest_framework.decorators import action
 from django.shortcuts import get_object_or_404
+from django.db import transaction
 from drf_spectacular.utils import extend_schema, extend_schema_view, OpenApiResponse
 
 from .models import Like
 from .serializers import LikeSerializer
 from .permissions import CanLike, CanUnlike
 
+from posts import policy
 from posts.models import Post
+from posts.asyncviews import AsyncReadMixin
+from posts.conditional import ConditionalGetMixin
+from posts.filters import IntegerParam, QueryParamFilterBackend, created_range
+from posts.nested import ParentPostMixin
 
 @extend_schema_view(
     list=extend_schema(
-        description="List likes. Can be filtered by post using the post_pk from the nested route.",
-        responses={200: LikeSerializer(many=True)},
+        description=(
+            "List the likes of a post. Answers 404 when the post does not exist "
+            "or the user cannot read it; the check is part of the page query."
+        ),
+        responses={
+            200: LikeSerializer(many=True),
+            404: OpenApiResponse(description="Post not found or not readable"),
+        },
     ),
     create=extend_schema(
         description="Create a like for a post. Users can only like a post once.",
@@ -41,7 +53,7 @@ from posts.models import Post
         },
     ),
 )
-class LikeViewSet(viewsets.ModelViewSet):
+class LikeViewSet(ParentPostMixin, AsyncReadMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     ViewSet for managing Likes.
 
@@ -49,6 +61,10 @@ class LikeViewSet(viewsets.ModelViewSet):
     - list: List likes, optionally filtered by post
     - create: Create a new like (authenticated users only)
     - destroy: Delete a like (only the creator or superuser)
+
+    List and retrieve answer 304 Not Modified while the likes are unchanged,
+    and run on the async ORM under ASGI (posts.asyncviews). Both only return
+    likes of a post the user may read (posts.nested).
     """
 
     queryset = Like.objects.all().order_by("-created_at")
@@ -56,6 +72,13 @@ class LikeViewSet(viewsets.ModelViewSet):
 
     pagination_class = LikePagination
 
+    filter_backends = [QueryParamFilterBackend]
+    filter_params = {
+        "user": IntegerParam("user_id", "Filter by the user who liked"),
+        **created_range(),
+    }
+    ordering_columns = {"id": ("id",)}
+
     # ============================================================
     # PERMISSIONS
     # ============================================================
@@ -69,34 +92,46 @@ class LikeViewSet(viewsets.ModelViewSet):
     # ============================================================
     # CREATE LIKE: prevent duplicates
     # ============================================================
+    # Post.likes_count is updated by posts.signals; the atomic blocks keep
+    # the like row and the counter in the same transaction.
+    @transaction.atomic
     def perform_create(self, serializer):
         user = self.request.user
-        # post = serializer.validated_data["post"]
         post_id = self.kwargs.get("post_pk")
-        post = get_object_or_404(Post, id=post_id)
 
-        # Check if user already liked this post
-        if not post.can_user_read(self.request.user):
+        # Existence and visibility in one query, which also locks the post
+        # row: concurrent likes of the same post wait here until this
+        # transaction ends. The (user, post) unique constraint is gone once
+        # likes_like is partitioned (posts.partitioning), so this lock is
+        # what keeps the duplicate check below from racing.
+        post = get_object_or_404(
+            Post.objects.select_for_update().only("pk").annotate(
+                can_read=policy.READ.expression(user),
+            ),
+            id=post_id,
+        )
+
+        if not post.can_read:
             raise ValidationError("You cannot like this post.")
-        
-        if Like.objects.filter(user=self.request.user, post=post).exists():
+
+        # A separate statement, so it sees likes committed while waiting
+        if Like.objects.filter(post=post, user=user).exists():
             raise ValidationError("You have already liked this post.")
 
         serializer.save(user=user, post=post)
 
+    @transaction.atomic
+    def perform_destroy(self, instance):
+        instance.delete()
+
     # ============================================================
-    # OPTIONAL: Filter likes by post
+    # Likes of the (readable) post from the nested route
     # ============================================================
     
     def get_queryset(self):
-        post_id = self.kwargs.get("post_pk")
-
-        queryset = Like.objects.all()
-
-        if post_id is not None:
-            queryset = queryset.filter(post_id=post_id)
-            
-        return queryset.order_by("created_at")
+        # user_email is read from the joined user, never lazily
+        queryset = Like.objects.select_related("user").order_by("created_at")
+        return self.filter_by_parent(queryset)
 
     
     # def get_queryset(self):
@@ -108,6 +143,7 @@ class LikeViewSet(viewsets.ModelViewSet):
     #     return queryset
     
     @action(detail=False, methods=['delete'], url_path='unlike')
+    @transaction.atomic
     def unlike(self, request, post_pk=None):
         try:
             like = Like.objects.get(user=request.user, post_id=post_pk)
@@ -12,8 +12,8 @@ class PostAdmin(admin.ModelAdmin):
         'author_team',
         'privacy_read',    # Read permission level
         'privacy_write',   # Write/edit permission level
-        'num_comments',   # ← agregado
-        'num_likes', 
+        'comments_count',  # Denormalized counter
+        'likes_count',
         'created_at',      # Timestamp when post was created
         'updated_at'       # Timestamp when post was last updated
     ]
@@ -36,7 +36,7 @@ class PostAdmin(admin.ModelAdmin):
         ('updated_at', admin.DateFieldListFilter),  # Filter by last update
     ]
 
-    readonly_fields = ['created_at', 'updated_at']
+    readonly_fields = ['created_at', 'updated_at', 'likes_count', 'comments_count']
 
     ordering = ['-created_at']  # Newest posts appear first
 
@@ -44,14 +44,6 @@ class PostAdmin(admin.ModelAdmin):
         return obj.author.team.name
     author_team.short_description = "Team"
 
-    def num_comments(self, obj):
-        return obj.comments.count()   # usa related_name='comments'
-    num_comments.short_description = "Comments"
-
-    def num_likes(self, obj):
-        return obj.likes.count()      # usa related_name='likes'
-    num_likes.short_description = "Likes"
-
     def save_model(self, request, obj, form, change):
         if obj.privacy_write == Post.PrivacyChoices.PUBLIC:
             raise ValidationError({
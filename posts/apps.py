@@ -1,5 +1,40 @@
 from django.apps import AppConfig
+from django.core.signals import request_finished
+from django.db.models.signals import post_save, post_delete, pre_delete
 
 
 class PostsConfig(AppConfig):
     name = 'posts'
+
+    def ready(self):
+        from comments.models import Comment
+        from likes.models import Like
+        from user.models import CustomUser, Team
+        from . import cache, filters, signals, viewcounts
+        from .models import Post
+
+        # post_delete also fires for rows removed by cascades (post/user
+        # deletion); rows whose post goes in the same delete() are skipped
+        pre_delete.connect(signals.post_deleting, sender=Post, dispatch_uid="posts_post_deleting")
+        post_save.connect(signals.like_created, sender=Like, dispatch_uid="posts_like_created")
+        post_delete.connect(signals.like_deleted, sender=Like, dispatch_uid="posts_like_deleted")
+        post_save.connect(signals.comment_created, sender=Comment, dispatch_uid="posts_comment_created")
+        post_delete.connect(signals.comment_deleted, sender=Comment, dispatch_uid="posts_comment_deleted")
+        post_save.connect(signals.user_saved, sender=CustomUser, dispatch_uid="posts_user_saved")
+        post_save.connect(signals.team_saved, sender=Team, dispatch_uid="posts_team_saved")
+        post_save.connect(filters.invalidate_team_names, sender=Team, dispatch_uid="posts_filters_team_saved")
+        post_delete.connect(filters.invalidate_team_names, sender=Team, dispatch_uid="posts_filters_team_deleted")
+        post_save.connect(signals.post_saved, sender=Post, dispatch_uid="posts_search_index")
+        post_save.connect(signals.post_feed_saved, sender=Post, dispatch_uid="posts_team_feed")
+        post_delete.connect(signals.post_deleted, sender=Post, dispatch_uid="posts_search_remove")
+        post_save.connect(signals.post_author_changed, sender=Post, dispatch_uid="posts_own_restricted_saved")
+        post_delete.connect(signals.post_author_changed, sender=Post, dispatch_uid="posts_own_restricted_deleted")
+
+        # Buffered view counts are written after a response, in batches
+        request_finished.connect(viewcounts.counter.flush_if_due, dispatch_uid="posts_view_counts_flush")
+
+        # Any write that can change a post list response invalidates the list
+        # cache; team renames change `?team=` results and author_team
+        for model in (Post, Like, Comment, Team):
+            post_save.connect(cache.bump_generation, sender=model, dispatch_uid=f"posts_cache_{model.__name__}_saved")
+            post_delete.connect(cache.bump_generation, sender=model, dispatch_uid=f"posts_cache_{model.__name__}_deleted")
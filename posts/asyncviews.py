@@ -0,0 +1,120 @@
+"""
+ASGI-native list and retrieve for the post, comment and like viewsets.
+
+AsyncReadMixin makes `as_view()` return a coroutine view for routes whose
+GET action is `list` or `retrieve`. API_ASYNC_READS (blog_project/asgi.py
+turns it on) is read per request, so the URLconf does not fix it: with the
+setting on, a GET/HEAD request
+
+1. runs DRF's setup (authentication, permissions, throttling), the
+   queryset building (filter params may look up teams) and the serializer
+   context in a single sync_to_async call;
+2. runs the queries with the async ORM (`aiterator`, `acount`, `aget`),
+   in the same order as the sync view (posts.pagination);
+3. serializes the loaded rows in the event loop.
+
+Serializers only read what the querysets already loaded; a lazy relation
+would raise SynchronousOnlyOperation instead of querying silently. Other
+methods, and every request while the setting is off, go to the regular
+synchronous view.
+"""
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.exceptions import ObjectDoesNotExist, ValidationError
+from django.http import Http404
+
+ASYNC_METHODS = ("GET", "HEAD")
+
+
+def is_enabled():
+    return getattr(settings, "API_ASYNC_READS", False)
+
+
+class AsyncReadMixin:
+    """
+    Serves `list`/`retrieve` through `alist`/`aretrieve` (see
+    posts.conditional.ConditionalGetMixin) under ASGI. Must come before the
+    DRF viewset in the bases.
+    """
+
+    async_actions = ("list", "retrieve")
+
+    read_queryset = None
+    read_context = None
+
+    @classmethod
+    def as_view(cls, actions=None, **initkwargs):
+        view = super().as_view(actions, **initkwargs)
+        if not actions or actions.get("get") not in cls.async_actions:
+            return view
+
+        sync_view = sync_to_async(view)
+
+        async def async_view(request, *args, **kwargs):
+            if request.method not in ASYNC_METHODS or not is_enabled():
+                return await sync_view(request, *args, **kwargs)
+
+            # Same setup as ViewSetMixin.as_view()'s view function
+            self = cls(**initkwargs)
+            self.action_map = {"head": actions["get"], **actions}
+            for method, action in self.action_map.items():
+                setattr(self, method, getattr(self, action))
+            self.request = request
+            self.args = args
+            self.kwargs = kwargs
+            return await self.async_dispatch(request, *args, **kwargs)
+
+        for attr in ("cls", "initkwargs", "actions", "csrf_exempt", "__name__", "__qualname__", "__doc__"):
+            setattr(async_view, attr, getattr(view, attr, None))
+        return async_view
+
+    async def async_dispatch(self, request, *args, **kwargs):
+        """
+        APIView.dispatch() for async handlers.
+        """
+        request = self.initialize_request(request, *args, **kwargs)
+        self.request = request
+        self.headers = self.default_response_headers
+
+        try:
+            await sync_to_async(self.prepare_read)(request, *args, **kwargs)
+            handler = getattr(self, f"a{self.action}")
+            response = await handler(request, *args, **kwargs)
+        except Exception as exc:
+            response = self.handle_exception(exc)
+
+        self.response = self.finalize_response(request, response, *args, **kwargs)
+        return self.response
+
+    def prepare_read(self, request, *args, **kwargs):
+        """
+        Everything before the queries that may still touch the database.
+        """
+        self.initial(request, *args, **kwargs)
+        self.read_queryset = self.filter_queryset(self.get_queryset())
+        self.read_context = self.get_serializer_context()
+
+    def get_serializer(self, *args, **kwargs):
+        if self.read_context is None:
+            return super().get_serializer(*args, **kwargs)
+        kwargs.setdefault("context", self.read_context)
+        return self.get_serializer_class()(*args, **kwargs)
+
+    async def apaginate_queryset(self, queryset):
+        if self.paginator is None:
+            return None
+        return await self.paginator.apaginate_queryset(queryset, self.request, view=self)
+
+    async def aget_object(self):
+        """
+        GenericAPIView.get_object() on the prepared queryset, with aget().
+        """
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        lookup = {self.lookup_field: self.kwargs[lookup_url_kwarg]}
+        try:
+            obj = await self.read_queryset.aget(**lookup)
+        except (ObjectDoesNotExist, TypeError, ValueError, ValidationError):
+            raise Http404
+
+        self.check_object_permissions(self.request, obj)
+        return obj
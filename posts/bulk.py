@@ -0,0 +1,215 @@
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from drf_spectacular.utils import OpenApiResponse, extend_schema
+from rest_framework import status
+from rest_framework.decorators import action
+from rest_framework.exceptions import ValidationError
+from rest_framework.response import Response
+
+from . import cache, feed, policy, search
+from .models import Post, DEFAULT_TEAM_NAME
+from .serializers import PostWriteSerializer
+
+NOT_FOUND = "Not found."
+PERMISSION_DENIED = "You do not have permission to perform this action."
+
+
+def get_max_items():
+    return getattr(settings, "POSTS_BULK_MAX_ITEMS", 1000)
+
+
+class BulkPostMixin:
+    """
+    `/posts/bulk/` writes many posts in one request:
+
+    * POST   a list of posts to create
+    * PATCH  a list of partial posts, each with its `id`
+    * DELETE a list of post ids
+
+    Items are validated in one pass and every valid item is written with a
+    single bulk_create / bulk_update / delete inside one transaction.
+    Invalid or forbidden items are reported next to the successful ones
+    (207 Multi-Status) instead of failing the whole batch.
+
+    Bulk writes skip Post.save() and post_save, so the author team, the
+    search index, the team feed and the list cache are maintained here.
+    """
+
+    def get_bulk_items(self, request):
+        items = request.data
+        if not isinstance(items, list):
+            raise ValidationError({"non_field_errors": ["Expected a list of items."]})
+        if len(items) > get_max_items():
+            raise ValidationError({
+                "non_field_errors": [f"At most {get_max_items()} items per request."]
+            })
+        return items
+
+    def get_bulk_response(self, results, success_status):
+        ok = all("errors" not in result for result in results)
+        return Response(
+            {"results": results},
+            status=success_status if ok else status.HTTP_207_MULTI_STATUS,
+        )
+
+    def get_editable_posts(self, ids):
+        """
+        One query over every target id: {pk: post}, each annotated with
+        `can_edit` from the compiled edit policy.
+        """
+        posts = Post.objects.filter(pk__in=ids).annotate(
+            can_edit=policy.EDIT.expression(self.request.user)
+        )
+        return {post.pk: post for post in posts}
+
+    @staticmethod
+    def parse_id(value):
+        if isinstance(value, bool):
+            return None
+        try:
+            return int(value)
+        except (TypeError, ValueError):
+            return None
+
+    @extend_schema(
+        summary="Create, update or delete posts in bulk",
+        description=(
+            "POST a list of posts to create them, PATCH a list of partial posts "
+            "(each with `id`) to update them, or DELETE a list of post ids. "
+            "The response lists the outcome of every item in request order."
+        ),
+        request=PostWriteSerializer(many=True),
+        responses={
+            200: OpenApiResponse(description="Every item was updated or deleted"),
+            201: OpenApiResponse(description="Every item was created"),
+            207: OpenApiResponse(description="Some items failed; see each result"),
+            400: OpenApiResponse(description="The body is not a list or is too long"),
+        },
+    )
+    @action(detail=False, methods=["post", "patch", "delete"], url_path="bulk")
+    def bulk(self, request, *args, **kwargs):
+        items = self.get_bulk_items(request)
+        handler = {
+            "POST": self.bulk_create,
+            "PATCH": self.bulk_update,
+            "DELETE": self.bulk_destroy,
+        }[request.method]
+        return handler(request, items)
+
+    # ----------------------------
+    # Crear
+    # ----------------------------
+    def bulk_create(self, request, items):
+        user = request.user
+        team = user.team if user.team_id else None
+
+        results = [None] * len(items)
+        posts = []
+        for index, item in enumerate(items):
+            serializer = PostWriteSerializer(data=item)
+            if not serializer.is_valid():
+                results[index] = {"index": index, "errors": serializer.errors}
+                continue
+            post = Post(
+                author=user,
+                author_team=team,
+                author_team_is_default=bool(team and team.name == DEFAULT_TEAM_NAME),
+                **serializer.validated_data,
+            )
+            posts.append((index, post))
+
+        with transaction.atomic():
+            Post.objects.bulk_create([post for _, post in posts])
+            search.index_posts([post.pk for _, post in posts])
+            feed.sync_posts([post.pk for _, post in posts])
+
+        for index, post in posts:
+            results[index] = {"index": index, "id": post.pk}
+
+        if posts:
+            cache.bump_generation()
+            cache.forget_own_restricted(user.pk)
+        return self.get_bulk_response(results, status.HTTP_201_CREATED)
+
+    # ----------------------------
+    # Actualizar
+    # ----------------------------
+    def bulk_update(self, request, items):
+        ids = [self.parse_id(item.get("id")) if isinstance(item, dict) else None for item in items]
+        existing = self.get_editable_posts([pk for pk in ids if pk is not None])
+
+        results = []
+        posts = {}
+        fields = set()
+        now = timezone.now()
+        for index, (pk, item) in enumerate(zip(ids, items)):
+            if pk is None:
+                results.append({"index": index, "errors": {"id": ["A valid post id is required."]}})
+                continue
+            post = existing.get(pk)
+            if post is None:
+                results.append({"index": index, "id": pk, "errors": {"detail": NOT_FOUND}})
+                continue
+            if not post.can_edit:
+                results.append({"index": index, "id": pk, "errors": {"detail": PERMISSION_DENIED}})
+                continue
+            if pk in posts:
+                results.append({"index": index, "id": pk, "errors": {"id": ["Duplicate post id."]}})
+                continue
+
+            data = {key: value for key, value in item.items() if key != "id"}
+            serializer = PostWriteSerializer(post, data=data, partial=True)
+            if not serializer.is_valid():
+                results.append({"index": index, "id": pk, "errors": serializer.errors})
+                continue
+
+            for field, value in serializer.validated_data.items():
+                setattr(post, field, value)
+                fields.add(field)
+            post.updated_at = now
+            posts[pk] = post
+            results.append({"index": index, "id": pk})
+
+        if posts:
+            with transaction.atomic():
+                Post.objects.bulk_update(posts.values(), [*sorted(fields), "updated_at"])
+                if fields & {"title", "content"}:
+                    search.index_posts(posts)
+                if "privacy_read" in fields:
+                    # The rows loaded for the permission check are current
+                    feed.sync_loaded_posts(posts.values())
+            cache.bump_generation()
+            if "privacy_read" in fields:
+                cache.forget_own_restricted(*{post.author_id for post in posts.values()})
+
+        return self.get_bulk_response(results, status.HTTP_200_OK)
+
+    # ----------------------------
+    # Eliminar
+    # ----------------------------
+    def bulk_destroy(self, request, items):
+        ids = [self.parse_id(item) for item in items]
+        existing = self.get_editable_posts([pk for pk in ids if pk is not None])
+
+        results = []
+        deletable = set()
+        for index, pk in enumerate(ids):
+            post = existing.get(pk)
+            if pk is None:
+                results.append({"index": index, "errors": {"id": ["A valid post id is required."]}})
+            elif post is None:
+                results.append({"index": index, "id": pk, "errors": {"detail": NOT_FOUND}})
+            elif not post.can_edit:
+                results.append({"index": index, "id": pk, "errors": {"detail": PERMISSION_DENIED}})
+            else:
+                deletable.add(pk)
+                results.append({"index": index, "id": pk})
+
+        if deletable:
+            # QuerySet.delete() still sends post_delete per row, which keeps
+            # the search index and the list cache in sync.
+            with transaction.atomic():
+                Post.objects.filter(pk__in=deletable).delete()
+
+        return self.get_bulk_response(results, status.HTTP_200_OK)
@@ -0,0 +1,203 @@
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.core.cache.backends.dummy import DummyCache
+from django.core.cache.backends.locmem import LocMemCache
+
+from blog_project import replicas
+
+GENERATION_KEY = "posts:list:generation"
+CHANGED_AT_KEY = "posts:list:changed_at"
+HITS_KEY = "posts:list:hits"
+MISSES_KEY = "posts:list:misses"
+
+
+def get_cache():
+    return caches[getattr(settings, "POSTS_LIST_CACHE_ALIAS", "default")]
+
+
+def is_enabled():
+    return getattr(settings, "POSTS_LIST_CACHE_ENABLED", True)
+
+
+def get_timeout():
+    return getattr(settings, "POSTS_LIST_CACHE_TIMEOUT", 60)
+
+
+def _incr(key):
+    cache = get_cache()
+    try:
+        return cache.incr(key)
+    except ValueError:
+        # Missing key: start the counter. add() avoids clobbering a racing incr.
+        if not cache.add(key, 1, timeout=None):
+            return cache.incr(key)
+        return 1
+
+
+def get_generation():
+    return get_cache().get_or_set(GENERATION_KEY, 1, timeout=None)
+
+
+def bump_generation(*args, **kwargs):
+    """
+    Invalidate every cached post list at once. Entries are never scanned or
+    deleted: their keys embed the old generation and simply stop matching.
+    Usable directly as a post_save/post_delete receiver.
+    """
+    _incr(GENERATION_KEY)
+    get_cache().set(CHANGED_AT_KEY, time.time(), timeout=None)
+
+
+def is_shared():
+    """
+    Whether every worker process sees the same cache (not LocMem/Dummy).
+    """
+    return not isinstance(get_cache(), (LocMemCache, DummyCache))
+
+
+def get_last_change():
+    """
+    Unix time of the last generation bump, or of the first call if no write
+    has been seen yet. Moves on deletes too, unlike max(updated_at).
+    """
+    return get_cache().get_or_set(CHANGED_AT_KEY, time.time, timeout=None)
+
+
+def is_member(user):
+    """
+    Signed-in users below staff, whose own posts may fall outside their
+    visibility class.
+    """
+    return (
+        getattr(user, "is_authenticated", False)
+        and not user.is_staff
+        and not user.is_superuser
+    )
+
+
+def audience(user, own_restricted=False):
+    """
+    The part of the key that decides which rows a response contains: the
+    user's visibility class, so every member of it shares the entries.
+
+    * anonymous users;
+    * staff and superusers, who list every post;
+    * signed-in users of one team. A team's Default flag is fixed for a
+      given id until the team is saved, and team saves move the generation
+      (posts.apps), so the id stands for both.
+
+    Authors with posts only they can list (`own_restricted`, e.g. AUTHOR
+    level; see get_own_restricted) get entries of their own. `is_liked` is stored as False and
+    filled in per request (PostViewSet.get_cached_response).
+    """
+    if not getattr(user, "is_authenticated", False):
+        return "anon"
+    if not is_member(user):
+        return "all"
+    if own_restricted:
+        return f"user:{user.pk}"
+    return f"team:{user.team_id}"
+
+
+def own_restricted_posts(user):
+    """
+    Posts by `user` that their visibility class cannot list.
+    """
+    from . import policy
+    from .models import Post
+
+    return Post.objects.filter(author=user).exclude(policy.READ.audience_q(user))
+
+
+def own_restricted_key(user_id):
+    return f"posts:list:own:{user_id}"
+
+
+def get_own_restricted(user):
+    """
+    Whether `user` has own_restricted_posts(); None when unknown. Kept
+    until one of their posts or their team changes (forget_own_restricted),
+    not per generation, so other users' writes leave it alone.
+    """
+    return get_cache().get(own_restricted_key(user.pk))
+
+
+def set_own_restricted(user, value):
+    if reads_replica():
+        return
+    get_cache().set(own_restricted_key(user.pk), bool(value), timeout=None)
+
+
+def forget_own_restricted(*user_ids):
+    get_cache().delete_many([own_restricted_key(pk) for pk in user_ids])
+
+
+def make_key(request, generation, own_restricted=False):
+    params = sorted(request.query_params.lists())
+    raw = f"{request.get_host()}|{request.path}|{params}"
+    digest = hashlib.md5(raw.encode()).hexdigest()
+    return f"posts:list:{generation}:{audience(request.user, own_restricted)}:{digest}"
+
+
+def result_rows(data):
+    return data["results"] if isinstance(data, dict) else data
+
+
+def with_likes(data, liked_ids):
+    """
+    A copy of a list response whose `is_liked` values are "post id in
+    liked_ids"; with no ids, the copy shared by the whole audience.
+    """
+    data = dict(data) if isinstance(data, dict) else list(data)
+    rows = [
+        {**row, "is_liked": row.get("id") in liked_ids} if "is_liked" in row else dict(row)
+        for row in result_rows(data)
+    ]
+    if isinstance(data, dict):
+        data["results"] = rows
+        return data
+    return rows
+
+
+def has_entry(key):
+    return get_cache().has_key(key)
+
+
+def get_cached(key):
+    data = get_cache().get(key)
+    _incr(HITS_KEY if data is not None else MISSES_KEY)
+    return data
+
+
+def count_miss():
+    _incr(MISSES_KEY)
+
+
+def reads_replica():
+    """
+    Whether this request reads posts from a replica. A lagging replica can
+    miss writes that already moved the generation, so what it returns is
+    served but never stored for other requests.
+    """
+    return replicas.get_read_alias() is not None and "posts" in replicas.get_replica_apps()
+
+
+def store(key, data):
+    if reads_replica():
+        return
+    get_cache().set(key, data, timeout=get_timeout())
+
+
+def get_stats():
+    cache = get_cache()
+    hits = cache.get(HITS_KEY, 0)
+    misses = cache.get(MISSES_KEY, 0)
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": hits / total if total else 0.0,
+    }
@@ -0,0 +1,121 @@
+import hashlib
+
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date, quote_etag
+from rest_framework.response import Response
+
+from . import cache
+from .pagination import afetch_rows
+
+
+def make_etag(*parts):
+    raw = "|".join(str(part) for part in parts)
+    return quote_etag(hashlib.md5(raw.encode()).hexdigest())
+
+
+class ConditionalGetMixin:
+    """
+    Answers list/retrieve with 304 Not Modified when the client's
+    If-None-Match / If-Modified-Since still match, before any serialization
+    runs.
+
+    Lists compute their ETag from the page rows and pagination state the
+    view loads anyway, so validation costs no extra queries. Viewsets
+    describe what makes a row's representation change in get_row_version().
+
+    Last-Modified is the time of the last post/comment/like write seen by
+    the list cache generation (posts.cache), because max(updated_at) of the
+    rows does not move on deletes or counter changes. It is only sent when
+    that cache is shared by all workers: a per-process time could answer 304
+    from a worker that never saw the write. The ETag covers the rest.
+    """
+
+    def get_last_modified(self):
+        if not cache.is_shared():
+            return None
+        return cache.get_last_change()
+
+    def get_row_version(self, obj):
+        return obj.pk
+
+    def get_list_validators(self, rows, page_state):
+        etag = make_etag(
+            sorted(self.request.query_params.lists()),
+            page_state,
+            [self.get_row_version(row) for row in rows],
+        )
+        return etag, self.get_last_modified()
+
+    def get_object_validators(self, obj):
+        return make_etag(self.get_row_version(obj)), self.get_last_modified()
+
+    def get_not_modified_response(self, request, etag, last_modified):
+        if etag is None and last_modified is None:
+            return None
+        if last_modified is not None:
+            last_modified = int(last_modified)
+        response = get_conditional_response(
+            request._request, etag=etag, last_modified=last_modified
+        )
+        if response is not None:
+            self.set_validator_headers(response, etag, last_modified)
+        return response
+
+    def set_validator_headers(self, response, etag, last_modified):
+        if etag is not None:
+            response["ETag"] = etag
+        if last_modified is not None:
+            response["Last-Modified"] = http_date(int(last_modified))
+        # Validators depend on who is asking (visibility, is_liked)
+        patch_vary_headers(response, ("Cookie", "Authorization"))
+        return response
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+
+        page = self.paginate_queryset(queryset)
+        rows = page if page is not None else list(queryset)
+        return self.get_list_response(request, rows, paginated=page is not None)
+
+    async def alist(self, request, *args, **kwargs):
+        # The queryset was built during the async view's setup (see
+        # posts.asyncviews); only the queries run here.
+        queryset = self.read_queryset
+
+        page = await self.apaginate_queryset(queryset)
+        rows = page if page is not None else await afetch_rows(queryset)
+        return self.get_list_response(request, rows, paginated=page is not None)
+
+    def get_list_response(self, request, rows, paginated):
+        if paginated:
+            # count/next/previous, without results: no extra queries
+            page_state = self.paginator.get_paginated_response([]).data
+        else:
+            page_state = None
+
+        etag, last_modified = self.list_validators = self.get_list_validators(rows, page_state)
+        not_modified = self.get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+
+        serializer = self.get_serializer(rows, many=True)
+        if paginated:
+            response = self.get_paginated_response(serializer.data)
+        else:
+            response = Response(serializer.data)
+        return self.set_validator_headers(response, etag, last_modified)
+
+    def retrieve(self, request, *args, **kwargs):
+        return self.get_object_response(request, self.get_object())
+
+    async def aretrieve(self, request, *args, **kwargs):
+        return self.get_object_response(request, await self.aget_object())
+
+    def get_object_response(self, request, instance):
+        etag, last_modified = self.get_object_validators(instance)
+        not_modified = self.get_not_modified_response(request, etag, last_modified)
+        if not_modified is not None:
+            return not_modified
+        serializer = self.get_serializer(instance)
+        response = Response(serializer.data)
+        return self.set_validator_headers(response, etag, last_modified)
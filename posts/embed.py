@@ -0,0 +1,131 @@
+"""
+`?embed=comments:3,likers:5` on post lists: the latest comments and likes
+of every post on the page, so a client can render the cards without one
+request per post.
+
+Each embed costs one query for the whole page, whatever its size:
+ROW_NUMBER() OVER (PARTITION BY post_id ORDER BY created_at DESC, id DESC)
+ranks the rows of the page's posts and only the first N per post are
+returned. The results are attached to the posts as `embedded` and merged
+into the representation by PostSerializer.
+"""
+from django.conf import settings
+from django.db.models import F, Window
+from django.db.models.functions import RowNumber
+from rest_framework.exceptions import ValidationError
+
+from .pagination import afetch_rows
+
+EMBED_QUERY_PARAM = "embed"
+DEFAULT_LIMIT = 3
+
+
+def get_max_limit():
+    return getattr(settings, "POSTS_EMBED_MAX_ITEMS", 10)
+
+
+def comments_queryset():
+    from comments.models import Comment
+
+    return Comment.objects.select_related("user")
+
+
+def likes_queryset():
+    from likes.models import Like
+
+    return Like.objects.select_related("user")
+
+
+def comment_serializer():
+    from comments.serializers import CommentSerializer
+
+    return CommentSerializer
+
+
+def like_serializer():
+    from likes.serializers import LikeSerializer
+
+    return LikeSerializer
+
+
+# name in ?embed= -> (response key, queryset factory, serializer factory)
+EMBEDS = {
+    "comments": ("recent_comments", comments_queryset, comment_serializer),
+    "likers": ("recent_likers", likes_queryset, like_serializer),
+}
+
+
+def parse(request):
+    """
+    {embed name: limit} from `?embed=`; raises ValidationError (400) for
+    unknown names or bad limits.
+    """
+    raw = request.query_params.get(EMBED_QUERY_PARAM, "")
+    embeds = {}
+    errors = []
+
+    for item in filter(None, (part.strip() for part in raw.split(","))):
+        name, _, limit = item.partition(":")
+        if name not in EMBEDS:
+            errors.append(f"Unknown embed '{name}'. Choose from: {', '.join(EMBEDS)}.")
+            continue
+        try:
+            limit = int(limit) if limit else DEFAULT_LIMIT
+        except ValueError:
+            errors.append(f"'{item}': the limit must be an integer.")
+            continue
+        if not 1 <= limit <= get_max_limit():
+            errors.append(f"'{item}': the limit must be between 1 and {get_max_limit()}.")
+            continue
+        embeds[name] = limit
+
+    if errors:
+        raise ValidationError({EMBED_QUERY_PARAM: errors})
+    return embeds
+
+
+def latest_per_post(queryset, post_ids, limit):
+    """
+    The newest `limit` rows of each post in `post_ids`, in one query.
+    """
+    ranked = queryset.filter(post_id__in=post_ids).annotate(
+        embed_rank=Window(
+            RowNumber(),
+            partition_by=[F("post_id")],
+            order_by=[F("created_at").desc(), F("id").desc()],
+        )
+    )
+    return ranked.filter(embed_rank__lte=limit).order_by("post_id", "embed_rank")
+
+
+def querysets(posts, embeds):
+    post_ids = [post.pk for post in posts]
+    for name, limit in embeds.items():
+        key, make_queryset, _ = EMBEDS[name]
+        yield name, key, latest_per_post(make_queryset(), post_ids, limit)
+
+
+def set_embedded(posts, name, key, rows):
+    serializer_class = EMBEDS[name][2]()
+    grouped = {post.pk: [] for post in posts}
+    for row in rows:
+        grouped[row.post_id].append(serializer_class(row).data)
+
+    for post in posts:
+        if not hasattr(post, "embedded"):
+            post.embedded = {}
+        post.embedded[key] = grouped[post.pk]
+
+
+def attach(posts, embeds):
+    if not posts:
+        return
+    for name, key, queryset in querysets(posts, embeds):
+        set_embedded(posts, name, key, list(queryset))
+
+
+async def aattach(posts, embeds):
+    if not posts:
+        return
+    for name, key, queryset in querysets(posts, embeds):
+        set_embedded(posts, name, key, await afetch_rows(queryset))
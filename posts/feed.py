@@ -0,0 +1,218 @@
+"""
+Fan-out-on-write team feed.
+
+Every team-only post of an author outside the Default team gets one
+TeamFeedEntry(team, post, created_at) row, written when the post is saved,
+changes privacy or its author changes team. A timeline is then the merge of
+a few indexed range scans, newest first:
+
+* public and authenticated posts (post_privacy_created_idx),
+* the reader's own posts (post_author_created_idx),
+* the reader's team feed (team_feed_created_idx).
+
+With POSTS_TEAM_FEED_ENABLED off the team stream reads posts_post directly
+and no entries are written.
+"""
+from heapq import merge
+
+from django.conf import settings
+from django.db import transaction
+
+from .models import Post, TeamFeedEntry
+from .pagination import KeysetPagination
+
+Level = Post.PrivacyChoices
+
+OPEN_LEVELS = [Level.PUBLIC, Level.AUTHENTICATED]
+
+
+def is_enabled():
+    return getattr(settings, "POSTS_TEAM_FEED_ENABLED", True)
+
+
+def team_posts():
+    """
+    Posts that belong in their author's team feed.
+    """
+    return Post.objects.filter(
+        privacy_read=Level.TEAM,
+        author_team__isnull=False,
+        author_team_is_default=False,
+    )
+
+
+def expected_entries(post_ids):
+    return [
+        TeamFeedEntry(post_id=pk, team_id=team_id, created_at=created_at)
+        for pk, team_id, created_at in team_posts()
+        .filter(pk__in=post_ids)
+        .values_list("pk", "author_team_id", "created_at")
+    ]
+
+
+def loaded_entries(posts):
+    """
+    expected_entries() for posts already in memory, without a query.
+    """
+    return [
+        TeamFeedEntry(post_id=post.pk, team_id=post.author_team_id, created_at=post.created_at)
+        for post in posts
+        if post.privacy_read == Level.TEAM
+        and post.author_team_id is not None
+        and not post.author_team_is_default
+    ]
+
+
+# ----------------------------
+# Escritura
+# ----------------------------
+def replace_entries(post_ids, entries):
+    if not is_enabled() or not post_ids:
+        return
+    with transaction.atomic():
+        TeamFeedEntry.objects.filter(post_id__in=post_ids).delete()
+        TeamFeedEntry.objects.bulk_create(entries)
+
+
+def sync_posts(post_ids):
+    """
+    Rewrite the feed rows of the given posts from their current state.
+    """
+    post_ids = list(post_ids)
+    if not is_enabled() or not post_ids:
+        return
+    replace_entries(post_ids, expected_entries(post_ids))
+
+
+def sync_loaded_posts(posts):
+    """
+    sync_posts() for posts whose current state is already loaded (e.g. by
+    the bulk endpoint's permission query): only writes.
+    """
+    posts = list(posts)
+    replace_entries([post.pk for post in posts], loaded_entries(posts))
+
+
+def post_chunks(chunk_size):
+    last_pk = 0
+    while True:
+        chunk = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not chunk:
+            return
+        last_pk = chunk[-1]
+        yield chunk
+
+
+def backfill(chunk_size=1000):
+    """
+    Rebuild the feed for every post, one primary-key chunk per transaction.
+    Returns the number of posts processed.
+    """
+    processed = 0
+    for chunk in post_chunks(chunk_size):
+        sync_posts(chunk)
+        processed += len(chunk)
+    return processed
+
+
+def check(chunk_size=1000):
+    """
+    Compare the feed with the posts table. Returns (checked, missing, stale):
+    ids of posts whose entry is absent or wrong, and of posts that have an
+    entry they should not have.
+    """
+    checked = 0
+    missing, stale = set(), set()
+    for chunk in post_chunks(chunk_size):
+        checked += len(chunk)
+        expected = {
+            (entry.post_id, entry.team_id, entry.created_at)
+            for entry in expected_entries(chunk)
+        }
+        actual = set(
+            TeamFeedEntry.objects.filter(post_id__in=chunk)
+            .values_list("post_id", "team_id", "created_at")
+        )
+        missing |= {pk for pk, _, _ in expected - actual}
+        stale |= {pk for pk, _, _ in actual - expected}
+    return checked, missing, stale - missing
+
+
+# ----------------------------
+# Lectura
+# ----------------------------
+def streams(user):
+    """
+    (queryset, id field) pairs whose union is every post `user` may read.
+    """
+    if user.is_superuser:
+        return [(Post.objects.all(), "id")]
+
+    result = [
+        (Post.objects.filter(privacy_read__in=OPEN_LEVELS), "id"),
+        (Post.objects.filter(author=user), "id"),
+    ]
+    if user.team_id is not None:
+        if is_enabled():
+            result.append((TeamFeedEntry.objects.filter(team_id=user.team_id), "post_id"))
+        else:
+            result.append((
+                Post.objects.filter(
+                    privacy_read=Level.TEAM,
+                    author_team_id=user.team_id,
+                    author_team_is_default=False,
+                ),
+                "id",
+            ))
+    return result
+
+
+def range_scan(queryset, id_field, descending, values, limit):
+    prefix = "-" if descending else ""
+    ordering = (f"{prefix}created_at", f"{prefix}{id_field}")
+    queryset = queryset.order_by(*ordering)
+    if values is not None:
+        queryset = queryset.filter(KeysetPagination.seek_filter(ordering, values))
+    return list(queryset.values_list("created_at", id_field)[:limit])
+
+
+def timeline(user, descending=True, values=None, limit=10):
+    """
+    Up to `limit` (created_at, post_id) keys readable by `user`, ordered by
+    (created_at, id) and starting after `values` when given.
+    """
+    scans = [
+        range_scan(queryset, id_field, descending, values, limit)
+        for queryset, id_field in streams(user)
+    ]
+    keys = []
+    for key in merge(*scans, reverse=descending):
+        # A post found by two streams (e.g. the reader's public post) is
+        # adjacent to itself after the merge
+        if keys and keys[-1] == key:
+            continue
+        keys.append(key)
+        if len(keys) == limit:
+            break
+    return keys
+
+
+class FeedPagination(KeysetPagination):
+    """
+    Keyset pagination over the merged timeline: keys come from the range
+    scans, then the page's posts are loaded from `queryset` in one query.
+    """
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.user = request.user
+        return super().paginate_queryset(queryset, request, view)
+
+    def get_rows(self, queryset, ordering, values, limit):
+        descending = ordering[0].startswith("-")
+        keys = timeline(self.user, descending, values, limit)
+        posts = queryset.in_bulk([pk for _, pk in keys])
+        return [posts[pk] for _, pk in keys if pk in posts]
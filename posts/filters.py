@@ -0,0 +1,246 @@
+"""
+Declarative query parameter filtering shared by the post, comment and like
+viewsets.
+
+A viewset lists its parameters in `filter_params` and the columns clients
+may sort on in `ordering_columns`; QueryParamFilterBackend parses every
+parameter to its type first and answers 400 with all the problems at once,
+so raw strings never reach `.filter()`.
+
+Each parameter turns into a lookup an index can serve: dates become
+half-open, timezone-aware ranges on the raw `created_at` column (no
+`__date` cast) and team names are resolved to ids before touching posts.
+"""
+import datetime
+import hashlib
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils import timezone
+from rest_framework.exceptions import ValidationError
+from rest_framework.filters import BaseFilterBackend
+
+TEAM_NAMES_VERSION_KEY = "filters:team_names:version"
+
+
+def get_team_cache_timeout():
+    return getattr(settings, "FILTERS_TEAM_CACHE_TIMEOUT", 300)
+
+
+# ----------------------------
+# Equipos
+# ----------------------------
+def team_ids_for(name):
+    """
+    Ids of the teams called `name`, cached until any team changes.
+    """
+    from user.models import Team
+
+    version = cache.get_or_set(TEAM_NAMES_VERSION_KEY, 1, timeout=None)
+    digest = hashlib.md5(name.encode()).hexdigest()
+    key = f"filters:team_ids:{version}:{digest}"
+
+    ids = cache.get(key)
+    if ids is None:
+        ids = list(Team.objects.filter(name=name).values_list("pk", flat=True))
+        cache.set(key, ids, timeout=get_team_cache_timeout())
+    return ids
+
+
+def invalidate_team_names(*args, **kwargs):
+    try:
+        cache.incr(TEAM_NAMES_VERSION_KEY)
+    except ValueError:
+        cache.add(TEAM_NAMES_VERSION_KEY, 1, timeout=None)
+
+
+# ----------------------------
+# Parámetros
+# ----------------------------
+class Param:
+    """
+    One query parameter: `parse` turns the raw string into a value (raising
+    ValueError with a message for bad input) and `lookups` turns the value
+    into keyword arguments for `.filter()`.
+    """
+
+    description = ""
+    schema_type = "string"
+
+    def __init__(self, field, description=None):
+        self.field = field
+        if description is not None:
+            self.description = description
+
+    def parse(self, raw):
+        return raw
+
+    def lookups(self, value):
+        return {self.field: value}
+
+    def schema(self):
+        return {"type": self.schema_type}
+
+
+class IntegerParam(Param):
+    schema_type = "integer"
+
+    def parse(self, raw):
+        try:
+            value = int(raw)
+        except ValueError:
+            raise ValueError("A valid integer is required.")
+        if value < 1:
+            raise ValueError("Must be a positive integer.")
+        return value
+
+
+class ChoiceParam(Param):
+
+    def __init__(self, field, choices, description=None):
+        super().__init__(field, description)
+        self.choices = list(choices)
+
+    def parse(self, raw):
+        if raw not in self.choices:
+            raise ValueError(f"Must be one of: {', '.join(self.choices)}.")
+        return raw
+
+    def schema(self):
+        return {"type": "string", "enum": self.choices}
+
+
+class DateParam(Param):
+    """
+    A calendar day in the current time zone, matched as a half-open range on
+    the raw datetime column: `created_at >= day 00:00` for the lower bound
+    and `created_at < next day 00:00` for the upper bound (inclusive day).
+    """
+
+    schema_type = "string"
+
+    def __init__(self, field, bound, description=None):
+        super().__init__(field, description)
+        self.bound = bound
+
+    def parse(self, raw):
+        try:
+            value = datetime.date.fromisoformat(raw)
+        except ValueError:
+            raise ValueError("Enter a date in YYYY-MM-DD format.")
+        if value == datetime.date.max:
+            raise ValueError("Date is out of range.")
+        return value
+
+    def lookups(self, value):
+        if self.bound == "to":
+            value += datetime.timedelta(days=1)
+            lookup = "lt"
+        else:
+            lookup = "gte"
+        start = timezone.make_aware(
+            datetime.datetime.combine(value, datetime.time.min),
+            timezone.get_current_timezone(),
+        )
+        return {f"{self.field}__{lookup}": start}
+
+    def schema(self):
+        return {"type": "string", "format": "date"}
+
+
+class TeamNameParam(Param):
+    """
+    A team name, resolved to ids through `team_ids_for` so the posts query
+    compares the denormalized team id and never joins teams.
+    """
+
+    def lookups(self, value):
+        return {f"{self.field}__in": team_ids_for(value)}
+
+
+def created_range(field="created_at"):
+    return {
+        "created_from": DateParam(field, "from", "Created on or after this day (YYYY-MM-DD)"),
+        "created_to": DateParam(field, "to", "Created on or before this day (YYYY-MM-DD)"),
+    }
+
+
+# ----------------------------
+# Backend
+# ----------------------------
+class QueryParamFilterBackend(BaseFilterBackend):
+    """
+    Applies the view's `filter_params` ({query param: Param}) and, when the
+    view declares `ordering_columns` ({name: (order_by columns...)}), the
+    `?ordering=` parameter. Only listed names are accepted, each mapped to
+    columns with an index to match.
+    """
+
+    ordering_param = "ordering"
+
+    def get_params(self, view):
+        return getattr(view, "filter_params", {})
+
+    def filter_queryset(self, request, queryset, view):
+        errors = {}
+        filters = {}
+
+        for name, param in self.get_params(view).items():
+            if name not in request.query_params:
+                continue
+            try:
+                value = param.parse(request.query_params[name])
+            except ValueError as exc:
+                errors[name] = [str(exc)]
+                continue
+            filters.update(param.lookups(value))
+
+        ordering = self.get_ordering(request, view, errors)
+        if errors:
+            raise ValidationError(errors)
+
+        queryset = queryset.filter(**filters) if filters else queryset
+        if ordering:
+            queryset = queryset.order_by(*ordering)
+        return queryset
+
+    def get_ordering(self, request, view, errors):
+        fields = getattr(view, "ordering_columns", None)
+        raw = request.query_params.get(self.ordering_param)
+        if not fields or not raw:
+            return None
+
+        descending = raw.startswith("-")
+        columns = fields.get(raw.lstrip("-"))
+        if columns is None:
+            allowed = ", ".join(f"{name}, -{name}" for name in fields)
+            errors[self.ordering_param] = [f"Must be one of: {allowed}."]
+            return None
+        if not descending:
+            return columns
+        return [column[1:] if column.startswith("-") else f"-{column}" for column in columns]
+
+    def get_schema_operation_parameters(self, view):
+        parameters = [
+            {
+                "name": name,
+                "required": False,
+                "in": "query",
+                "description": param.description,
+                "schema": param.schema(),
+            }
+            for name, param in self.get_params(view).items()
+        ]
+        fields = getattr(view, "ordering_columns", None)
+        if fields:
+            parameters.append({
+                "name": self.ordering_param,
+                "required": False,
+                "in": "query",
+                "description": "Sort by an indexed column; prefix with '-' for descending",
+                "schema": {
+                    "type": "string",
+                    "enum": [f"{sign}{name}" for name in fields for sign in ("", "-")],
+                },
+            })
+        return parameters
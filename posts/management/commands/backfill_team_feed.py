@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from posts import feed
+
+
+class Command(BaseCommand):
+    help = (
+        "Rebuild the team feed table from the posts table. Works through the "
+        "posts in primary-key chunks, each in its own short transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of posts rewritten per transaction (default 1000).",
+        )
+
+    def handle(self, *args, chunk_size, **options):
+        if not feed.is_enabled():
+            self.stdout.write(self.style.WARNING("POSTS_TEAM_FEED_ENABLED is off, nothing to do."))
+            return
+
+        processed = feed.backfill(chunk_size)
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt the team feed for {processed} posts."))
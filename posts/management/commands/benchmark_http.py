@@ -0,0 +1,69 @@
+import statistics
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+
+from django.core.management.base import BaseCommand, CommandError
+
+
+class Command(BaseCommand):
+    help = (
+        "Load-test running servers with concurrent GET requests and report "
+        "throughput and latency per URL, e.g. the same endpoint served by a "
+        "WSGI server and by an ASGI server."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("urls", nargs="+", help="URLs to request, e.g. http://127.0.0.1:8001/api/posts/")
+        parser.add_argument(
+            "--requests",
+            type=int,
+            default=500,
+            help="Requests sent per URL (default 500).",
+        )
+        parser.add_argument(
+            "--concurrency",
+            type=int,
+            default=32,
+            help="Requests in flight at once (default 32).",
+        )
+        parser.add_argument(
+            "--warmup",
+            type=int,
+            default=20,
+            help="Untimed requests sent first to each URL (default 20).",
+        )
+
+    def handle(self, *args, urls, requests, concurrency, warmup, **options):
+        if requests < 1 or concurrency < 1:
+            raise CommandError("--requests and --concurrency must be positive.")
+
+        for url in urls:
+            self.run(url, warmup, concurrency)
+            start = time.perf_counter()
+            results = self.run(url, requests, concurrency)
+            elapsed = time.perf_counter() - start
+
+            timings = sorted(ms for ms, ok in results)
+            errors = sum(1 for ms, ok in results if not ok)
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"{url}: {requests / elapsed:.1f} req/s, "
+                f"avg {statistics.mean(timings):.2f} ms, p95 {p95:.2f} ms, {errors} errors"
+            )
+
+    def run(self, url, count, concurrency):
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            return list(pool.map(self.fetch, [url] * count))
+
+    @staticmethod
+    def fetch(url):
+        start = time.perf_counter()
+        try:
+            with urllib.request.urlopen(url, timeout=30) as response:
+                response.read()
+                ok = response.status == 200
+        except (urllib.error.URLError, OSError):
+            ok = False
+        return (time.perf_counter() - start) * 1000, ok
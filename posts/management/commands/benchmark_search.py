@@ -0,0 +1,48 @@
+import statistics
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import connection
+
+from posts import search
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Time full-text post searches against the current database (GIN on "
+        "PostgreSQL, FTS5 on SQLite) and report average and p95 latency."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("terms", nargs="+", help="Search strings to run.")
+        parser.add_argument(
+            "--repeat",
+            type=int,
+            default=20,
+            help="Runs per search string (default 20).",
+        )
+        parser.add_argument(
+            "--limit",
+            type=int,
+            default=10,
+            help="Rows fetched per run, like one list page (default 10).",
+        )
+
+    def handle(self, *args, terms, repeat, limit, **options):
+        self.stdout.write(f"Backend: {connection.vendor}, {Post.objects.count()} posts")
+
+        for text in terms:
+            queryset = search.search(Post.objects.all(), text).order_by("-search_rank", "-created_at", "-id")
+            timings = []
+            for _ in range(repeat):
+                start = time.perf_counter()
+                rows = list(queryset[:limit])
+                timings.append((time.perf_counter() - start) * 1000)
+
+            timings.sort()
+            p95 = timings[min(len(timings) - 1, int(len(timings) * 0.95))]
+            self.stdout.write(
+                f"{text!r}: {len(rows)} rows, "
+                f"avg {statistics.mean(timings):.2f} ms, p95 {p95:.2f} ms"
+            )
@@ -0,0 +1,47 @@
+import time
+
+from django.core.management.base import BaseCommand
+from django.db import router, transaction
+
+from posts import viewcounts
+from posts.models import Post
+
+
+class Command(BaseCommand):
+    help = (
+        "Measure what buffered view counting costs: the time record() adds "
+        "to each post detail read, and the time of one batched flush over "
+        "existing posts (rolled back, so no counts change)."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--events",
+            type=int,
+            default=100000,
+            help="Views recorded for the per-read timing (default 100000).",
+        )
+        parser.add_argument(
+            "--posts",
+            type=int,
+            default=1000,
+            help="Distinct posts in the timed flush (default 1000).",
+        )
+
+    def handle(self, *args, events, posts, **options):
+        ids = list(Post.objects.order_by("pk").values_list("pk", flat=True)[:posts]) or [1]
+
+        counter = viewcounts.ViewCounter(write=lambda counts: None)
+        start = time.perf_counter()
+        for i in range(events):
+            counter.record(ids[i % len(ids)])
+        per_view = (time.perf_counter() - start) / events * 1e9
+        self.stdout.write(f"record(): {per_view:.0f} ns per view over {events} views")
+
+        counts = {pk: 1 for pk in ids}
+        with transaction.atomic(using=router.db_for_write(Post)):
+            start = time.perf_counter()
+            viewcounts.write_counts(counts)
+            elapsed = (time.perf_counter() - start) * 1000
+            transaction.set_rollback(True, using=router.db_for_write(Post))
+        self.stdout.write(f"flush: {elapsed:.2f} ms for {len(counts)} posts (rolled back)")
@@ -0,0 +1,42 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from posts import feed
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the team feed table with the posts table and report posts "
+        "with a missing, wrong or leftover feed entry. Exits with an error "
+        "when drift is found, unless --fix repairs it."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of posts compared per query (default 1000).",
+        )
+        parser.add_argument(
+            "--fix",
+            action="store_true",
+            help="Rewrite the feed entries of drifted posts.",
+        )
+
+    def handle(self, *args, chunk_size, fix, **options):
+        checked, missing, stale = feed.check(chunk_size)
+        drifted = missing | stale
+
+        self.stdout.write(
+            f"Checked {checked} posts: {len(missing)} missing or wrong, {len(stale)} stale."
+        )
+        if not drifted:
+            self.stdout.write(self.style.SUCCESS("The team feed is consistent."))
+            return
+
+        if not fix:
+            sample = ", ".join(str(pk) for pk in sorted(drifted)[:20])
+            raise CommandError(f"The team feed has drifted (posts {sample}). Run with --fix.")
+
+        feed.sync_posts(sorted(drifted))
+        self.stdout.write(self.style.SUCCESS(f"Fixed {len(drifted)} posts."))
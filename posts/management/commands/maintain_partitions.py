@@ -0,0 +1,75 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from posts import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Create the upcoming monthly partitions of posts, comments and likes "
+        "and, with --retain-months, take older partitions out of the live "
+        "tables. Run it periodically (e.g. daily) on PostgreSQL."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Number of future monthly partitions to keep ready (default 3).",
+        )
+        parser.add_argument(
+            "--retain-months",
+            type=int,
+            help=(
+                "Keep this many past months of posts live; older posts are removed "
+                "together with their comments, likes and feed entries."
+            ),
+        )
+        parser.add_argument(
+            "--action",
+            choices=("archive", "detach", "drop"),
+            default="archive",
+            help=(
+                "What to do with removed partitions: move them to the archive "
+                "schema (default), leave them as plain tables, or drop them."
+            ),
+        )
+        parser.add_argument(
+            "--archive-schema",
+            default=partitioning.DEFAULT_ARCHIVE_SCHEMA,
+            help="Schema that receives archived partitions (default 'archive').",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to maintain (default 'default').",
+        )
+
+    def handle(self, *args, months_ahead, retain_months, action, archive_schema, database, **options):
+        connection = connections[database]
+        if not partitioning.is_supported(connection):
+            self.stdout.write(
+                f"Partitioning needs PostgreSQL; nothing to maintain on {connection.vendor}."
+            )
+            return
+        if months_ahead < 0 or (retain_months is not None and retain_months < 1):
+            raise CommandError("--months-ahead must not be negative and --retain-months must be at least 1.")
+
+        summary = partitioning.maintain(
+            connection,
+            months_ahead=months_ahead,
+            retain_months=retain_months,
+            action=action,
+            archive_schema=archive_schema,
+        )
+        if not summary:
+            self.stdout.write("No partitioned tables found. Run partition_tables first.")
+            return
+
+        for table, (created, removed) in summary.items():
+            self.stdout.write(self.style.SUCCESS(
+                f"{table}: {created} partitions created, {len(removed)} removed ({action})."
+            ))
+            for name in removed:
+                self.stdout.write(f"  {name}")
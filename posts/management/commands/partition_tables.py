@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from posts import partitioning
+
+
+class Command(BaseCommand):
+    help = (
+        "Convert posts, comments and likes into tables partitioned by month "
+        "on created_at (PostgreSQL only). Tables that are already partitioned "
+        "are left alone, so the command can be run again safely."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--months-ahead",
+            type=int,
+            default=3,
+            help="Number of future monthly partitions to create (default 3).",
+        )
+        parser.add_argument(
+            "--database",
+            default=DEFAULT_DB_ALIAS,
+            help="Database alias to convert (default 'default').",
+        )
+
+    def handle(self, *args, months_ahead, database, **options):
+        connection = connections[database]
+        if not partitioning.is_supported(connection):
+            self.stdout.write(
+                f"Partitioning needs PostgreSQL; {connection.vendor} keeps plain tables."
+            )
+            return
+        if months_ahead < 0:
+            raise CommandError("--months-ahead must not be negative.")
+
+        for table in partitioning.TABLES:
+            summary = partitioning.convert_table(connection, table, months_ahead)
+            if summary is None:
+                self.stdout.write(f"{table} is already partitioned.")
+                continue
+
+            self.stdout.write(self.style.SUCCESS(
+                f"Partitioned {table}: {summary['partitions']} monthly partitions, "
+                f"{summary['indexes']} indexes recreated."
+            ))
+            if summary["unique_tables"]:
+                self.stdout.write(
+                    f"Unique constraints on {table} are enforced through: {', '.join(summary['unique_tables'])}."
+                )
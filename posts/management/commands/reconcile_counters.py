@@ -0,0 +1,86 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, F, OuterRef, Q, Subquery, Value
+from django.db.models.functions import Coalesce
+
+from comments.models import Comment
+from likes.models import Like
+from posts import cache
+from posts.models import Post
+
+
+def count_of(model):
+    """
+    Correlated COUNT(*) of `model` rows pointing at the outer post.
+    """
+    counts = (
+        model.objects.filter(post=OuterRef("pk"))
+        .order_by()
+        .values("post")
+        .annotate(total=Count("pk"))
+        .values("total")
+    )
+    return Coalesce(Subquery(counts), Value(0))
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute Post.likes_count and Post.comments_count from the likes and "
+        "comments tables, fixing any drift. Works through the posts table in "
+        "primary-key chunks, each in its own short transaction."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of posts checked per transaction (default 1000).",
+        )
+        parser.add_argument(
+            "--dry-run",
+            action="store_true",
+            help="Report drifted posts without updating them.",
+        )
+
+    def handle(self, *args, chunk_size, dry_run, **options):
+        last_pk = 0
+        checked = 0
+        fixed = 0
+
+        while True:
+            chunk = list(
+                Post.objects.filter(pk__gt=last_pk)
+                .order_by("pk")
+                .values_list("pk", flat=True)[:chunk_size]
+            )
+            if not chunk:
+                break
+
+            last_pk = chunk[-1]
+            checked += len(chunk)
+
+            with transaction.atomic():
+                # Only rows that actually drifted are locked and rewritten.
+                drifted = list(
+                    Post.objects.filter(pk__in=chunk)
+                    .annotate(real_likes=count_of(Like), real_comments=count_of(Comment))
+                    .filter(~Q(likes_count=F("real_likes")) | ~Q(comments_count=F("real_comments")))
+                    .values_list("pk", flat=True)
+                )
+
+                if drifted and not dry_run:
+                    Post.objects.filter(pk__in=drifted).update(
+                        likes_count=count_of(Like),
+                        comments_count=count_of(Comment),
+                    )
+
+            fixed += len(drifted)
+
+        if fixed and not dry_run:
+            cache.bump_generation()
+
+        action = "would be fixed" if dry_run else "fixed"
+        self.stdout.write(
+            self.style.SUCCESS(f"Checked {checked} posts, {fixed} {action}.")
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from posts import trending
+
+
+class Command(BaseCommand):
+    help = (
+        "Move the trending score origin to now and shrink every stored score "
+        "to match, so scores stay far from overflowing. Run it periodically "
+        "(e.g. daily). With --rebuild, also recompute every score from the "
+        "likes and comments tables."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--rebuild",
+            action="store_true",
+            help="Recompute all scores from likes and comments after rescaling.",
+        )
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Number of posts rebuilt per transaction (default 1000).",
+        )
+
+    def handle(self, *args, rebuild, chunk_size, **options):
+        rescaled = trending.rescale()
+        self.stdout.write(self.style.SUCCESS(f"Rescaled {rescaled} trending scores."))
+
+        if rebuild:
+            processed = trending.rebuild(chunk_size)
+            self.stdout.write(self.style.SUCCESS(f"Rebuilt trending scores for {processed} posts."))
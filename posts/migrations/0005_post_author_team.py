@@ -0,0 +1,49 @@
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Case, OuterRef, Subquery, Value, When
+
+
+def backfill_author_team(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    CustomUser = apps.get_model('user', 'CustomUser')
+    Team = apps.get_model('user', 'Team')
+    db_alias = schema_editor.connection.alias
+
+    Post.objects.using(db_alias).update(
+        author_team_id=Subquery(
+            CustomUser.objects.using(db_alias).filter(pk=OuterRef('author_id')).values('team_id')[:1]
+        )
+    )
+    default_ids = Team.objects.using(db_alias).filter(name='Default').values('pk')
+    Post.objects.using(db_alias).update(
+        author_team_is_default=Case(
+            When(author_team_id__in=default_ids, then=Value(True)),
+            default=Value(False),
+        )
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0004_post_visibility_indexes'),
+        ('user', '0004_alter_customuser_team'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='author_team',
+            field=models.ForeignKey(editable=False, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='posts', to='user.team'),
+        ),
+        migrations.AddField(
+            model_name='post',
+            name='author_team_is_default',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['author_team', '-created_at', '-id'], name='post_team_created_idx'),
+        ),
+        migrations.RunPython(backfill_author_team, migrations.RunPython.noop),
+    ]
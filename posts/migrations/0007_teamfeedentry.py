@@ -0,0 +1,47 @@
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def backfill_team_feed(apps, schema_editor):
+    Post = apps.get_model('posts', 'Post')
+    TeamFeedEntry = apps.get_model('posts', 'TeamFeedEntry')
+    db_alias = schema_editor.connection.alias
+
+    posts = Post.objects.using(db_alias).filter(
+        privacy_read='team',
+        author_team__isnull=False,
+        author_team_is_default=False,
+    ).values_list('pk', 'author_team_id', 'created_at')
+
+    TeamFeedEntry.objects.using(db_alias).bulk_create(
+        [
+            TeamFeedEntry(post_id=pk, team_id=team_id, created_at=created_at)
+            for pk, team_id, created_at in posts.iterator()
+        ],
+        batch_size=1000,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0006_post_search_vector'),
+        ('user', '0004_alter_customuser_team'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TeamFeedEntry',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('created_at', models.DateTimeField()),
+                ('post', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='posts.post')),
+                ('team', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='feed_entries', to='user.team')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['team', '-created_at', '-post'], name='team_feed_created_idx')],
+                'constraints': [models.UniqueConstraint(fields=('team', 'post'), name='team_feed_entry_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_team_feed, migrations.RunPython.noop),
+    ]
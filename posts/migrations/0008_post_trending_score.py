@@ -0,0 +1,36 @@
+import time
+
+from django.db import migrations, models
+
+
+def create_clock(apps, schema_editor):
+    TrendingClock = apps.get_model('posts', 'TrendingClock')
+    db_alias = schema_editor.connection.alias
+    TrendingClock.objects.using(db_alias).get_or_create(pk=1, defaults={'origin': time.time()})
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0007_teamfeedentry'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='post',
+            name='trending_score',
+            field=models.FloatField(default=0, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='post',
+            index=models.Index(fields=['-trending_score', '-id'], name='post_trending_idx'),
+        ),
+        migrations.CreateModel(
+            name='TrendingClock',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('origin', models.FloatField()),
+            ],
+        ),
+        migrations.RunPython(create_clock, migrations.RunPython.noop),
+    ]
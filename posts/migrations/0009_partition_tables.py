@@ -0,0 +1,29 @@
+from django.conf import settings
+from django.db import migrations
+
+from posts import partitioning
+
+
+def partition_tables(apps, schema_editor):
+    # Opt-in and PostgreSQL only; otherwise the tables stay as they are and
+    # `manage.py partition_tables` can convert them later.
+    connection = schema_editor.connection
+    if not getattr(settings, 'POSTS_PARTITIONING_ENABLED', False):
+        return
+    if not partitioning.is_supported(connection):
+        return
+    for table in partitioning.TABLES:
+        partitioning.convert_table(connection, table)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('posts', '0008_post_trending_score'),
+        ('comments', '0001_initial'),
+        ('likes', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.RunPython(partition_tables, migrations.RunPython.noop),
+    ]
@@ -1,5 +1,8 @@
 from django.db import models
 from django.conf import settings
+from django.contrib.postgres.search import SearchVectorField
+
+DEFAULT_TEAM_NAME = "Default"
 
 class Post(models.Model):
 
@@ -32,43 +35,118 @@ class Post(models.Model):
         default=PrivacyChoices.AUTHOR
     )
 
+    # Denormalized copy of author.team, kept in sync by Post.save() and
+    # posts.signals, so visibility checks never join users/teams.
+    author_team = models.ForeignKey(
+        "user.Team",
+        on_delete=models.SET_NULL,
+        null=True,
+        editable=False,
+        related_name="posts"
+    )
+    author_team_is_default = models.BooleanField(default=False, editable=False)
+
+    # Denormalized counters, kept in sync by posts.signals and repaired
+    # with `manage.py reconcile_counters`.
+    likes_count = models.PositiveIntegerField(default=0, editable=False)
+    comments_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Detail views, buffered in memory and added in batches by posts.viewcounts
+    views_count = models.PositiveIntegerField(default=0, editable=False)
+
+    # Time-decayed popularity, maintained by posts.trending. Stored relative
+    # to TrendingClock.origin so it only grows between rescales.
+    trending_score = models.FloatField(default=0, editable=False)
+
+    # Full-text document (PostgreSQL only), maintained by posts.search.
+    # The GIN index is created in migration 0006 on PostgreSQL only.
+    search_vector = SearchVectorField(null=True, editable=False)
+
+    class Meta:
+        indexes = [
+            # Backs keyset pagination over (-created_at, -id)
+            models.Index(fields=["-created_at", "-id"], name="post_created_id_idx"),
+            # Back the per-branch visibility filters of the post list
+            models.Index(fields=["privacy_read", "-created_at", "-id"], name="post_privacy_created_idx"),
+            models.Index(fields=["author", "-created_at", "-id"], name="post_author_created_idx"),
+            models.Index(fields=["author_team", "-created_at", "-id"], name="post_team_created_idx"),
+            # Top-N trending reads walk this index
+            models.Index(fields=["-trending_score", "-id"], name="post_trending_idx"),
+        ]
+
     @property
     def excerpt(self):
         return self.content[:200]
 
-    def can_user_read(self, user):
-        if getattr(user, "is_superuser", False):
-            return True
-
-        mapping = {
-            self.PrivacyChoices.PUBLIC: lambda u: True,
-            self.PrivacyChoices.AUTHENTICATED: lambda u: u.is_authenticated,
-            self.PrivacyChoices.TEAM: lambda u: (
-                getattr(u, "is_authenticated", False)
-                and u.team == self.author.team
-                and self.author.team.name != "Default"
-            ),
-            self.PrivacyChoices.AUTHOR: lambda u: getattr(u, "is_authenticated", False) and u == self.author
-        }
-
-        return mapping.get(self.privacy_read, lambda u: False)(user)
+    def save(self, *args, **kwargs):
+        if self.author_id:
+            self.author_team_id, self.author_team_is_default = self.get_author_team()
+        super().save(*args, **kwargs)
 
-    def can_user_edit(self, user):
+    def get_author_team(self):
+        """
+        Return (team_id, is_default) for the author's team from the
+        denormalized columns. When the author is already loaded in memory and
+        has moved team since this row was read, the loaded author wins.
+        """
+        if self.author_team_id is None or (
+            Post.author.is_cached(self) and self.author.team_id != self.author_team_id
+        ):
+            team = self.author.team
+            return team.pk, team.name == DEFAULT_TEAM_NAME
+        return self.author_team_id, self.author_team_is_default
+
+    def is_same_team(self, user):
         if not getattr(user, "is_authenticated", False):
             return False
+        team_id, is_default = self.get_author_team()
+        return not is_default and user.team_id == team_id
 
-        if getattr(user, "is_superuser", False):
-            return True
-        
-        mapping = {
-            self.PrivacyChoices.AUTHENTICATED: lambda u: u.is_authenticated,
-            self.PrivacyChoices.TEAM: lambda u: (
-                self.author.team.name != "Default" and u.team == self.author.team
-            ),
-            self.PrivacyChoices.AUTHOR: lambda u: u == self.author
-        }
+    def can_user_read(self, user):
+        from .policy import READ
+        return READ.allows(user, self)
 
-        return mapping.get(self.privacy_write, lambda u: False)(user)
+    def can_user_edit(self, user):
+        from .policy import EDIT
+        return EDIT.allows(user, self)
 
     def __str__(self):
         return self.title
+
+
+class TeamFeedEntry(models.Model):
+    """
+    Fan-out-on-write copy of team-only posts, one row per (team, post), so a
+    team timeline is a range scan over (team, -created_at, -post) instead of
+    a filter over the whole posts table. Maintained by posts.feed.
+    """
+
+    team = models.ForeignKey(
+        "user.Team",
+        on_delete=models.CASCADE,
+        related_name="feed_entries"
+    )
+    post = models.ForeignKey(
+        Post,
+        on_delete=models.CASCADE,
+        related_name="feed_entries"
+    )
+    # Copy of post.created_at, the feed's sort key
+    created_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["team", "post"], name="team_feed_entry_unique"),
+        ]
+        indexes = [
+            models.Index(fields=["team", "-created_at", "-post"], name="team_feed_created_idx"),
+        ]
+
+
+class TrendingClock(models.Model):
+    """
+    Single row holding the origin (unix seconds) that stored trending
+    scores are relative to. Moved forward by `manage.py rescale_trending`.
+    """
+
+    origin = models.FloatField()
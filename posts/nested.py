@@ -0,0 +1,58 @@
+"""
+Shared behaviour of the viewsets nested under /api/posts/{post_pk}/.
+
+Rows are only listed when the parent post exists and the user may read
+it, and that check rides along with the page query: the rows are filtered
+with `post_id IN (SELECT id FROM posts_post WHERE id = <post_pk> AND
+<read policy>)`. A non-empty page therefore proves the parent is visible;
+only an empty first page needs one more (indexed) query to tell "no rows
+yet" from "no such post", which answers 404.
+"""
+from django.http import Http404
+
+from . import policy
+from .models import Post
+
+
+class ParentPostMixin:
+    """
+    Must come before AsyncReadMixin in the bases so both pagination paths
+    go through it.
+    """
+
+    parent_lookup_kwarg = "post_pk"
+
+    def get_parent_id(self):
+        raw = self.kwargs.get(self.parent_lookup_kwarg)
+        if raw is None:
+            return None
+        try:
+            return int(raw)
+        except ValueError:
+            raise Http404
+
+    def get_visible_parent(self):
+        """
+        The parent post, if the user may read it, as a queryset.
+        """
+        queryset = Post.objects.filter(pk=self.get_parent_id())
+        return policy.READ.filter(queryset, self.request.user)
+
+    def filter_by_parent(self, queryset):
+        if self.get_parent_id() is None:
+            return queryset
+        return queryset.filter(post_id__in=self.get_visible_parent().values("pk"))
+
+    def paginate_queryset(self, queryset):
+        page = super().paginate_queryset(queryset)
+        if not page and self.get_parent_id() is not None:
+            if not self.get_visible_parent().exists():
+                raise Http404
+        return page
+
+    async def apaginate_queryset(self, queryset):
+        page = await super().apaginate_queryset(queryset)
+        if not page and self.get_parent_id() is not None:
+            if not await self.get_visible_parent().aexists():
+                raise Http404
+        return page
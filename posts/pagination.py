@@ -1,7 +1,543 @@
-from rest_framework.pagination import PageNumberPagination
+import hashlib
+import json
+from base64 import urlsafe_b64decode, urlsafe_b64encode
 
-class PostPagination(PageNumberPagination):
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.core.cache import caches
+from django.core.paginator import InvalidPage
+from django.db import connections
+from django.db.models import Q
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+
+async def afetch_rows(queryset):
+    """
+    Evaluate `queryset` with the async ORM.
+    """
+    return [row async for row in queryset.aiterator()]
+
+
+class KeysetPagination(BasePagination):
+    """
+    Keyset (seek) pagination over a unique, indexed ordering.
+
+    The cursor is an opaque token holding the ordering values of the row at
+    the edge of the page, so every page is a range scan starting at that row:
+    page 500 costs the same as page 1 and no COUNT(*) is ever issued.
+    """
+
+    page_size = 10
+    page_size_query_param = "page_size"
+    max_page_size = 50
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    # Must end with a unique column so every row has a distinct position.
+    ordering = ("-created_at", "-id")
+
+    def paginate_queryset(self, queryset, request, view=None):
+        ordering, values = self.start_page(queryset, request)
+        rows = self.get_rows(queryset, ordering, values, self.page_size + 1)
+        return self.finish_page(rows)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        ordering, values = self.start_page(queryset, request)
+        rows = await self.aget_rows(queryset, ordering, values, self.page_size + 1)
+        return self.finish_page(rows)
+
+    def start_page(self, queryset, request):
+        """
+        Read the request; returns the ordering and seek values of the page.
+        """
+        self.request = request
+        self.base_url = request.build_absolute_uri()
+        self.page_size = self.get_page_size(request)
+
+        values, reverse = self.decode_cursor(request, queryset.model)
+        self.has_cursor = values is not None
+        self.reverse = reverse
+        return self.get_ordering(reverse), values
+
+    def finish_page(self, rows):
+        self.has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+
+        if self.reverse:
+            rows.reverse()
+
+        self.page = rows
+        return rows
+
+    def seek(self, queryset, ordering, values):
+        queryset = queryset.order_by(*ordering)
+        if values is not None:
+            queryset = queryset.filter(self.seek_filter(ordering, values))
+        return queryset
+
+    def get_rows(self, queryset, ordering, values, limit):
+        """
+        The first `limit` rows in `ordering` that come after `values`.
+        """
+        return list(self.seek(queryset, ordering, values)[:limit])
+
+    async def aget_rows(self, queryset, ordering, values, limit):
+        return await afetch_rows(self.seek(queryset, ordering, values)[:limit])
+
+    def get_page_size(self, request):
+        try:
+            size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        if size <= 0:
+            return self.page_size
+        return min(size, self.max_page_size)
+
+    def get_ordering(self, reverse=False):
+        if not reverse:
+            return self.ordering
+        return tuple(
+            field[1:] if field.startswith("-") else f"-{field}"
+            for field in self.ordering
+        )
+
+    @staticmethod
+    def seek_filter(ordering, values):
+        """
+        Lexicographic "comes after" predicate for the given ordering, e.g.
+        (created_at < c) OR (created_at = c AND id < i) for descending keys.
+        """
+        condition = Q()
+        equal = Q()
+        for field, value in zip(ordering, values):
+            name = field.lstrip("-")
+            lookup = "lt" if field.startswith("-") else "gt"
+            condition |= equal & Q(**{f"{name}__{lookup}": value})
+            equal &= Q(**{name: value})
+        return condition
+
+    # ----------------------------
+    # Cursor encoding
+    # ----------------------------
+    def encode_cursor(self, row, reverse):
+        values = [getattr(row, field.lstrip("-")) for field in self.ordering]
+        payload = json.dumps({"v": values, "r": int(reverse)}, default=self.encode_value)
+        token = urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+        return replace_query_param(self.base_url, self.cursor_query_param, token)
+
+    @staticmethod
+    def encode_value(value):
+        # isoformat() keeps full microsecond precision, which the seek needs
+        if hasattr(value, "isoformat"):
+            return value.isoformat()
+        return str(value)
+
+    def decode_cursor(self, request, model):
+        token = request.query_params.get(self.cursor_query_param)
+        if not token:
+            return None, False
+
+        try:
+            padded = token + "=" * (-len(token) % 4)
+            payload = json.loads(urlsafe_b64decode(padded.encode()))
+            raw_values = payload["v"]
+            if len(raw_values) != len(self.ordering):
+                raise ValueError
+            values = [
+                model._meta.get_field(field.lstrip("-")).to_python(value)
+                for field, value in zip(self.ordering, raw_values)
+            ]
+            return values, bool(payload.get("r"))
+        except Exception:
+            raise NotFound(self.invalid_cursor_message)
+
+    # ----------------------------
+    # Links / response
+    # ----------------------------
+    def get_next_link(self):
+        # After walking backward there is always the page we came from.
+        if not self.page or not (self.has_more or self.reverse):
+            return None
+        return self.encode_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        # After walking forward from a cursor there is always an earlier page.
+        if not self.page:
+            return None
+        if (self.reverse and self.has_more) or (self.has_cursor and not self.reverse):
+            return self.encode_cursor(self.page[0], reverse=True)
+        return None
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "previous": {"type": "string", "nullable": True, "format": "uri"},
+                "results": schema,
+            },
+        }
+
+
+def get_count_cap():
+    return getattr(settings, "PAGINATION_COUNT_CAP", 1000)
+
+
+def get_count_cache():
+    return caches[getattr(settings, "PAGINATION_COUNT_CACHE_ALIAS", "default")]
+
+
+def get_count_cache_timeout():
+    return getattr(settings, "PAGINATION_COUNT_CACHE_TIMEOUT", 30)
+
+
+class CountedPage:
+    """
+    The part of django.core.paginator.Page that PageNumberPagination's links
+    use, for pages read without knowing the total.
+    """
+
+    def __init__(self, object_list, number, has_more):
+        self.object_list = object_list
+        self.number = number
+        self.has_more = has_more
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def has_next(self):
+        return self.has_more
+
+    def has_previous(self):
+        return self.number > 1
+
+    def next_page_number(self):
+        return self.number + 1
+
+    def previous_page_number(self):
+        return self.number - 1
+
+
+class CountModePagination(PageNumberPagination):
+    """
+    Page-number pagination where `?count=` chooses how `count` is computed:
+
+    * `exact` (default): COUNT(*) over the whole queryset.
+    * `capped`: counts at most PAGINATION_COUNT_CAP rows; above that the
+      count is reported as e.g. "1000+".
+    * `estimate`: the planner's row estimate on PostgreSQL (pg_class
+      reltuples for unfiltered lists, EXPLAIN otherwise); capped elsewhere.
+    * `cached`: the exact count, cached per query for a short TTL.
+    * `none`: no count at all.
+
+    Except for `exact`, pages are read with one extra row to tell whether a
+    next page exists, so the count never decides the links.
+    """
+
+    count_query_param = "count"
+    default_count_mode = "exact"
+    count_modes = ("exact", "capped", "estimate", "cached", "none")
+
+    def get_count_mode(self, request):
+        mode = request.query_params.get(self.count_query_param, self.default_count_mode)
+        return mode if mode in self.count_modes else self.default_count_mode
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.count_mode = self.get_count_mode(request)
+        if self.count_mode == "exact":
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        number = self.get_page_number_value(request)
+        offset = (number - 1) * page_size
+        rows = self.set_counted_page(request, list(queryset[offset:offset + page_size + 1]), number, page_size)
+        self.count, self.count_type = self.get_count(queryset)
+        return rows
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        """
+        Async form of paginate_queryset, with the queries in the same order:
+        a page that turns out empty or out of range skips the rest.
+        """
+        self.count_mode = self.get_count_mode(request)
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        if self.count_mode == "exact":
+            return await self.apaginate_exact(queryset, request, page_size)
+
+        number = self.get_page_number_value(request)
+        offset = (number - 1) * page_size
+        rows = await afetch_rows(queryset[offset:offset + page_size + 1])
+        rows = self.set_counted_page(request, rows, number, page_size)
+        self.count, self.count_type = await self.aget_count(queryset)
+        return rows
+
+    async def apaginate_exact(self, queryset, request, page_size):
+        # The count decides whether the page exists, so it runs first; an
+        # empty slice of an empty list runs no query (like the sync path)
+        paginator = self.django_paginator_class(queryset, page_size)
+        raw = request.query_params.get(self.page_query_param) or 1
+        paginator.count = await queryset.acount()
+
+        number = paginator.num_pages if raw in self.last_page_strings else self.get_page_number_value(request)
+        try:
+            self.page = paginator.page(number)
+        except InvalidPage as exc:
+            raise NotFound(self.invalid_page_message.format(page_number=raw, message=str(exc)))
+        rows = await afetch_rows(self.page.object_list)
+        self.page.object_list = rows
+
+        if paginator.num_pages > 1 and self.template is not None:
+            self.display_page_controls = True
+        self.request = request
+        return rows
+
+    def get_page_number_value(self, request):
+        try:
+            number = int(request.query_params.get(self.page_query_param, 1))
+            if number < 1:
+                raise ValueError
+        except ValueError:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=request.query_params.get(self.page_query_param),
+                message="Invalid page.",
+            ))
+        return number
+
+    def set_counted_page(self, request, rows, number, page_size):
+        if not rows and number > 1:
+            raise NotFound(self.invalid_page_message.format(
+                page_number=number, message="That page contains no results",
+            ))
+
+        self.request = request
+        self.display_page_controls = False
+        self.page = CountedPage(rows[:page_size], number, len(rows) > page_size)
+        return list(self.page)
+
+    # ----------------------------
+    # Counts
+    # ----------------------------
+    def get_count(self, queryset):
+        """
+        (count, count_type) for the mode in use; count_type says which
+        strategy actually produced the number.
+        """
+        if self.count_mode == "none":
+            return None, None
+        if self.count_mode == "cached":
+            return self.get_cached_count(queryset), "cached"
+        if self.count_mode == "estimate" and connections[queryset.db].vendor == "postgresql":
+            estimate = self.get_estimated_count(queryset)
+            if estimate is not None:
+                return estimate, "estimate"
+        return self.get_capped_count(queryset), "capped"
+
+    async def aget_count(self, queryset):
+        if self.count_mode == "none":
+            return None, None
+        if self.count_mode == "capped" or (
+            self.count_mode == "estimate" and connections[queryset.db].vendor != "postgresql"
+        ):
+            return await self.aget_capped_count(queryset), "capped"
+        # Cache lookups and EXPLAIN go through the sync code paths
+        return await sync_to_async(self.get_count)(queryset)
+
+    async def aget_capped_count(self, queryset):
+        cap = get_count_cap()
+        count = await queryset.order_by()[:cap + 1].acount()
+        return f"{cap}+" if count > cap else count
+
+    def get_capped_count(self, queryset):
+        cap = get_count_cap()
+        # SELECT COUNT(*) FROM (... LIMIT cap + 1): stops after cap + 1 rows
+        count = queryset.order_by()[:cap + 1].count()
+        return f"{cap}+" if count > cap else count
+
+    def get_cached_count(self, queryset):
+        queryset = queryset.order_by()
+        sql, params = queryset.query.sql_with_params()
+        digest = hashlib.md5(f"{queryset.db}|{sql}|{params}".encode()).hexdigest()
+        return get_count_cache().get_or_set(
+            f"pagination:count:{digest}", queryset.count, timeout=get_count_cache_timeout()
+        )
+
+    def get_estimated_count(self, queryset):
+        connection = connections[queryset.db]
+        with connection.cursor() as cursor:
+            if not queryset.query.where:
+                cursor.execute(
+                    "SELECT reltuples FROM pg_class WHERE oid = %s::regclass",
+                    [queryset.model._meta.db_table],
+                )
+            else:
+                sql, params = queryset.order_by().query.sql_with_params()
+                cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+            row = cursor.fetchone()
+
+        if row is None:
+            return None
+        if isinstance(row[0], (int, float)):
+            estimate = row[0]
+        else:
+            plan = json.loads(row[0]) if isinstance(row[0], str) else row[0]
+            estimate = plan[0]["Plan"]["Plan Rows"]
+        # reltuples is -1 for tables that were never analyzed
+        if estimate < 0:
+            return None
+        return int(estimate)
+
+    # ----------------------------
+    # Response
+    # ----------------------------
+    def get_previous_link(self):
+        if self.count_mode == "exact":
+            return super().get_previous_link()
+        if not self.page.has_previous():
+            return None
+        url = self.request.build_absolute_uri()
+        if self.page.number == 2:
+            return remove_query_param(url, self.page_query_param)
+        return replace_query_param(url, self.page_query_param, self.page.previous_page_number())
+
+    def get_paginated_response(self, data):
+        if self.count_mode == "exact":
+            return super().get_paginated_response(data)
+
+        body = {}
+        if self.count_type is not None:
+            body["count"] = self.count
+            body["count_type"] = self.count_type
+        body.update({
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        })
+        return Response(body)
+
+    def get_paginated_response_schema(self, schema):
+        response_schema = super().get_paginated_response_schema(schema)
+        properties = response_schema["properties"]
+        properties["count"] = {
+            "oneOf": [{"type": "integer"}, {"type": "string", "example": "1000+"}],
+            "description": "Omitted with ?count=none",
+        }
+        properties["count_type"] = {
+            "type": "string",
+            "enum": ["capped", "estimate", "cached"],
+            "description": "Present unless the count is exact",
+        }
+        response_schema["required"] = ["results"]
+        return response_schema
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            "name": self.count_query_param,
+            "required": False,
+            "in": "query",
+            "description": "How to compute `count`: " + ", ".join(self.count_modes),
+            "schema": {"type": "string", "enum": list(self.count_modes)},
+        })
+        return parameters
+
+
+class QuerysetKeysetPagination(KeysetPagination):
+    """
+    Keyset pagination in the order the queryset is already sorted by (e.g.
+    by the view's `?ordering=`), which must end with a unique column.
+    """
+
+    def start_page(self, queryset, request):
+        ordering = tuple(queryset.query.order_by)
+        if ordering and all(isinstance(field, str) for field in ordering):
+            self.ordering = ordering
+        return super().start_page(queryset, request)
+
+
+class PageOrCursorPagination(CountModePagination):
+    """
+    Page-number pagination by default. Sending `?pagination=cursor` (or any
+    `?cursor=` token) switches to `keyset_class`, with the same page sizes.
+    """
+
+    mode_query_param = "pagination"
+    keyset_class = KeysetPagination
+
+    def use_keyset(self, request):
+        return (
+            request.query_params.get(self.mode_query_param) == "cursor"
+            or self.keyset_class.cursor_query_param in request.query_params
+        )
+
+    def get_keyset(self, request):
+        self.keyset = None
+        if self.use_keyset(request):
+            self.keyset = self.keyset_class()
+            self.keyset.page_size = self.page_size
+            self.keyset.max_page_size = self.max_page_size
+        return self.keyset
+
+    def paginate_queryset(self, queryset, request, view=None):
+        if self.get_keyset(request) is not None:
+            return self.keyset.paginate_queryset(queryset, request, view)
+        return super().paginate_queryset(queryset, request, view)
+
+    async def apaginate_queryset(self, queryset, request, view=None):
+        if self.get_keyset(request) is not None:
+            return await self.keyset.apaginate_queryset(queryset, request, view)
+        return await super().apaginate_queryset(queryset, request, view)
+
+    def get_paginated_response(self, data):
+        if self.keyset is not None:
+            return self.keyset.get_paginated_response(data)
+        return super().get_paginated_response(data)
+
+    def get_schema_operation_parameters(self, view):
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.extend([
+            {
+                "name": self.mode_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Use 'cursor' for keyset pagination (no count, constant cost per page)",
+                "schema": {"type": "string", "enum": ["page", "cursor"]},
+            },
+            {
+                "name": self.keyset_class.cursor_query_param,
+                "required": False,
+                "in": "query",
+                "description": "Opaque cursor taken from the 'next'/'previous' links",
+                "schema": {"type": "string"},
+            },
+        ])
+        return parameters
+
+
+class PostPagination(PageOrCursorPagination):
+    """
+    Page numbers by default; `?pagination=cursor` walks (-created_at, -id).
+    """
 
     page_size = 10
     page_size_query_param = "page_size"
-    max_page_size = 50
\ No newline at end of file
+    max_page_size = 50
@@ -0,0 +1,381 @@
+"""
+Monthly range partitioning on `created_at` for posts_post, comments_comment
+and likes_like (PostgreSQL only).
+
+`convert_table` swaps a plain table for a partitioned one with the same
+columns: one partition per month from the oldest row to a few months
+ahead, a DEFAULT partition as a safety net, the same non-unique indexes
+(created on the parent, so every partition gets them) and its outgoing
+foreign keys. Date-bounded queries on the raw column, such as the
+created_from/created_to filters of posts.filters, then only touch the
+matching partitions.
+
+PostgreSQL requires every unique constraint of a partitioned table to
+include the partition key, so:
+
+* the primary key becomes (id, created_at); ids still come from a sequence;
+* other unique constraints, like (user, post) of likes_like, move to a
+  side table holding just those columns, kept in step by a trigger. A
+  duplicate still fails with an IntegrityError, so the models'
+  `unique_together` stays true of the database;
+* foreign keys *to* posts_post (comments, likes, team feed) are dropped at
+  the database level. Django's ForeignKey fields and on_delete cascades
+  keep working (they run in Python).
+
+`maintain` creates upcoming partitions and takes posts older than the
+retention window out of the live tables. Retention follows posts_post:
+the comments, likes and other rows of an old posts partition go with it
+in the same transaction, so no live row points at a missing post and
+live posts never lose rows (counters stay right). Partitions of the
+other tables are only removed once that leaves them empty; since rows
+are never older than their post, old ones empty out this way.
+
+Other backends keep plain tables: every entry point checks `is_supported`.
+"""
+import datetime
+
+from django.db import transaction
+
+POSTS_TABLE = "posts_post"
+TABLES = (POSTS_TABLE, "comments_comment", "likes_like")
+DEFAULT_ARCHIVE_SCHEMA = "archive"
+
+
+def is_supported(connection):
+    return connection.vendor == "postgresql"
+
+
+# ----------------------------
+# Meses
+# ----------------------------
+def month_start(value):
+    return datetime.datetime(value.year, value.month, 1, tzinfo=datetime.timezone.utc)
+
+
+def add_months(month, count):
+    index = month.year * 12 + month.month - 1 + count
+    return month.replace(year=index // 12, month=index % 12 + 1)
+
+
+def partition_name(table, month):
+    return f"{table}_p{month:%Y%m}"
+
+
+def default_partition_name(table):
+    return f"{table}_default"
+
+
+# ----------------------------
+# Catálogo
+# ----------------------------
+def is_partitioned(cursor, table):
+    cursor.execute(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(%s)",
+        [table],
+    )
+    return cursor.fetchone() is not None
+
+
+def table_exists(cursor, name):
+    cursor.execute("SELECT to_regclass(%s) IS NOT NULL", [name])
+    return cursor.fetchone()[0]
+
+
+def plain_indexes(cursor, table):
+    """
+    (name, CREATE INDEX statement) of the table's non-unique indexes.
+    """
+    cursor.execute(
+        """
+        SELECT c.relname, pg_get_indexdef(i.indexrelid)
+        FROM pg_index i JOIN pg_class c ON c.oid = i.indexrelid
+        WHERE i.indrelid = to_regclass(%s) AND NOT i.indisunique
+        ORDER BY c.relname
+        """,
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def unique_constraints(cursor, table):
+    """
+    (name, [columns]) of the table's unique indexes besides the primary key.
+    """
+    cursor.execute(
+        """
+        SELECT c.relname, array_agg(a.attname ORDER BY k.position)
+        FROM pg_index i
+        JOIN pg_class c ON c.oid = i.indexrelid
+        CROSS JOIN LATERAL unnest(i.indkey::int2[]) WITH ORDINALITY AS k(attnum, position)
+        JOIN pg_attribute a ON a.attrelid = i.indrelid AND a.attnum = k.attnum
+        WHERE i.indrelid = to_regclass(%s) AND i.indisunique AND NOT i.indisprimary
+        GROUP BY c.relname
+        ORDER BY c.relname
+        """,
+        [table],
+    )
+    return [(name, list(columns)) for name, columns in cursor.fetchall()]
+
+
+def outgoing_foreign_keys(cursor, table):
+    """
+    (name, definition) of the table's foreign keys whose target is a plain
+    table; a partitioned target cannot be referenced by `id` alone.
+    """
+    cursor.execute(
+        """
+        SELECT con.conname, pg_get_constraintdef(con.oid)
+        FROM pg_constraint con
+        WHERE con.conrelid = to_regclass(%s) AND con.contype = 'f'
+          AND con.confrelid NOT IN (SELECT partrelid FROM pg_partitioned_table)
+        ORDER BY con.conname
+        """,
+        [table],
+    )
+    return cursor.fetchall()
+
+
+def dependent_tables():
+    """
+    (table, column) of every model with a foreign key to Post.
+    """
+    from .models import Post
+
+    return [
+        (relation.related_model._meta.db_table, relation.field.column)
+        for relation in Post._meta.related_objects
+        if not relation.many_to_many
+    ]
+
+
+def partition_months(cursor, table):
+    """
+    Months of the table's monthly partitions, from their names.
+    """
+    cursor.execute(
+        """
+        SELECT c.relname
+        FROM pg_inherits i JOIN pg_class c ON c.oid = i.inhrelid
+        WHERE i.inhparent = to_regclass(%s)
+        """,
+        [table],
+    )
+    prefix = f"{table}_p"
+    months = []
+    for (name,) in cursor.fetchall():
+        if name.startswith(prefix):
+            suffix = name[len(prefix):]
+            if len(suffix) == 6 and suffix.isdigit():
+                months.append(datetime.datetime(int(suffix[:4]), int(suffix[4:]), 1, tzinfo=datetime.timezone.utc))
+    return sorted(months)
+
+
+# ----------------------------
+# Particiones
+# ----------------------------
+def create_partition(cursor, table, month):
+    """
+    Create the partition for `month` unless it exists. Rows already sitting
+    in the DEFAULT partition for that month are moved into it.
+    """
+    name = partition_name(table, month)
+    if table_exists(cursor, name):
+        return False
+
+    start, end = month, add_months(month, 1)
+    default = default_partition_name(table)
+    in_range = "created_at >= %s AND created_at < %s"
+
+    cursor.execute(f"SELECT 1 FROM {default} WHERE {in_range} LIMIT 1", [start, end])
+    stranded = cursor.fetchone() is not None
+    if stranded:
+        cursor.execute(
+            f"CREATE TEMPORARY TABLE partition_moving ON COMMIT DROP AS "
+            f"SELECT * FROM {default} WHERE {in_range}",
+            [start, end],
+        )
+        cursor.execute(f"DELETE FROM {default} WHERE {in_range}", [start, end])
+
+    cursor.execute(
+        f"CREATE TABLE {name} PARTITION OF {table} FOR VALUES FROM (%s) TO (%s)",
+        [start, end],
+    )
+
+    if stranded:
+        cursor.execute(f"INSERT INTO {table} SELECT * FROM partition_moving")
+        cursor.execute("DROP TABLE partition_moving")
+    return True
+
+
+def keep_unique(cursor, table, name, columns):
+    """
+    Enforce a unique constraint of partitioned `table` through the side
+    table `{name}_keys`, filled from the current rows and kept in step by
+    an AFTER trigger. Returns the side table's name.
+    """
+    keys = f"{name}_keys"
+    column_list = ", ".join(columns)
+    old = " AND ".join(f"{column} = OLD.{column}" for column in columns)
+    new = ", ".join(f"NEW.{column}" for column in columns)
+
+    cursor.execute(f"CREATE TABLE {keys} AS SELECT {column_list} FROM {table}")
+    cursor.execute(f"ALTER TABLE {keys} ADD UNIQUE ({column_list})")
+    cursor.execute(
+        f"""
+        CREATE FUNCTION {keys}_sync() RETURNS trigger AS $$
+        BEGIN
+            IF TG_OP <> 'INSERT' THEN
+                DELETE FROM {keys} WHERE {old};
+            END IF;
+            IF TG_OP <> 'DELETE' THEN
+                INSERT INTO {keys} ({column_list}) VALUES ({new});
+            END IF;
+            RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+        """
+    )
+    cursor.execute(
+        f"CREATE TRIGGER {keys}_sync AFTER INSERT OR DELETE OR UPDATE OF {column_list} "
+        f"ON {table} FOR EACH ROW EXECUTE FUNCTION {keys}_sync()"
+    )
+    return keys
+
+
+def convert_table(connection, table, months_ahead=3, now=None):
+    """
+    Replace `table` with a partitioned copy. Returns a summary dict, or None
+    when the table is already partitioned.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    legacy = f"{table}_unpartitioned"
+    sequence = f"{table}_partitioned_id_seq"
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        if is_partitioned(cursor, table):
+            return None
+
+        cursor.execute(f"LOCK TABLE {table} IN ACCESS EXCLUSIVE MODE")
+        indexes = plain_indexes(cursor, table)
+        foreign_keys = outgoing_foreign_keys(cursor, table)
+        uniques = unique_constraints(cursor, table)
+
+        cursor.execute(f"ALTER TABLE {table} RENAME TO {legacy}")
+        cursor.execute(
+            f"CREATE TABLE {table} (LIKE {legacy} INCLUDING DEFAULTS INCLUDING CONSTRAINTS) "
+            f"PARTITION BY RANGE (created_at)"
+        )
+
+        # `id` may be an identity column or use a sequence owned by the old
+        # table; either way the new table gets its own sequence.
+        cursor.execute(f"CREATE SEQUENCE {sequence}")
+        cursor.execute(f"ALTER TABLE {table} ALTER COLUMN id SET DEFAULT nextval('{sequence}')")
+        cursor.execute(f"ALTER SEQUENCE {sequence} OWNED BY {table}.id")
+        cursor.execute(
+            f"SELECT setval('{sequence}', COALESCE((SELECT max(id) FROM {legacy}), 0) + 1, false)"
+        )
+        cursor.execute(f"ALTER TABLE {table} ADD PRIMARY KEY (id, created_at)")
+
+        cursor.execute(f"CREATE TABLE {default_partition_name(table)} PARTITION OF {table} DEFAULT")
+        cursor.execute(f"SELECT min(created_at) FROM {legacy}")
+        oldest = cursor.fetchone()[0] or now
+        month, last = month_start(oldest), add_months(month_start(now), months_ahead)
+        partitions = 0
+        while month <= last:
+            partitions += create_partition(cursor, table, month)
+            month = add_months(month, 1)
+
+        cursor.execute(f"INSERT INTO {table} SELECT * FROM {legacy}")
+        # CASCADE also drops the foreign keys other tables had to the old one
+        cursor.execute(f"DROP TABLE {legacy} CASCADE")
+
+        for _, statement in indexes:
+            cursor.execute(statement)
+        for name, definition in foreign_keys:
+            cursor.execute(f"ALTER TABLE {table} ADD CONSTRAINT {name} {definition}")
+        unique_tables = [keep_unique(cursor, table, name, columns) for name, columns in uniques]
+
+    return {
+        "table": table,
+        "partitions": partitions,
+        "indexes": len(indexes),
+        "unique_tables": unique_tables,
+    }
+
+
+def remove_posts_partition(cursor, month, action, archive_schema):
+    """
+    Take the posts of `month` and every row that points at them out of the
+    live tables. With `archive`/`detach`, the dependent rows are kept in
+    `{table}_of_{partition}` tables next to the detached partition.
+    """
+    name = partition_name(POSTS_TABLE, month)
+    schema = f"{archive_schema}." if action == "archive" else ""
+    if action == "archive":
+        cursor.execute(f"CREATE SCHEMA IF NOT EXISTS {archive_schema}")
+
+    for table, column in dependent_tables():
+        rows = f"{column} IN (SELECT id FROM {name})"
+        if action != "drop":
+            cursor.execute(f"CREATE TABLE {schema}{table}_of_{name} AS SELECT * FROM {table} WHERE {rows}")
+        cursor.execute(f"DELETE FROM {table} WHERE {rows}")
+
+    cursor.execute(f"ALTER TABLE {POSTS_TABLE} DETACH PARTITION {name}")
+    if action == "drop":
+        cursor.execute(f"DROP TABLE {name}")
+    elif action == "archive":
+        cursor.execute(f"ALTER TABLE {name} SET SCHEMA {archive_schema}")
+    return name
+
+
+def remove_empty_partition(cursor, table, month):
+    name = partition_name(table, month)
+    cursor.execute(f"SELECT 1 FROM {name} LIMIT 1")
+    if cursor.fetchone() is not None:
+        return None
+    cursor.execute(f"ALTER TABLE {table} DETACH PARTITION {name}")
+    cursor.execute(f"DROP TABLE {name}")
+    return name
+
+
+def maintain(connection, months_ahead=3, retain_months=None, action="archive",
+             archive_schema=DEFAULT_ARCHIVE_SCHEMA, now=None):
+    """
+    For every partitioned table: create the partitions of the next
+    `months_ahead` months and, with `retain_months`, remove posts
+    partitions that ended before that many months ago along with their
+    dependent rows. Removed posts partitions are kept as plain tables
+    (`detach`), moved to `archive_schema` (`archive`) or dropped (`drop`);
+    old partitions of the other tables are dropped once empty. Returns
+    {table: (created, [removed partitions])}.
+    """
+    now = now or datetime.datetime.now(datetime.timezone.utc)
+    current = month_start(now)
+    summary = {}
+
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for table in TABLES:
+            if not is_partitioned(cursor, table):
+                continue
+
+            created = 0
+            for offset in range(months_ahead + 1):
+                created += create_partition(cursor, table, add_months(current, offset))
+            summary[table] = (created, [])
+
+        if retain_months is None or POSTS_TABLE not in summary:
+            return summary
+
+        cutoff = add_months(current, -retain_months)
+        for table in summary:
+            removed = summary[table][1]
+            for month in partition_months(cursor, table):
+                if add_months(month, 1) > cutoff:
+                    continue
+                if table == POSTS_TABLE:
+                    removed.append(remove_posts_partition(cursor, month, action, archive_schema))
+                else:
+                    name = remove_empty_partition(cursor, table, month)
+                    if name is not None:
+                        removed.append(name)
+    return summary
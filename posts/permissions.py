@@ -1,23 +1,6 @@
 from rest_framework.permissions import BasePermission
 
-class ObjectPermissionHelpers:
-
-    @staticmethod
-    def user_is_authenticated(user):
-        return getattr(user, "is_authenticated", False)
-    
-    @staticmethod
-    def same_team(user, author):
-        if not getattr(user, "is_authenticated", False):
-            return False
-
-        if not getattr(user, "team", None) or not getattr(author, "team", None):
-            return False
-
-        if author.team.name == "Default":
-            return False
-
-        return user.team == author.team
+from . import policy
 
 
 class CanReadPost(BasePermission):
@@ -27,17 +10,11 @@ class CanReadPost(BasePermission):
         return True
 
     def has_object_permission(self, request, view, obj):
-        if getattr(request.user, "is_superuser", False):
-            return True
-
-        permission_map = {
-            obj.PrivacyChoices.PUBLIC: lambda u: True,
-            obj.PrivacyChoices.AUTHENTICATED:  lambda u: ObjectPermissionHelpers.user_is_authenticated(u),
-            obj.PrivacyChoices.TEAM: lambda u: ObjectPermissionHelpers.same_team(u, obj.author),
-            obj.PrivacyChoices.AUTHOR: lambda u: u == obj.author
-        }
-
-        return permission_map.get(obj.privacy_read, lambda u: False)(request.user)
+        # PostViewSet.retrieve annotates the SQL form of the same rule
+        can_read = getattr(obj, "can_read", None)
+        if can_read is not None:
+            return can_read
+        return policy.READ.allows(request.user, obj)
 
 
 class CanEditPost(BasePermission):
@@ -48,22 +25,5 @@ class CanEditPost(BasePermission):
         return True
     
     def has_object_permission(self, request, view, obj):
-        user = request.user
-
-        if getattr(user, "is_superuser", False):
-            return True
-
-        if not getattr(user, "is_authenticated", False):
-            return False
-
-        # 🔥 El autor SIEMPRE puede editar
-        if user == obj.author:
-            return True
-
-        permission_map = {
-            obj.PrivacyChoices.AUTHENTICATED: ObjectPermissionHelpers.user_is_authenticated,
-            obj.PrivacyChoices.TEAM: lambda u: ObjectPermissionHelpers.same_team(u, obj.author),
-            obj.PrivacyChoices.AUTHOR: lambda u: False,  # ya manejamos author arriba
-        }
-
-        return permission_map.get(obj.privacy_write, lambda u: False)(user)
+        # Superusers and the author always; otherwise privacy_write decides
+        return policy.EDIT.allows(request.user, obj)
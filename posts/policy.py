@@ -0,0 +1,142 @@
+"""
+Post access rules, written once and compiled into two equivalent forms:
+
+* `q(user)` / `filter(queryset, user)` / `expression(user)`: SQL, for
+  querysets and for checking one post in the same query that loads it.
+* `allows(user, post)` / `allows_row(...)`: a plain predicate over values
+  already in memory (no queries, no dicts of lambdas built per call).
+
+Each privacy level maps to an audience. On top of that a superuser may do
+anything, and the author may read and edit their own post at any valid
+level. Levels without an audience (PUBLIC for writing) allow nobody but
+superusers.
+"""
+from django.db.models import BooleanField, Case, Q, Value, When
+
+from .models import Post
+
+Level = Post.PrivacyChoices
+
+ANYONE = "anyone"
+SIGNED_IN = "signed_in"
+SAME_TEAM = "same_team"
+AUTHOR = "author"
+
+
+def is_authenticated(user):
+    return getattr(user, "is_authenticated", False)
+
+
+class Policy:
+
+    def __init__(self, field, rules):
+        self.field = field
+        self.levels = frozenset(rules)
+        self.anyone = self._levels_for(rules, ANYONE)
+        self.signed_in = self.anyone | self._levels_for(rules, SIGNED_IN)
+        self.same_team = self._levels_for(rules, SAME_TEAM)
+        self.restricts_author = self.levels != frozenset(Level.values)
+
+    @staticmethod
+    def _levels_for(rules, audience):
+        return frozenset(level for level, who in rules.items() if who == audience)
+
+    # ----------------------------
+    # SQL
+    # ----------------------------
+    def q(self, user):
+        """
+        Posts `user` may access. Every branch tests posts_post columns only,
+        each backed by an index on the level, author or author_team.
+        """
+        if getattr(user, "is_superuser", False):
+            return Q()
+
+        condition = self.audience_q(user)
+        if not is_authenticated(user):
+            return condition
+
+        own = Q(author_id=user.pk)
+        if self.restricts_author:
+            own &= self._in(self.levels)
+        return condition | own
+
+    def audience_q(self, user):
+        """
+        q() without the author branch: what every user with the same
+        sign-in state and team may access (superusers aside).
+        """
+        if not is_authenticated(user):
+            return self._in(self.anyone)
+
+        condition = self._in(self.signed_in)
+        if self.same_team and user.team_id is not None:
+            condition |= self._in(self.same_team) & Q(
+                author_team_id=user.team_id,
+                author_team_is_default=False,
+            )
+        return condition
+
+    def _in(self, levels):
+        # An empty IN () matches nothing, which is what an empty set means
+        return Q(**{f"{self.field}__in": sorted(levels)})
+
+    def filter(self, queryset, user):
+        condition = self.q(user)
+        return queryset.filter(condition) if condition else queryset
+
+    def expression(self, user):
+        """
+        Boolean SQL expression, to annotate whether a loaded row is accessible.
+        """
+        condition = self.q(user)
+        if not condition:
+            return Value(True)
+        return Case(
+            When(condition, then=Value(True)),
+            default=Value(False),
+            output_field=BooleanField(),
+        )
+
+    # ----------------------------
+    # In memory
+    # ----------------------------
+    def allows_row(self, user, level, author_id, team_id, team_is_default):
+        if getattr(user, "is_superuser", False):
+            return True
+        if level in self.anyone:
+            return True
+        if not is_authenticated(user) or level not in self.levels:
+            return False
+        if level in self.signed_in or user.pk == author_id:
+            return True
+        return (
+            level in self.same_team
+            and not team_is_default
+            and team_id is not None
+            and user.team_id == team_id
+        )
+
+    def allows(self, user, post):
+        team_id, team_is_default = post.get_author_team()
+        return self.allows_row(
+            user,
+            getattr(post, self.field),
+            post.author_id,
+            team_id,
+            team_is_default,
+        )
+
+
+READ = Policy("privacy_read", {
+    Level.PUBLIC: ANYONE,
+    Level.AUTHENTICATED: SIGNED_IN,
+    Level.TEAM: SAME_TEAM,
+    Level.AUTHOR: AUTHOR,
+})
+
+EDIT = Policy("privacy_write", {
+    Level.AUTHENTICATED: SIGNED_IN,
+    Level.TEAM: SAME_TEAM,
+    Level.AUTHOR: AUTHOR,
+})
@@ -0,0 +1,110 @@
+"""
+Full-text search over post titles and content.
+
+PostgreSQL: a stored `search_vector` tsvector (title weighted A, content B)
+with a GIN index, queried with websearch syntax and ordered by SearchRank.
+SQLite: an FTS5 virtual table keyed by post id, ordered by bm25().
+Other backends fall back to a case-insensitive substring match.
+
+The index is maintained from posts.signals on save/delete; code that writes
+posts without signals (bulk_create/bulk_update) must call index_posts().
+"""
+import re
+
+from django.conf import settings
+from django.contrib.postgres.search import SearchQuery, SearchRank, SearchVector
+from django.db import connections, router
+from django.db.models import F, FloatField, Q, Value
+from django.db.models.expressions import RawSQL
+
+FTS_TABLE = "posts_post_fts"
+GIN_INDEX = "post_search_vector_gin"
+
+
+def get_config():
+    return getattr(settings, "POSTS_SEARCH_CONFIG", "simple")
+
+
+def search_vector_expression():
+    config = get_config()
+    return (
+        SearchVector("title", weight="A", config=config)
+        + SearchVector("content", weight="B", config=config)
+    )
+
+
+def index_posts(post_ids):
+    from .models import Post
+
+    post_ids = list(post_ids)
+    if not post_ids:
+        return
+
+    connection = connections[router.db_for_write(Post)]
+    vendor = connection.vendor
+    if vendor == "postgresql":
+        Post.objects.filter(pk__in=post_ids).update(search_vector=search_vector_expression())
+    elif vendor == "sqlite":
+        rows = Post.objects.filter(pk__in=post_ids).values_list("pk", "title", "content")
+        with connection.cursor() as cursor:
+            cursor.executemany(
+                f"INSERT OR REPLACE INTO {FTS_TABLE} (rowid, title, content) VALUES (%s, %s, %s)",
+                list(rows),
+            )
+
+
+def remove_posts(post_ids):
+    from .models import Post
+
+    post_ids = list(post_ids)
+    connection = connections[router.db_for_write(Post)]
+    if connection.vendor != "sqlite" or not post_ids:
+        return
+    with connection.cursor() as cursor:
+        cursor.executemany(
+            f"DELETE FROM {FTS_TABLE} WHERE rowid = %s",
+            [(pk,) for pk in post_ids],
+        )
+
+
+def fts5_query(text):
+    # Quote every word so user input can't hit FTS5 operators/syntax errors
+    words = re.findall(r"\w+", text)
+    return " ".join(f'"{word}"' for word in words)
+
+
+def search(queryset, text):
+    """
+    Filter `queryset` to posts matching `text` and annotate `search_rank`
+    (higher is better). The caller keeps any visibility filtering.
+    """
+    text = text.strip()
+    vendor = connections[queryset.db].vendor
+
+    if vendor == "postgresql":
+        query = SearchQuery(text, search_type="websearch", config=get_config())
+        return queryset.filter(search_vector=query).annotate(
+            search_rank=SearchRank(F("search_vector"), query)
+        )
+
+    if vendor == "sqlite":
+        match = fts5_query(text)
+        if not match:
+            return queryset.annotate(
+                search_rank=Value(0.0, output_field=FloatField())
+            ).none()
+        matching_ids = RawSQL(
+            f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s", (match,)
+        )
+        # bm25() is lower-is-better; title matches weigh more, as in Postgres
+        rank = RawSQL(
+            f"SELECT -bm25({FTS_TABLE}, 10.0, 1.0) FROM {FTS_TABLE} "
+            f"WHERE {FTS_TABLE} MATCH %s AND rowid = posts_post.id",
+            (match,),
+            output_field=FloatField(),
+        )
+        return queryset.filter(pk__in=matching_ids).annotate(search_rank=rank)
+
+    return queryset.filter(Q(title__icontains=text) | Q(content__icontains=text)).annotate(
+        search_rank=Value(0.0, output_field=FloatField())
+    )
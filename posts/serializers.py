@@ -4,7 +4,46 @@ from .models import Post
 PRIVACY_CHOICES = ["public", "authenticated", "team", "author"]
 
 
-class PostSerializer(serializers.ModelSerializer):
+def parse_field_params(request):
+    """
+    Read `?fields=a,b` and `?omit=c` from the request.
+    Returns (fields or None, omit set).
+    """
+    if request is None:
+        return None, set()
+
+    def split(param):
+        raw = request.query_params.get(param, "")
+        return {name.strip() for name in raw.split(",") if name.strip()}
+
+    fields = split("fields")
+    return fields or None, split("omit")
+
+
+class SparseFieldsMixin:
+    """
+    Lets clients trim the representation with `?fields=` / `?omit=`.
+    Fields in `default_omit` are only returned when asked for in `?fields=`.
+    """
+
+    default_omit = ()
+
+    @classmethod
+    def includes_field(cls, request, name):
+        fields, omit = parse_field_params(request)
+        if fields is not None:
+            return name in fields and name not in omit
+        return name not in omit and name not in cls.default_omit
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        request = self.context.get("request")
+        for name in list(self.fields):
+            if not self.includes_field(request, name):
+                self.fields.pop(name)
+
+
+class PostSerializer(SparseFieldsMixin, serializers.ModelSerializer):
     author_email = serializers.EmailField(
         source="author.email",
         read_only=True
@@ -14,8 +53,6 @@ class PostSerializer(serializers.ModelSerializer):
         read_only=True
     )
     excerpt = serializers.SerializerMethodField()
-    likes_count = serializers.SerializerMethodField()
-    comments_count = serializers.SerializerMethodField()
     is_liked = serializers.SerializerMethodField()
 
     class Meta:
@@ -30,6 +67,7 @@ class PostSerializer(serializers.ModelSerializer):
             "excerpt",
             "likes_count",
             "comments_count",
+            "views_count",
             "is_liked",
             "created_at",
             "updated_at",
@@ -39,12 +77,17 @@ class PostSerializer(serializers.ModelSerializer):
         read_only_fields = fields
 
     def get_excerpt(self, obj):
+        # List querysets compute the excerpt in SQL and defer `content`
+        if hasattr(obj, "excerpt_text"):
+            return obj.excerpt_text
         return obj.content[:200]
 
-    def get_likes_count(self, obj):
-        return obj.likes.count()
-    
+    # The viewset annotates `is_liked`; the fallback only runs for
+    # instances that did not come from PostViewSet.get_queryset.
     def get_is_liked(self, obj):
+        if hasattr(obj, "is_liked"):
+            return obj.is_liked
+
         request = self.context.get("request")
         
         if request and request.user.is_authenticated:
@@ -52,8 +95,21 @@ class PostSerializer(serializers.ModelSerializer):
         
         return False
 
-    def get_comments_count(self, obj):
-        return obj.comments.count()
+
+class PostListSerializer(PostSerializer):
+    """
+    List representation: the excerpt replaces the full content unless the
+    client asks for it with `?fields=...,content`.
+    """
+
+    default_omit = ("content",)
+
+    def to_representation(self, instance):
+        data = super().to_representation(instance)
+        # recent_comments / recent_likers attached by posts.embed
+        data.update(getattr(instance, "embedded", {}))
+        return data
+
 
 class PostWriteSerializer(serializers.ModelSerializer):
     privacy_read = serializers.ChoiceField(choices=PRIVACY_CHOICES)
@@ -0,0 +1,127 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+
+from . import cache, feed, search, trending
+from .models import Post, DEFAULT_TEAM_NAME
+
+
+def _bump_counter(post_id, field, delta, kind, at):
+    """
+    Apply a relative UPDATE so concurrent writers never overwrite each other.
+    Decrements are floored at zero; any drift is left for reconcile_counters.
+    The trending score moves in the same statement.
+    """
+    Post.objects.filter(pk=post_id).update(**{
+        field: Greatest(F(field) + delta, 0),
+        "trending_score": trending.updated_score(kind, at, sign=delta),
+    })
+
+
+DELETED_POSTS_ATTR = "_deleted_post_ids"
+
+
+def post_deleting(sender, instance, origin=None, **kwargs):
+    """
+    Remember, on the object delete() was called on, which posts go in that
+    call. pre_delete fires for every collected row before any row is
+    deleted, so the cascaded likes and comments can see it.
+    """
+    if origin is None:
+        return
+    deleted = getattr(origin, DELETED_POSTS_ATTR, None)
+    if deleted is None:
+        deleted = set()
+        setattr(origin, DELETED_POSTS_ATTR, deleted)
+    deleted.add(instance.pk)
+
+
+def _post_is_deleted(instance, origin):
+    # A like or comment cascaded from its own post's deletion: the post row
+    # is about to go, so its counters need no update
+    return instance.post_id in getattr(origin, DELETED_POSTS_ATTR, ())
+
+
+def like_created(sender, instance, created, **kwargs):
+    if created:
+        _bump_counter(instance.post_id, "likes_count", 1, "like", instance.created_at)
+
+
+def like_deleted(sender, instance, origin=None, **kwargs):
+    if not _post_is_deleted(instance, origin):
+        _bump_counter(instance.post_id, "likes_count", -1, "like", instance.created_at)
+
+
+def comment_created(sender, instance, created, **kwargs):
+    if created:
+        _bump_counter(instance.post_id, "comments_count", 1, "comment", instance.created_at)
+
+
+def comment_deleted(sender, instance, origin=None, **kwargs):
+    if not _post_is_deleted(instance, origin):
+        _bump_counter(instance.post_id, "comments_count", -1, "comment", instance.created_at)
+
+
+def user_saved(sender, instance, update_fields=None, **kwargs):
+    """
+    Move the author's posts along when their team changes. The filtered
+    UPDATE touches no rows when the team is unchanged.
+    """
+    if update_fields is not None and "team" not in update_fields:
+        return
+    # Their team decides which of their posts only they can list
+    cache.forget_own_restricted(instance.pk)
+    if instance.team_id is None:
+        return
+    is_default = instance.team.name == DEFAULT_TEAM_NAME
+    moved = (
+        Post.objects.filter(author=instance)
+        .exclude(author_team_id=instance.team_id, author_team_is_default=is_default)
+        .update(author_team_id=instance.team_id, author_team_is_default=is_default)
+    )
+    if moved:
+        feed.sync_posts(Post.objects.filter(author=instance).values_list("pk", flat=True))
+        cache.bump_generation()
+
+
+def team_saved(sender, instance, created, **kwargs):
+    # Renaming a team to or from "Default" flips TEAM visibility for its posts.
+    # The list cache is invalidated on every team save (posts.apps), since
+    # any rename changes `?team=` results and the serialized author_team.
+    if created:
+        return
+    is_default = instance.name == DEFAULT_TEAM_NAME
+    changed = (
+        Post.objects.filter(author_team=instance)
+        .exclude(author_team_is_default=is_default)
+        .update(author_team_is_default=is_default)
+    )
+    if changed:
+        feed.sync_posts(Post.objects.filter(author_team=instance).values_list("pk", flat=True))
+        cache.forget_own_restricted(*instance.customuser_set.values_list("pk", flat=True))
+
+
+def post_saved(sender, instance, update_fields=None, **kwargs):
+    # Reindex only when the searchable text may have changed
+    if update_fields is not None and not {"title", "content"} & set(update_fields):
+        return
+    search.index_posts([instance.pk])
+
+
+FEED_FIELDS = {"privacy_read", "author", "author_team", "author_team_is_default", "created_at"}
+
+
+def post_feed_saved(sender, instance, update_fields=None, **kwargs):
+    # Fan out only when the post's place in the team feed may have changed
+    if update_fields is not None and not FEED_FIELDS & set(update_fields):
+        return
+    feed.sync_posts([instance.pk])
+
+
+def post_author_changed(sender, instance, **kwargs):
+    # Saved or deleted: the author may have gained or lost a post only they
+    # can list (posts.cache.get_own_restricted)
+    cache.forget_own_restricted(instance.author_id)
+
+
+def post_deleted(sender, instance, **kwargs):
+    search.remove_posts([instance.pk])
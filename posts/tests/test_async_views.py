@@ -0,0 +1,148 @@
+import inspect
+
+import pytest
+from asgiref.sync import async_to_sync
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.test import AsyncRequestFactory
+from rest_framework.test import APIRequestFactory, force_authenticate
+
+from comments.models import Comment
+from comments.viewsets import CommentViewSet
+from likes.models import Like
+from likes.viewsets import LikeViewSet
+from posts.models import Post
+from posts.viewsets import PostViewSet
+
+
+@pytest.mark.django_db
+class TestAsyncReads:
+
+    def setup_method(self):
+
+        self.async_factory = AsyncRequestFactory()
+        self.sync_factory = APIRequestFactory()
+        self.User = get_user_model()
+        self.author = self.User.objects.create_user(email="author@test.com", password="123")
+        self.other = self.User.objects.create_user(email="other@test.com", password="123")
+
+        self.public = Post.objects.create(author=self.author, title="p", content="x", privacy_read="public")
+        self.private = Post.objects.create(author=self.author, title="a", content="x", privacy_read="author")
+        Comment.objects.create(user=self.other, post=self.public, content="c")
+        Like.objects.create(user=self.other, post=self.public)
+
+    def call_both(self, viewset, actions, settings, path, user=None, **kwargs):
+        """
+        The same GET through one view, with async reads on and then off.
+        """
+        view = viewset.as_view(actions)
+        assert inspect.iscoroutinefunction(view)
+
+        requests = [self.async_factory.get(path), self.sync_factory.get(path)]
+        for request in requests:
+            force_authenticate(request, user=user or AnonymousUser())
+
+        settings.API_ASYNC_READS = True
+        async_response = async_to_sync(view)(requests[0], **kwargs)
+        settings.API_ASYNC_READS = False
+        sync_response = async_to_sync(view)(requests[1], **kwargs)
+        return async_response, sync_response
+
+    @pytest.mark.parametrize("query", ["", "?count=capped", "?count=none", "?pagination=cursor", "?page=last"])
+    def test_post_list_matches_the_sync_view(self, settings, query):
+
+        settings.POSTS_LIST_CACHE_ENABLED = False
+        for user in (None, self.author, self.other):
+            async_response, sync_response = self.call_both(
+                PostViewSet, {"get": "list"}, settings, f"/api/posts/{query}", user=user,
+            )
+            assert async_response.status_code == 200
+            assert async_response.data == sync_response.data
+            assert async_response["ETag"] == sync_response["ETag"]
+
+    def test_post_retrieve_statuses(self, settings):
+
+        cases = [
+            (self.public.pk, None, 200),
+            (self.private.pk, self.other, 403),
+            (self.private.pk, self.author, 200),
+            (999999, None, 404),
+        ]
+        for pk, user, expected in cases:
+            async_response, sync_response = self.call_both(
+                PostViewSet, {"get": "retrieve"}, settings, f"/api/posts/{pk}/", user=user, pk=pk,
+            )
+            assert async_response.status_code == sync_response.status_code == expected
+            if expected == 200:
+                assert async_response.data == sync_response.data
+
+    def test_comment_and_like_lists(self, settings):
+
+        for viewset in (CommentViewSet, LikeViewSet):
+            async_response, sync_response = self.call_both(
+                viewset, {"get": "list"}, settings, f"/api/posts/{self.public.pk}/x/", post_pk=self.public.pk,
+            )
+            assert async_response.status_code == 200
+            assert async_response.data == sync_response.data
+            assert async_response.data["results"][0]["user_email"] == "other@test.com"
+
+    def test_invalid_page_is_a_404(self, settings):
+
+        async_response, _ = self.call_both(PostViewSet, {"get": "list"}, settings, "/api/posts/?page=9")
+
+        assert async_response.status_code == 404
+
+    def test_writes_use_the_sync_view(self, settings):
+
+        settings.API_ASYNC_READS = True
+        async_view = PostViewSet.as_view({"get": "list", "post": "create"})
+        request = self.async_factory.post(
+            "/api/posts/",
+            {"title": "Async write", "content": "x", "privacy_read": "public", "privacy_write": "author"},
+            content_type="application/json",
+        )
+        force_authenticate(request, user=self.author)
+
+        response = async_to_sync(async_view)(request)
+
+        assert response.status_code == 201
+        assert Post.objects.filter(pk=response.data["id"]).exists()
+
+    def test_setting_is_read_per_request(self, settings, monkeypatch):
+
+        settings.API_ASYNC_READS = False
+        view = PostViewSet.as_view({"get": "list"})
+        served = []
+        async_dispatch = PostViewSet.async_dispatch
+
+        async def spy(viewset, request, *args, **kwargs):
+            served.append(request.path)
+            return await async_dispatch(viewset, request, *args, **kwargs)
+
+        monkeypatch.setattr(PostViewSet, "async_dispatch", spy)
+
+        assert async_to_sync(view)(self.async_factory.get("/api/posts/")).status_code == 200
+        assert served == []
+
+        settings.API_ASYNC_READS = True
+        assert async_to_sync(view)(self.async_factory.get("/api/posts/")).status_code == 200
+        assert served == ["/api/posts/"]
+
+    def test_missing_page_skips_the_rows_query(
+        self, settings, django_assert_num_queries, django_assert_max_num_queries,
+    ):
+
+        settings.API_ASYNC_READS = True
+        posts = PostViewSet.as_view({"get": "list"})
+        comments = CommentViewSet.as_view({"get": "list"})
+
+        with django_assert_num_queries(1):
+            response = async_to_sync(posts)(self.async_factory.get("/api/posts/?page=9"))
+        assert response.status_code == 404
+
+        # Count, then the parent check; no rows query
+        with django_assert_max_num_queries(2):
+            response = async_to_sync(comments)(
+                self.async_factory.get(f"/api/posts/{self.private.pk}/comments/"), post_pk=self.private.pk,
+            )
+        assert response.status_code == 404
@@ -0,0 +1,81 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from user.models import Team
+
+
+@pytest.mark.django_db
+class TestDenormalizedAuthorTeam:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+
+        self.team_a = Team.objects.create(name="Team A")
+        self.team_b = Team.objects.create(name="Team B")
+        self.author = self.User.objects.create_user(email="author@test.com", password="123", team=self.team_a)
+        self.mate = self.User.objects.create_user(email="mate@test.com", password="123", team=self.team_a)
+        self.post = Post.objects.create(author=self.author, title="Team post", content="x",
+                                        privacy_read=Post.PrivacyChoices.TEAM)
+
+    def test_post_copies_author_team_on_create(self):
+
+        assert self.post.author_team_id == self.team_a.id
+        assert self.post.author_team_is_default is False
+
+    def test_posts_follow_author_team_change(self):
+
+        self.author.team = self.team_b
+        self.author.save()
+
+        self.post.refresh_from_db()
+        assert self.post.author_team_id == self.team_b.id
+
+    def test_default_team_flag_follows_team_rename(self):
+
+        self.team_a.name = "Default"
+        self.team_a.save()
+
+        self.post.refresh_from_db()
+        assert self.post.author_team_is_default is True
+        assert self.post.can_user_read(self.mate) is False
+
+    def test_read_check_does_not_load_author_or_team(self):
+
+        post = Post.objects.get(pk=self.post.pk)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert post.can_user_read(self.mate) is True
+            assert post.can_user_edit(self.author) is True
+
+        assert len(ctx.captured_queries) == 0
+
+    def test_list_excludes_team_posts_from_default_team(self):
+
+        default = Team.objects.create(name="Default")
+        loner = self.User.objects.create_user(email="loner@test.com", password="123", team=default)
+        other = self.User.objects.create_user(email="other@test.com", password="123", team=default)
+        Post.objects.create(author=loner, title="Default team", content="x",
+                            privacy_read=Post.PrivacyChoices.TEAM)
+        self.client.force_authenticate(user=other)
+
+        response = self.client.get("/api/posts/")
+
+        assert response.data["count"] == 0
+
+    def test_team_filter(self):
+
+        Post.objects.create(author=self.author, title="Public", content="x")
+        outsider = self.User.objects.create_user(email="out@test.com", password="123", team=self.team_b)
+        Post.objects.create(author=outsider, title="Other team", content="x")
+        self.client.force_authenticate(user=self.mate)
+
+        response = self.client.get("/api/posts/?team=Team A")
+
+        titles = {row["title"] for row in response.data["results"]}
+        assert titles == {"Team post", "Public"}
@@ -0,0 +1,194 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext, override_settings
+from rest_framework.test import APIClient
+
+from posts import cache
+from posts.models import Post
+from user.models import Team
+
+URL = "/api/posts/bulk/"
+
+
+@pytest.mark.django_db
+class TestBulkPosts:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.team = Team.objects.create(name="Team A")
+        self.author = self.User.objects.create_user(email="author@test.com", password="123", team=self.team)
+        self.teammate = self.User.objects.create_user(email="mate@test.com", password="123", team=self.team)
+        self.other = self.User.objects.create_user(email="other@test.com", password="123")
+        self.client.force_authenticate(self.author)
+
+    def payload(self, n):
+        return [
+            {"title": f"Post {i}", "content": "x", "privacy_read": "public", "privacy_write": "author"}
+            for i in range(n)
+        ]
+
+    # ----------------------------
+    # Crear
+    # ----------------------------
+    def test_create_many_posts(self):
+
+        response = self.client.post(URL, self.payload(3), format="json")
+
+        assert response.status_code == 201
+        ids = [row["id"] for row in response.data["results"]]
+        posts = Post.objects.filter(pk__in=ids)
+        assert posts.count() == 3
+        for post in posts:
+            assert post.author_id == self.author.id
+            assert post.author_team_id == self.team.id
+            assert post.author_team_is_default is False
+
+    def test_create_query_count_does_not_grow(self):
+
+        with CaptureQueriesContext(connection) as small:
+            self.client.post(URL, self.payload(2), format="json")
+        with CaptureQueriesContext(connection) as large:
+            self.client.post(URL, self.payload(50), format="json")
+
+        assert len(large) == len(small)
+
+    def test_create_reports_invalid_items(self):
+
+        items = self.payload(2)
+        items.insert(1, {"title": "no", "content": "", "privacy_read": "public", "privacy_write": "author"})
+
+        response = self.client.post(URL, items, format="json")
+
+        assert response.status_code == 207
+        results = response.data["results"]
+        assert "id" in results[0] and "id" in results[2]
+        assert set(results[1]["errors"]) == {"title", "content"}
+        assert Post.objects.count() == 2
+
+    def test_created_posts_are_searchable_and_listed(self):
+
+        self.client.get("/api/posts/")
+        generation = cache.get_generation()
+
+        self.client.post(URL, [{**self.payload(1)[0], "title": "Importer"}], format="json")
+
+        assert cache.get_generation() > generation
+        response = self.client.get("/api/posts/", {"q": "importer"})
+        assert response.data["count"] == 1
+
+    def test_requires_authentication(self):
+
+        self.client.force_authenticate(None)
+
+        response = self.client.post(URL, self.payload(1), format="json")
+
+        assert response.status_code == 403
+        assert Post.objects.count() == 0
+
+    def test_rejects_non_list_body(self):
+
+        response = self.client.post(URL, {"title": "x"}, format="json")
+
+        assert response.status_code == 400
+
+    @override_settings(POSTS_BULK_MAX_ITEMS=2)
+    def test_rejects_too_many_items(self):
+
+        response = self.client.post(URL, self.payload(3), format="json")
+
+        assert response.status_code == 400
+        assert Post.objects.count() == 0
+
+    # ----------------------------
+    # Actualizar
+    # ----------------------------
+    def test_update_checks_permissions_per_item(self):
+
+        own = Post.objects.create(author=self.author, title="Own", content="x")
+        team = Post.objects.create(author=self.teammate, title="Team", content="x",
+                                   privacy_write=Post.PrivacyChoices.TEAM)
+        locked = Post.objects.create(author=self.other, title="Locked", content="x",
+                                     privacy_write=Post.PrivacyChoices.AUTHOR)
+
+        response = self.client.patch(URL, [
+            {"id": own.id, "title": "Own 2"},
+            {"id": team.id, "content": "edited"},
+            {"id": locked.id, "title": "Nope"},
+            {"id": 999999, "title": "Missing"},
+            {"title": "No id"},
+        ], format="json")
+
+        assert response.status_code == 207
+        results = response.data["results"]
+        assert "errors" not in results[0] and "errors" not in results[1]
+        assert results[2]["errors"]["detail"].startswith("You do not have permission")
+        assert results[3]["errors"]["detail"] == "Not found."
+        assert "id" in results[4]["errors"]
+
+        own.refresh_from_db()
+        team.refresh_from_db()
+        locked.refresh_from_db()
+        assert own.title == "Own 2"
+        assert team.content == "edited"
+        assert locked.title == "Locked"
+
+    def test_update_touches_updated_at_and_reindexes(self):
+
+        post = Post.objects.create(author=self.author, title="Before", content="x")
+        before = post.updated_at
+
+        response = self.client.patch(URL, [{"id": post.id, "title": "After"}], format="json")
+
+        assert response.status_code == 200
+        post.refresh_from_db()
+        assert post.updated_at > before
+        assert self.client.get("/api/posts/", {"q": "after"}).data["count"] == 1
+        assert self.client.get("/api/posts/", {"q": "before"}).data["count"] == 0
+
+    def test_update_validates_fields(self):
+
+        post = Post.objects.create(author=self.author, title="Title", content="x")
+
+        response = self.client.patch(URL, [{"id": post.id, "privacy_write": "public"}], format="json")
+
+        assert response.status_code == 207
+        assert "privacy_write" in response.data["results"][0]["errors"]
+
+    def test_update_permission_check_is_one_query(self):
+
+        posts = [Post.objects.create(author=self.author, title=f"T{i}", content="x") for i in range(20)]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.patch(URL, [{"id": p.id, "privacy_read": "team"} for p in posts], format="json")
+
+        selects = [q for q in ctx.captured_queries if q["sql"].startswith("SELECT") and "posts_post" in q["sql"]]
+        assert len(selects) == 1
+
+    # ----------------------------
+    # Eliminar
+    # ----------------------------
+    def test_delete_only_editable_posts(self):
+
+        own = Post.objects.create(author=self.author, title="Own", content="x")
+        locked = Post.objects.create(author=self.other, title="Locked", content="x")
+
+        response = self.client.delete(URL, [own.id, locked.id, "abc"], format="json")
+
+        assert response.status_code == 207
+        results = response.data["results"]
+        assert results[0] == {"index": 0, "id": own.id}
+        assert "errors" in results[1]
+        assert "errors" in results[2]
+        assert list(Post.objects.values_list("pk", flat=True)) == [locked.id]
+
+    def test_delete_all_succeeds_with_200(self):
+
+        posts = [Post.objects.create(author=self.author, title=f"T{i}", content="x") for i in range(3)]
+
+        response = self.client.delete(URL, [p.id for p in posts], format="json")
+
+        assert response.status_code == 200
+        assert Post.objects.count() == 0
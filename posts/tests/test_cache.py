@@ -0,0 +1,176 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from posts import cache as post_list_cache
+from posts.models import Post
+from likes.models import Like
+from comments.models import Comment
+from user.models import Team
+
+
+@pytest.mark.django_db
+class TestPostListCache:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.team_a = Team.objects.create(name="Team A")
+        self.team_b = Team.objects.create(name="Team B")
+        self.author = self.User.objects.create_user(email="author@test.com", password="123", team=self.team_a)
+        self.outsider = self.User.objects.create_user(email="out@test.com", password="123", team=self.team_b)
+        self.post = Post.objects.create(author=self.author, title="Public", content="x")
+        Post.objects.create(author=self.author, title="Team", content="x",
+                            privacy_read=Post.PrivacyChoices.TEAM)
+
+    def test_second_request_is_a_hit(self):
+
+        first = self.client.get("/api/posts/")
+        second = self.client.get("/api/posts/")
+
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "HIT"
+        assert second.data == first.data
+        assert post_list_cache.get_stats()["hits"] == 1
+        assert post_list_cache.get_stats()["misses"] == 1
+
+    def test_query_params_are_part_of_the_key(self):
+
+        self.client.get("/api/posts/")
+        response = self.client.get("/api/posts/?page_size=1")
+
+        assert response["X-Cache"] == "MISS"
+
+    def test_audiences_do_not_share_entries(self):
+
+        self.client.get("/api/posts/")
+
+        self.client.force_authenticate(user=self.author)
+        own = self.client.get("/api/posts/")
+        self.client.force_authenticate(user=self.outsider)
+        other = self.client.get("/api/posts/")
+
+        assert own["X-Cache"] == "MISS"
+        assert own.data["count"] == 2
+        assert other["X-Cache"] == "MISS"
+        assert other.data["count"] == 1
+
+    @pytest.mark.parametrize("write", ["post", "like", "comment", "delete"])
+    def test_writes_invalidate(self, write):
+
+        self.client.get("/api/posts/")
+
+        if write == "post":
+            Post.objects.create(author=self.author, title="New", content="x")
+        elif write == "like":
+            Like.objects.create(user=self.outsider, post=self.post)
+        elif write == "comment":
+            Comment.objects.create(user=self.outsider, post=self.post, content="c")
+        else:
+            self.post.delete()
+
+        response = self.client.get("/api/posts/")
+
+        assert response["X-Cache"] == "MISS"
+
+    def test_team_change_invalidates(self):
+
+        self.client.force_authenticate(user=self.outsider)
+        assert self.client.get("/api/posts/").data["count"] == 1
+
+        self.author.team = self.team_b
+        self.author.save()
+
+        response = self.client.get("/api/posts/")
+        assert response["X-Cache"] == "MISS"
+        assert response.data["count"] == 2
+
+    @override_settings(POSTS_LIST_CACHE_ENABLED=False)
+    def test_can_be_disabled(self):
+
+        self.client.get("/api/posts/")
+        response = self.client.get("/api/posts/")
+
+        assert "X-Cache" not in response
+
+    def test_works_with_file_based_cache(self, tmp_path):
+
+        file_cache = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": str(tmp_path),
+            }
+        }
+        with override_settings(CACHES=file_cache):
+            first = self.client.get("/api/posts/")
+            Like.objects.create(user=self.outsider, post=self.post)
+            second = self.client.get("/api/posts/")
+            third = self.client.get("/api/posts/")
+
+        assert first["X-Cache"] == "MISS"
+        assert second["X-Cache"] == "MISS"
+        assert third["X-Cache"] == "HIT"
+        assert third.data["results"][-1]["likes_count"] == 1
+
+    def test_team_members_share_entries(self):
+
+        teammate = self.User.objects.create_user(email="mate@test.com", password="123", team=self.team_a)
+        Like.objects.create(user=teammate, post=self.post)
+
+        self.client.force_authenticate(user=self.author)
+        self.client.get("/api/posts/")
+        own = self.client.get("/api/posts/")
+        self.client.force_authenticate(user=teammate)
+        other = self.client.get("/api/posts/")
+
+        assert own["X-Cache"] == "HIT"
+        assert other["X-Cache"] == "HIT"
+        assert other.data["count"] == 2
+        # is_liked is the requesting user's
+        assert {row["id"]: row["is_liked"] for row in own.data["results"]}[self.post.id] is False
+        assert {row["id"]: row["is_liked"] for row in other.data["results"]}[self.post.id] is True
+        assert own["ETag"] != other["ETag"]
+
+    def test_authors_own_restricted_posts_are_not_shared(self):
+
+        teammate = self.User.objects.create_user(email="mate@test.com", password="123", team=self.team_a)
+        Post.objects.create(author=self.author, title="Draft", content="x",
+                            privacy_read=Post.PrivacyChoices.AUTHOR)
+
+        self.client.force_authenticate(user=self.author)
+        self.client.get("/api/posts/")
+        own = self.client.get("/api/posts/")
+        self.client.force_authenticate(user=teammate)
+        other = self.client.get("/api/posts/")
+
+        assert own["X-Cache"] == "HIT"
+        assert own.data["count"] == 3
+        assert other["X-Cache"] == "MISS"
+        assert other.data["count"] == 2
+
+    def test_hit_revalidates_with_the_personal_etag(self):
+
+        Like.objects.create(user=self.author, post=self.post)
+        self.client.force_authenticate(user=self.author)
+        first = self.client.get("/api/posts/")
+
+        response = self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert response.status_code == 304
+        assert response["X-Cache"] == "HIT"
+        assert response["ETag"] == first["ETag"]
+
+    def test_own_posts_flag_outlives_other_writes(self):
+
+        self.client.force_authenticate(user=self.author)
+        self.client.get("/api/posts/")
+        assert post_list_cache.get_own_restricted(self.author) is False
+
+        Like.objects.create(user=self.outsider, post=self.post)
+        assert post_list_cache.get_own_restricted(self.author) is False
+
+        Post.objects.create(author=self.author, title="Draft", content="x",
+                            privacy_read=Post.PrivacyChoices.AUTHOR)
+        assert post_list_cache.get_own_restricted(self.author) is None
@@ -0,0 +1,130 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from likes.models import Like
+from comments.models import Comment
+
+
+@pytest.mark.django_db
+class TestConditionalGet:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.author = self.User.objects.create_user(email="author@test.com", password="123")
+        self.reader = self.User.objects.create_user(email="reader@test.com", password="123")
+        self.post = Post.objects.create(author=self.author, title="Post", content="x")
+
+    def revalidate(self, url):
+
+        first = self.client.get(url)
+        assert first.status_code == 200
+        assert first.has_header("ETag")
+        return self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+    @pytest.mark.parametrize("suffix", ["", "{id}/", "{id}/comments/", "{id}/likes/"])
+    def test_unchanged_resources_return_304(self, suffix):
+
+        url = "/api/posts/" + suffix.format(id=self.post.id)
+
+        response = self.revalidate(url)
+
+        assert response.status_code == 304
+        assert response.content == b""
+
+    def test_list_304_skips_serialization_queries(self):
+
+        Comment.objects.create(user=self.author, post=self.post, content="c")
+        first = self.client.get("/api/posts/{}/comments/".format(self.post.id))
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(
+                f"/api/posts/{self.post.id}/comments/", HTTP_IF_NONE_MATCH=first["ETag"]
+            )
+
+        assert response.status_code == 304
+        # count + page rows; no per-row user lookups for user_email
+        assert len(ctx.captured_queries) == 2
+
+    def test_new_like_changes_post_etag(self):
+
+        first = self.client.get(f"/api/posts/{self.post.id}/")
+        Like.objects.create(user=self.reader, post=self.post)
+
+        response = self.client.get(f"/api/posts/{self.post.id}/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert response.status_code == 200
+        assert response.data["likes_count"] == 1
+
+    def test_is_liked_is_part_of_the_validator(self):
+
+        Like.objects.create(user=self.reader, post=self.post)
+        anonymous = self.client.get(f"/api/posts/{self.post.id}/")
+
+        self.client.force_authenticate(user=self.reader)
+        response = self.client.get(f"/api/posts/{self.post.id}/", HTTP_IF_NONE_MATCH=anonymous["ETag"])
+
+        assert response.status_code == 200
+        assert response.data["is_liked"] is True
+
+    def test_new_comment_changes_comment_list_etag(self):
+
+        url = f"/api/posts/{self.post.id}/comments/"
+        first = self.client.get(url)
+        Comment.objects.create(user=self.author, post=self.post, content="new")
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert response.status_code == 200
+
+    def test_deleted_like_changes_like_list_etag(self):
+
+        like = Like.objects.create(user=self.reader, post=self.post)
+        url = f"/api/posts/{self.post.id}/likes/"
+        first = self.client.get(url)
+        like.delete()
+
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert response.status_code == 200
+        assert response.data["results"] == []
+
+    def test_if_modified_since_with_a_shared_cache(self, settings, tmp_path):
+
+        settings.CACHES = {
+            "default": {
+                "BACKEND": "django.core.cache.backends.filebased.FileBasedCache",
+                "LOCATION": str(tmp_path),
+            }
+        }
+        first = self.client.get("/api/posts/")
+
+        response = self.client.get("/api/posts/", HTTP_IF_MODIFIED_SINCE=first["Last-Modified"])
+
+        assert response.status_code == 304
+
+    def test_no_last_modified_from_a_per_process_cache(self):
+
+        # LocMem (the test default) is per worker; only the ETag is sent
+        response = self.client.get("/api/posts/")
+
+        assert response.has_header("ETag")
+        assert not response.has_header("Last-Modified")
+        assert self.client.get("/api/posts/", HTTP_IF_MODIFIED_SINCE="Wed, 21 Oct 2099 07:28:00 GMT").status_code == 200
+
+    def test_cached_list_answers_304(self):
+
+        first = self.client.get("/api/posts/")
+        self.client.get("/api/posts/")
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/posts/", HTTP_IF_NONE_MATCH=first["ETag"])
+
+        assert response.status_code == 304
+        assert response["X-Cache"] == "HIT"
+        assert len(ctx.captured_queries) == 0
@@ -0,0 +1,128 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from posts.models import Post
+from likes.models import Like
+from comments.models import Comment
+
+
+@pytest.mark.django_db
+class TestPostCounters:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.author = self.User.objects.create_user(email="author@example.com", password="123")
+        self.reader = self.User.objects.create_user(email="reader@example.com", password="123")
+        self.post = Post.objects.create(author=self.author, title="Post", content="x")
+
+    def test_like_endpoints_update_likes_count(self):
+
+        self.client.force_authenticate(user=self.reader)
+
+        self.client.post(f"/api/posts/{self.post.id}/likes/", format="json")
+        self.post.refresh_from_db()
+        assert self.post.likes_count == 1
+
+        self.client.delete(f"/api/posts/{self.post.id}/likes/unlike/")
+        self.post.refresh_from_db()
+        assert self.post.likes_count == 0
+
+        self.client.post(f"/api/posts/{self.post.id}/likes/", format="json")
+        like = Like.objects.get()
+        self.client.delete(f"/api/posts/{self.post.id}/likes/{like.id}/")
+        self.post.refresh_from_db()
+        assert self.post.likes_count == 0
+
+    def test_comment_create_updates_comments_count(self):
+
+        self.client.force_authenticate(user=self.reader)
+
+        self.client.post(f"/api/posts/{self.post.id}/comments/", {"content": "Hi"}, format="json")
+        self.post.refresh_from_db()
+        assert self.post.comments_count == 1
+
+        comment = Comment.objects.get()
+        self.client.delete(f"/api/posts/{self.post.id}/comments/{comment.id}/")
+        self.post.refresh_from_db()
+        assert self.post.comments_count == 0
+
+    def test_cascade_updates_counters(self):
+
+        Like.objects.create(user=self.reader, post=self.post)
+        Comment.objects.create(user=self.reader, post=self.post, content="c")
+        Comment.objects.create(user=self.author, post=self.post, content="c")
+
+        self.reader.delete()
+        self.post.refresh_from_db()
+
+        assert self.post.likes_count == 0
+        assert self.post.comments_count == 1
+
+    @pytest.mark.parametrize("delete", ["post", "queryset", "author"])
+    def test_deleting_the_post_skips_its_counter_updates(self, delete):
+
+        other = Post.objects.create(author=self.reader, title="Other", content="x")
+        for i in range(5):
+            fan = self.User.objects.create_user(email=f"fan{i}@example.com", password="123")
+            Like.objects.create(user=fan, post=self.post)
+            Comment.objects.create(user=fan, post=self.post, content="c")
+        Like.objects.create(user=self.author, post=other)
+
+        with CaptureQueriesContext(connection) as ctx:
+            if delete == "post":
+                self.post.delete()
+            elif delete == "queryset":
+                Post.objects.filter(pk=self.post.pk).delete()
+            else:
+                self.author.delete()
+
+        updates = [q["sql"] for q in ctx.captured_queries if q["sql"].startswith("UPDATE")]
+        other.refresh_from_db()
+        if delete == "author":
+            # The author's like on a surviving post still counts down
+            assert len(updates) == 1
+            assert other.likes_count == 0
+        else:
+            assert updates == []
+            assert other.likes_count == 1
+
+    def test_decrement_never_goes_negative(self):
+
+        like = Like.objects.create(user=self.reader, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(likes_count=0)
+
+        like.delete()
+        self.post.refresh_from_db()
+
+        assert self.post.likes_count == 0
+
+    def test_reconcile_counters_fixes_drift(self):
+
+        Like.objects.create(user=self.reader, post=self.post)
+        Comment.objects.create(user=self.reader, post=self.post, content="c")
+        healthy = Post.objects.create(author=self.author, title="Healthy", content="x")
+        Post.objects.filter(pk=self.post.pk).update(likes_count=7, comments_count=0)
+
+        call_command("reconcile_counters", chunk_size=1)
+
+        self.post.refresh_from_db()
+        healthy.refresh_from_db()
+        assert self.post.likes_count == 1
+        assert self.post.comments_count == 1
+        assert healthy.likes_count == 0
+
+    def test_reconcile_counters_dry_run(self):
+
+        Like.objects.create(user=self.reader, post=self.post)
+        Post.objects.filter(pk=self.post.pk).update(likes_count=5)
+
+        call_command("reconcile_counters", dry_run=True)
+
+        self.post.refresh_from_db()
+        assert self.post.likes_count == 5
@@ -0,0 +1,113 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from comments.models import Comment
+from likes.models import Like
+from posts.models import Post
+
+
+@pytest.mark.django_db
+class TestEmbed:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.author = self.User.objects.create_user(email="author@test.com", password="123")
+        self.fans = [
+            self.User.objects.create_user(email=f"fan{i}@test.com", password="123") for i in range(4)
+        ]
+
+    def create_posts(self, total):
+
+        posts = []
+        for i in range(total):
+            post = Post.objects.create(author=self.author, title=f"Post {i}", content="x", privacy_read="public")
+            for fan in self.fans:
+                Comment.objects.create(user=fan, post=post, content=f"{fan.email} on {i}")
+                Like.objects.create(user=fan, post=post)
+            posts.append(post)
+        return posts
+
+    def get(self, url):
+
+        response = self.client.get(url)
+        assert response.status_code == 200, response.data
+        return response.data["results"]
+
+    def test_latest_rows_per_post(self):
+
+        posts = self.create_posts(2)
+        Post.objects.create(author=self.author, title="Quiet", content="x", privacy_read="public")
+
+        rows = {row["title"]: row for row in self.get("/api/posts/?embed=comments:2,likers:3")}
+
+        for i, post in enumerate(posts):
+            row = rows[f"Post {i}"]
+            assert [c["content"] for c in row["recent_comments"]] == [
+                f"fan3@test.com on {i}", f"fan2@test.com on {i}",
+            ]
+            assert [like["user_email"] for like in row["recent_likers"]] == [
+                "fan3@test.com", "fan2@test.com", "fan1@test.com",
+            ]
+        assert rows["Quiet"]["recent_comments"] == []
+        assert rows["Quiet"]["recent_likers"] == []
+
+    def test_default_limit_and_no_embed(self):
+
+        self.create_posts(1)
+
+        row = self.get("/api/posts/?embed=comments")[0]
+        assert len(row["recent_comments"]) == 3
+        assert "recent_likers" not in row
+
+        row = self.get("/api/posts/")[0]
+        assert "recent_comments" not in row
+
+    @pytest.mark.parametrize("embed", ["followers", "comments:x", "comments:0", "likers:11"])
+    def test_bad_embeds_are_rejected(self, embed):
+
+        response = self.client.get(f"/api/posts/?embed={embed}")
+
+        assert response.status_code == 400
+        assert "embed" in response.data
+
+    def test_one_query_per_embed_for_any_page_size(self, settings):
+
+        settings.POSTS_LIST_CACHE_ENABLED = False
+        self.create_posts(6)
+
+        def count(url):
+            with CaptureQueriesContext(connection) as ctx:
+                self.get(url)
+            return len(ctx.captured_queries)
+
+        plain = count("/api/posts/?page_size=2")
+        assert count("/api/posts/?page_size=2&embed=comments:3,likers:3") == plain + 2
+        assert count("/api/posts/?page_size=6&embed=comments:3,likers:3") == plain + 2
+
+    def test_etag_follows_the_embedded_rows(self, settings):
+
+        settings.POSTS_LIST_CACHE_ENABLED = False
+        post = self.create_posts(1)[0]
+        url = "/api/posts/?embed=comments:1,likers:1"
+        etag = self.client.get(url)["ETag"]
+
+        comment = Comment.objects.filter(post=post).latest("id")
+        comment.content = "edited"
+        comment.save()
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["results"][0]["recent_comments"][0]["content"] == "edited"
+
+        etag = response["ETag"]
+        Like.objects.filter(post=post, user=self.fans[-1]).delete()
+        Like.objects.filter(post=post, user=self.fans[0]).delete()
+        Like.objects.create(user=self.fans[0], post=post)
+        Like.objects.create(user=self.fans[-1], post=post)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        assert response.status_code == 200
+        assert response.data["results"][0]["recent_likers"][0]["user_email"] == self.fans[-1].email
@@ -0,0 +1,158 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import CommandError, call_command
+from rest_framework.test import APIClient
+
+from posts import policy
+from posts.models import Post, TeamFeedEntry
+from user.models import Team
+
+URL = "/api/feed/"
+
+
+@pytest.mark.django_db
+class TestTeamFeed:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.team = Team.objects.create(name="Team A")
+        self.other_team = Team.objects.create(name="Team B")
+        self.default_team = Team.objects.get_or_create(name="Default")[0]
+
+        self.author = self.User.objects.create_user(email="author@test.com", password="123", team=self.team)
+        self.teammate = self.User.objects.create_user(email="mate@test.com", password="123", team=self.team)
+        self.outsider = self.User.objects.create_user(email="out@test.com", password="123", team=self.other_team)
+
+    def create(self, author=None, **kwargs):
+        kwargs.setdefault("privacy_read", Post.PrivacyChoices.TEAM)
+        return Post.objects.create(author=author or self.author, title="t", content="x", **kwargs)
+
+    def walk(self, user, page_size=3):
+        self.client.force_authenticate(user)
+        ids = []
+        url = f"{URL}?page_size={page_size}"
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == 200
+            ids += [row["id"] for row in response.data["results"]]
+            url = response.data["next"]
+        return ids
+
+    # ----------------------------
+    # Fan-out
+    # ----------------------------
+    def test_team_post_is_fanned_out(self):
+
+        post = self.create()
+
+        entry = TeamFeedEntry.objects.get()
+        assert (entry.team_id, entry.post_id, entry.created_at) == (self.team.id, post.id, post.created_at)
+
+    def test_other_levels_and_default_team_are_not_fanned_out(self):
+
+        self.create(privacy_read=Post.PrivacyChoices.PUBLIC)
+        lonely = self.User.objects.create_user(email="lonely@test.com", password="123", team=self.default_team)
+        self.create(author=lonely)
+
+        assert not TeamFeedEntry.objects.exists()
+
+    def test_privacy_change_updates_the_feed(self):
+
+        post = self.create()
+        post.privacy_read = Post.PrivacyChoices.AUTHOR
+        post.save()
+
+        assert not TeamFeedEntry.objects.exists()
+
+    def test_author_team_change_moves_entries(self):
+
+        post = self.create()
+        self.author.team = self.other_team
+        self.author.save()
+
+        assert list(TeamFeedEntry.objects.values_list("team_id", "post_id")) == [(self.other_team.id, post.id)]
+
+    def test_bulk_create_fans_out(self):
+
+        self.client.force_authenticate(self.author)
+        items = [{"title": "Team post", "content": "x", "privacy_read": "team", "privacy_write": "author"}] * 2
+
+        response = self.client.post("/api/posts/bulk/", items, format="json")
+
+        assert response.status_code == 201
+        assert TeamFeedEntry.objects.filter(team=self.team).count() == 2
+
+    def test_bulk_privacy_change_updates_the_feed(self):
+
+        posts = [self.create(privacy_read=Post.PrivacyChoices.PUBLIC) for _ in range(2)]
+        self.client.force_authenticate(self.author)
+
+        response = self.client.patch(
+            "/api/posts/bulk/", [{"id": post.id, "privacy_read": "team"} for post in posts], format="json",
+        )
+
+        assert response.status_code == 200
+        assert set(TeamFeedEntry.objects.values_list("post_id", flat=True)) == {post.id for post in posts}
+
+    # ----------------------------
+    # Endpoint
+    # ----------------------------
+    def test_feed_matches_read_policy(self):
+
+        for level in Post.PrivacyChoices.values:
+            self.create(privacy_read=level)
+            self.create(author=self.outsider, privacy_read=level)
+
+        for user in (self.author, self.teammate, self.outsider):
+            expected = list(
+                policy.READ.filter(Post.objects.all(), user)
+                .order_by("-created_at", "-id")
+                .values_list("id", flat=True)
+            )
+            assert self.walk(user) == expected
+
+    def test_previous_link_walks_back(self):
+
+        for _ in range(5):
+            self.create()
+        self.client.force_authenticate(self.teammate)
+
+        first = self.client.get(f"{URL}?page_size=2").data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+
+        assert [row["id"] for row in back["results"]] == [row["id"] for row in first["results"]]
+
+    def test_anonymous_is_rejected(self):
+
+        response = self.client.get(URL)
+
+        assert response.status_code in (401, 403)
+
+    # ----------------------------
+    # Commands
+    # ----------------------------
+    def test_check_and_backfill(self):
+
+        post = self.create()
+        self.create(privacy_read=Post.PrivacyChoices.PUBLIC)
+        TeamFeedEntry.objects.all().delete()
+
+        with pytest.raises(CommandError):
+            call_command("check_team_feed")
+
+        call_command("backfill_team_feed", "--chunk-size", "1")
+
+        assert list(TeamFeedEntry.objects.values_list("post_id", flat=True)) == [post.id]
+        call_command("check_team_feed")
+
+    def test_check_fix_removes_stale_entries(self):
+
+        post = self.create(privacy_read=Post.PrivacyChoices.PUBLIC)
+        TeamFeedEntry.objects.create(team=self.team, post=post, created_at=post.created_at)
+
+        call_command("check_team_feed", "--fix")
+
+        assert not TeamFeedEntry.objects.exists()
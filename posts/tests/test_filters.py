@@ -0,0 +1,136 @@
+from datetime import datetime, timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from comments.models import Comment
+from likes.models import Like
+from posts.models import Post
+from user.models import Team
+
+
+@pytest.mark.django_db
+class TestQueryParamFilters:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.team = Team.objects.create(name="Team A")
+        self.author = self.User.objects.create_user(email="author@test.com", password="123", team=self.team)
+        self.other = self.User.objects.create_user(email="other@test.com", password="123")
+
+    def create(self, author=None, **kwargs):
+        return Post.objects.create(author=author or self.author, title="t", content="x", **kwargs)
+
+    def ids(self, url):
+        response = self.client.get(url)
+        assert response.status_code == 200, response.data
+        return [row["id"] for row in response.data["results"]]
+
+    # ----------------------------
+    # Validación
+    # ----------------------------
+    @pytest.mark.parametrize("query", [
+        "id=abc",
+        "author=-1",
+        "privacy_read=everyone",
+        "created_from=yesterday",
+        "created_to=2024-02-30",
+        "ordering=title",
+    ])
+    def test_bad_values_are_rejected(self, query):
+
+        response = self.client.get(f"/api/posts/?{query}")
+
+        assert response.status_code == 400
+        assert query.split("=")[0] in response.data
+
+    def test_every_bad_value_is_reported(self):
+
+        response = self.client.get("/api/posts/?id=x&author=y")
+
+        assert response.status_code == 400
+        assert set(response.data) == {"id", "author"}
+
+    # ----------------------------
+    # Fechas
+    # ----------------------------
+    def test_date_range_is_inclusive_and_uses_the_raw_column(self):
+
+        tz = timezone.get_current_timezone()
+        day = datetime(2024, 3, 10, tzinfo=tz)
+        before = self.create()
+        first = self.create()
+        last = self.create()
+        after = self.create()
+        Post.objects.filter(pk=before.pk).update(created_at=day - timedelta(seconds=1))
+        Post.objects.filter(pk=first.pk).update(created_at=day)
+        Post.objects.filter(pk=last.pk).update(created_at=day + timedelta(days=1, seconds=-1))
+        Post.objects.filter(pk=after.pk).update(created_at=day + timedelta(days=1))
+
+        with CaptureQueriesContext(connection) as ctx:
+            ids = self.ids("/api/posts/?created_from=2024-03-10&created_to=2024-03-10")
+
+        assert ids == [last.id, first.id]
+        sql = next(query["sql"] for query in ctx.captured_queries if "posts_post" in query["sql"])
+        assert "DATE(" not in sql.upper() and "::DATE" not in sql.upper()
+
+    # ----------------------------
+    # Equipos
+    # ----------------------------
+    def test_team_name_is_resolved_once(self):
+
+        mine = self.create()
+        self.create(author=self.other)
+
+        assert self.ids("/api/posts/?team=Team A") == [mine.id]
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.ids("/api/posts/?team=Team A&page_size=5")
+        # The page still joins the author's team to serialize it; only the
+        # name -> id lookup must be gone
+        lookups = [
+            query["sql"] for query in ctx.captured_queries
+            if query["sql"].startswith("SELECT") and 'FROM "user_team" WHERE "user_team"."name"' in query["sql"]
+        ]
+        assert lookups == []
+
+    def test_team_rename_invalidates_the_lookup(self):
+
+        mine = self.create()
+        self.ids("/api/posts/?team=Team A")
+
+        self.team.name = "Team Z"
+        self.team.save()
+
+        assert self.ids("/api/posts/?team=Team A") == []
+        assert self.ids("/api/posts/?team=Team Z") == [mine.id]
+
+    # ----------------------------
+    # Orden
+    # ----------------------------
+    def test_ordering_on_indexed_columns(self):
+
+        posts = [self.create() for _ in range(3)]
+        ids = [post.id for post in posts]
+
+        assert self.ids("/api/posts/?ordering=created_at") == ids
+        assert self.ids("/api/posts/?ordering=-created_at") == ids[::-1]
+
+    def test_comments_and_likes_share_the_backend(self):
+
+        post = self.create()
+        Comment.objects.create(user=self.author, post=post, content="a")
+        theirs = Comment.objects.create(user=self.other, post=post, content="b")
+        Like.objects.create(user=self.author, post=post)
+        like = Like.objects.create(user=self.other, post=post)
+
+        assert self.ids(f"/api/posts/{post.id}/comments/?user={self.other.id}") == [theirs.id]
+        assert self.ids(f"/api/posts/{post.id}/likes/?user={self.other.id}") == [like.id]
+        assert self.client.get(f"/api/posts/{post.id}/comments/?user=x").status_code == 400
+        assert self.client.get(f"/api/posts/{post.id}/likes/?ordering=created_at").status_code == 400
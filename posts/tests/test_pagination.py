@@ -0,0 +1,185 @@
+import pytest
+from datetime import timedelta
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from posts.models import Post
+
+
+@pytest.mark.django_db
+class TestPostCursorPagination:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.author = self.User.objects.create_user(email="author@example.com", password="123")
+
+        now = timezone.now()
+        posts = [
+            Post.objects.create(author=self.author, title=f"Post {i}", content="x")
+            for i in range(25)
+        ]
+        # Pairs of posts share a timestamp so the id tie-breaker is exercised
+        for i, post in enumerate(posts):
+            Post.objects.filter(pk=post.pk).update(created_at=now - timedelta(minutes=i // 2))
+
+        self.expected = list(
+            Post.objects.order_by("-created_at", "-id").values_list("id", flat=True)
+        )
+
+    def walk(self, url):
+
+        ids = []
+        pages = []
+        while url:
+            response = self.client.get(url)
+            assert response.status_code == 200
+            assert "count" not in response.data
+            ids += [row["id"] for row in response.data["results"]]
+            pages.append(response.data)
+            url = response.data["next"]
+        return ids, pages
+
+    def test_default_is_page_number(self):
+
+        response = self.client.get("/api/posts/")
+
+        assert response.data["count"] == 25
+
+    def test_cursor_walk_returns_every_post_once_in_order(self):
+
+        ids, pages = self.walk("/api/posts/?pagination=cursor&page_size=4")
+
+        assert ids == self.expected
+        assert len(pages) == 7
+        assert pages[0]["previous"] is None
+
+    def test_previous_link_walks_back(self):
+
+        first = self.client.get("/api/posts/?pagination=cursor&page_size=4").data
+        second = self.client.get(first["next"]).data
+        back = self.client.get(second["previous"]).data
+
+        assert [row["id"] for row in back["results"]] == [row["id"] for row in first["results"]]
+        assert back["previous"] is None
+        assert back["next"] is not None
+
+    def test_deep_page_costs_same_as_first_page(self, settings):
+
+        settings.POSTS_LIST_CACHE_ENABLED = False
+
+        _, pages = self.walk("/api/posts/?pagination=cursor&page_size=3")
+
+        with CaptureQueriesContext(connection) as first:
+            self.client.get("/api/posts/?pagination=cursor&page_size=3")
+        with CaptureQueriesContext(connection) as deep:
+            self.client.get(pages[-2]["next"])
+
+        assert len(first.captured_queries) == len(deep.captured_queries) == 1
+        assert "COUNT(" not in deep.captured_queries[0]["sql"].upper()
+        assert "OFFSET" not in deep.captured_queries[0]["sql"].upper()
+
+    def test_invalid_cursor_returns_404(self):
+
+        response = self.client.get("/api/posts/?cursor=not-a-cursor")
+
+        assert response.status_code == 404
+
+
+@pytest.mark.django_db
+class TestCountModes:
+
+    @pytest.fixture(autouse=True)
+    def no_list_cache(self, settings):
+
+        settings.POSTS_LIST_CACHE_ENABLED = False
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.author = get_user_model().objects.create_user(email="author@example.com", password="123")
+        for i in range(12):
+            Post.objects.create(author=self.author, title=f"Post {i}", content="x")
+
+    def get(self, url):
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        assert response.status_code == 200
+        return response.data, [query["sql"].upper() for query in ctx.captured_queries]
+
+    def test_none_skips_the_count(self):
+
+        data, queries = self.get("/api/posts/?count=none&page_size=5")
+
+        assert "count" not in data
+        assert len(data["results"]) == 5
+        assert data["next"] is not None
+        assert not any("COUNT(" in sql for sql in queries)
+
+    def test_none_walks_every_page(self):
+
+        ids = []
+        url = "/api/posts/?count=none&page_size=5"
+        while url:
+            data, _ = self.get(url)
+            ids += [row["id"] for row in data["results"]]
+            url = data["next"]
+
+        assert sorted(ids) == sorted(Post.objects.values_list("id", flat=True))
+
+    def test_previous_link_on_second_page(self):
+
+        data, _ = self.get("/api/posts/?count=none&page_size=5&page=2")
+
+        assert "page=" not in data["previous"]
+
+    def test_capped_count_above_cap(self, settings):
+
+        settings.PAGINATION_COUNT_CAP = 10
+        data, _ = self.get("/api/posts/?count=capped")
+
+        assert data["count"] == "10+"
+        assert data["count_type"] == "capped"
+
+    def test_capped_count_below_cap(self):
+
+        data, _ = self.get("/api/posts/?count=capped")
+
+        assert data["count"] == 12
+        assert data["count_type"] == "capped"
+
+    def test_cached_count_is_reused(self):
+
+        first, _ = self.get("/api/posts/?count=cached")
+        Post.objects.create(author=self.author, title="New", content="x")
+        second, queries = self.get("/api/posts/?count=cached")
+
+        assert first["count"] == second["count"] == 12
+        assert second["count_type"] == "cached"
+        assert not any("COUNT(" in sql for sql in queries)
+
+    def test_estimate_returns_a_count(self):
+
+        data, _ = self.get("/api/posts/?count=estimate")
+
+        assert isinstance(data["count"], (int, str))
+        assert data["count_type"] in ("estimate", "capped")
+
+    def test_page_past_the_end_returns_404(self):
+
+        response = self.client.get("/api/posts/?count=none&page=9")
+
+        assert response.status_code == 404
+
+    def test_comments_accept_count_mode(self):
+
+        post = Post.objects.first()
+        response = self.client.get(f"/api/posts/{post.id}/comments/?count=none")
+
+        assert response.status_code == 200
+        assert "count" not in response.data
@@ -0,0 +1,161 @@
+import datetime
+from io import StringIO
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import IntegrityError, connection, transaction
+
+from comments.models import Comment
+from likes.models import Like
+from posts import partitioning
+from posts.models import Post
+
+UTC = datetime.timezone.utc
+NOW = datetime.datetime(2024, 6, 15, tzinfo=UTC)
+
+
+def test_month_arithmetic():
+
+    month = partitioning.month_start(datetime.datetime(2024, 11, 30, 23, 59, tzinfo=UTC))
+
+    assert month == datetime.datetime(2024, 11, 1, tzinfo=UTC)
+    assert partitioning.add_months(month, 2) == datetime.datetime(2025, 1, 1, tzinfo=UTC)
+    assert partitioning.add_months(month, -11) == datetime.datetime(2023, 12, 1, tzinfo=UTC)
+    assert partitioning.partition_name("posts_post", month) == "posts_post_p202411"
+
+
+@pytest.mark.django_db
+def test_commands_leave_other_backends_alone():
+
+    if partitioning.is_supported(connection):
+        pytest.skip("Covered by TestPostgresPartitioning")
+
+    out = StringIO()
+    call_command("partition_tables", stdout=out)
+    call_command("maintain_partitions", "--retain-months", "1", stdout=out)
+
+    assert "PostgreSQL" in out.getvalue()
+
+
+@pytest.mark.django_db
+class TestPostgresPartitioning:
+
+    def setup_method(self):
+
+        if not partitioning.is_supported(connection):
+            pytest.skip(f"Partitioning is PostgreSQL only, not {connection.vendor}")
+
+        self.author = get_user_model().objects.create_user(email="author@test.com", password="123")
+        self.old = self.create(datetime.datetime(2024, 1, 20, tzinfo=UTC))
+        self.recent = self.create(datetime.datetime(2024, 6, 2, tzinfo=UTC))
+        Comment.objects.create(user=self.author, post=self.old, content="c")
+        Like.objects.create(user=self.author, post=self.old)
+
+        for table in partitioning.TABLES:
+            partitioning.convert_table(connection, table, months_ahead=1, now=NOW)
+
+    def create(self, created_at):
+
+        post = Post.objects.create(author=self.author, title="t", content="x")
+        Post.objects.filter(pk=post.pk).update(created_at=created_at)
+        return post
+
+    def partitions(self, table):
+
+        with connection.cursor() as cursor:
+            return partitioning.partition_months(cursor, table)
+
+    def test_tables_are_partitioned_and_keep_their_rows(self):
+
+        with connection.cursor() as cursor:
+            for table in partitioning.TABLES:
+                assert partitioning.is_partitioned(cursor, table)
+            # Converting again is a no-op
+            assert partitioning.convert_table(connection, "posts_post") is None
+
+        months = self.partitions("posts_post")
+        assert months[0] == datetime.datetime(2024, 1, 1, tzinfo=UTC)
+        assert months[-1] == datetime.datetime(2024, 7, 1, tzinfo=UTC)
+        assert set(Post.objects.values_list("pk", flat=True)) == {self.old.pk, self.recent.pk}
+        assert Comment.objects.filter(post=self.old).count() == 1
+
+        # New rows still get ids after the old ones
+        newest = Post.objects.create(author=self.author, title="t", content="x")
+        assert newest.pk > self.recent.pk
+
+    def test_date_filter_prunes_partitions(self):
+
+        plan = Post.objects.filter(
+            created_at__gte=datetime.datetime(2024, 6, 1, tzinfo=UTC),
+            created_at__lt=datetime.datetime(2024, 6, 3, tzinfo=UTC),
+        ).explain()
+
+        assert "posts_post_p202406" in plan
+        assert "posts_post_p202401" not in plan
+
+    def test_deleting_a_post_still_cascades(self):
+
+        self.old.delete()
+
+        assert not Comment.objects.filter(post_id=self.old.pk).exists()
+        assert not Like.objects.filter(post_id=self.old.pk).exists()
+
+    def test_maintenance_adds_months_and_archives_old_ones(self):
+
+        summary = partitioning.maintain(
+            connection, months_ahead=2, retain_months=3, action="archive",
+            now=datetime.datetime(2024, 7, 10, tzinfo=UTC),
+        )
+
+        created, removed = summary["posts_post"]
+        assert created == 2
+        assert "posts_post_p202401" in removed
+        assert "posts_post_p202404" not in removed
+        assert list(Post.objects.values_list("pk", flat=True)) == [self.recent.pk]
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT count(*) FROM archive.posts_post_p202401")
+            assert cursor.fetchone()[0] == 1
+            cursor.execute("SELECT count(*) FROM archive.comments_comment_of_posts_post_p202401")
+            assert cursor.fetchone()[0] == 1
+
+    def test_retention_leaves_no_orphaned_rows(self):
+
+        Comment.objects.create(user=self.author, post=self.recent, content="kept")
+        Like.objects.create(user=self.author, post=self.recent)
+
+        partitioning.maintain(
+            connection, months_ahead=0, retain_months=3, action="drop",
+            now=datetime.datetime(2024, 7, 10, tzinfo=UTC),
+        )
+
+        live = set(Post.objects.values_list("pk", flat=True))
+        for table, column in partitioning.dependent_tables():
+            with connection.cursor() as cursor:
+                cursor.execute(f"SELECT count(*) FROM {table} WHERE {column} NOT IN (SELECT id FROM posts_post)")
+                assert cursor.fetchone()[0] == 0, table
+        assert live == {self.recent.pk}
+        assert list(Comment.objects.values_list("content", flat=True)) == ["kept"]
+        assert Like.objects.filter(post=self.recent).count() == 1
+
+    def test_duplicate_likes_are_still_refused(self):
+
+        with pytest.raises(IntegrityError), transaction.atomic():
+            Like.objects.create(user=self.author, post=self.old)
+
+        # The side table follows deletes, so the like can be given again
+        Like.objects.filter(post=self.old).delete()
+        Like.objects.create(user=self.author, post=self.old)
+
+    def test_new_partition_takes_rows_from_the_default(self):
+
+        far = self.create(datetime.datetime(2025, 3, 5, tzinfo=UTC))
+
+        partitioning.maintain(connection, months_ahead=0, now=datetime.datetime(2025, 3, 1, tzinfo=UTC))
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT id FROM posts_post_p202503")
+            assert cursor.fetchall() == [(far.pk,)]
+            cursor.execute("SELECT count(*) FROM posts_post_default")
+            assert cursor.fetchone()[0] == 0
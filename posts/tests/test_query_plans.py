@@ -0,0 +1,103 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.contrib.auth.models import AnonymousUser
+from django.db import connection
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from posts.models import Post
+from posts.viewsets import PostViewSet
+from user.models import Team
+
+PRIVACY_LEVELS = [choice for choice, _ in Post.PrivacyChoices.choices]
+
+
+@pytest.mark.django_db
+class TestPostListQueryPlan:
+    """
+    EXPLAIN-based checks that the post list visibility filter stays
+    index-driven: no sequential scan over posts and no dedupe step.
+    """
+
+    def setup_method(self):
+
+        self.factory = APIRequestFactory()
+        self.User = get_user_model()
+
+        teams = Team.objects.bulk_create([Team(name=f"Team {i}") for i in range(5)])
+        self.users = self.User.objects.bulk_create([
+            self.User(email=f"user{i}@test.com", password="!", team=teams[i % len(teams)])
+            for i in range(50)
+        ])
+        Post.objects.bulk_create([
+            Post(
+                author=self.users[i % len(self.users)],
+                title=f"Post {i}",
+                content="x",
+                privacy_read=PRIVACY_LEVELS[i % len(PRIVACY_LEVELS)],
+            )
+            for i in range(2000)
+        ])
+
+        with connection.cursor() as cursor:
+            cursor.execute("ANALYZE")
+
+    def list_queryset(self, user):
+
+        request = Request(self.factory.get("/api/posts/"))
+        request.user = user
+
+        view = PostViewSet()
+        view.request = request
+        view.action = "list"
+        view.format_kwarg = None
+        view.kwargs = {}
+
+        return view.get_queryset()
+
+    def list_plan(self, user):
+
+        return self.list_queryset(user)[:10].explain()
+
+    def assert_index_driven(self, plan, sqlite_access):
+        """
+        `sqlite_access` is how SQLite must reach the list's posts_post rows.
+        Any other posts_post access in the plan (subqueries) must be a SEARCH.
+        """
+        if connection.vendor == "postgresql":
+            assert "Seq Scan on posts_post" not in plan
+            assert "HashAggregate" not in plan
+            assert "Unique" not in plan
+        elif connection.vendor == "sqlite":
+            accesses = [line for line in plan.splitlines() if " posts_post " in f"{line} "]
+            assert accesses and sqlite_access in accesses[0], plan
+            assert all("SEARCH posts_post USING " in line for line in accesses[1:]), plan
+            assert "TEMP B-TREE" not in plan
+            assert "DISTINCT" not in plan
+        else:
+            pytest.skip(f"No plan assertions for {connection.vendor}")
+
+    def test_anonymous_plan(self):
+
+        # Seeks the public range of the level index, already in list order
+        self.assert_index_driven(
+            self.list_plan(AnonymousUser()),
+            "SEARCH posts_post USING INDEX post_privacy_created_idx (privacy_read=?)",
+        )
+
+    def test_authenticated_plan(self):
+
+        # Half the table matches the signed-in branch, so the planner walks
+        # the list order index and stops at the LIMIT instead of sorting
+        self.assert_index_driven(
+            self.list_plan(self.users[0]),
+            "SCAN posts_post USING INDEX post_created_id_idx",
+        )
+
+    def test_authenticated_query_has_no_distinct(self):
+
+        sql = str(self.list_queryset(self.users[0]).query).upper()
+
+        assert "DISTINCT" not in sql
+        # Only the select_related joins (author, team); the filter adds none
+        assert sql.count(" JOIN ") == 2
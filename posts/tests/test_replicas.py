@@ -0,0 +1,106 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.db import connections
+from rest_framework.test import APIClient
+
+from blog_project import replicas
+from posts import cache as post_list_cache
+from posts.models import Post
+
+PRIMARY = "sqlite_primary"
+REPLICA = "sqlite_replica"
+
+
+@pytest.fixture
+def sqlite_pair(tmp_path, settings, django_db_blocker):
+    """
+    Two separate SQLite files standing in for a primary and a replica that
+    has not caught up: rows written to the primary are absent on the replica.
+    """
+    for alias in (PRIMARY, REPLICA):
+        config = {"ENGINE": "django.db.backends.sqlite3", "NAME": str(tmp_path / f"{alias}.sqlite3")}
+        connections.settings[alias] = connections.configure_settings({"default": config})["default"]
+
+    settings.DATABASE_PRIMARY = PRIMARY
+    settings.DATABASE_REPLICAS = [REPLICA]
+
+    with django_db_blocker.unblock():
+        for alias in (PRIMARY, REPLICA):
+            call_command("migrate", database=alias, verbosity=0)
+        yield
+
+        for alias in (PRIMARY, REPLICA):
+            connections[alias].close()
+            del connections[alias]
+            del connections.settings[alias]
+
+
+@pytest.mark.usefixtures("sqlite_pair")
+class TestReplicaRouting:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+
+    def create_author(self):
+
+        author = get_user_model().objects.create_user(email="author@test.com", password="123")
+        self.client.force_authenticate(author)
+        return author
+
+    def test_writes_go_to_the_primary(self):
+
+        author = self.create_author()
+        Post.objects.create(author=author, title="t", content="x")
+
+        assert Post.objects.using(PRIMARY).count() == 1
+        assert Post.objects.using(REPLICA).count() == 0
+
+    def test_safe_api_reads_use_the_replica(self):
+
+        author = self.create_author()
+        post = Post.objects.create(author=author, title="t", content="x")
+
+        assert self.client.get("/api/posts/").data["count"] == 0
+        assert self.client.get(f"/api/posts/{post.id}/").status_code == 404
+
+    def test_reads_stay_on_the_primary_after_a_write(self):
+
+        self.create_author()
+        response = self.client.post(
+            "/api/posts/",
+            {"title": "Pinned post", "content": "x", "privacy_read": "public", "privacy_write": "author"},
+            format="json",
+        )
+        assert response.status_code == 201
+        assert replicas.PIN_COOKIE in response.cookies
+
+        # The test client sends the pin cookie back
+        assert self.client.get(f"/api/posts/{response.data['id']}/").status_code == 200
+
+    def test_pin_expires(self, settings):
+
+        self.create_author()
+        response = self.client.post(
+            "/api/posts/",
+            {"title": "Pinned post", "content": "x", "privacy_read": "public", "privacy_write": "author"},
+            format="json",
+        )
+        assert response.status_code == 201
+        assert replicas.PIN_COOKIE in response.cookies
+        settings.DATABASE_PIN_SECONDS = -1
+
+        assert self.client.get("/api/posts/").data["count"] == 0
+
+    def test_replica_reads_do_not_fill_the_list_cache(self):
+
+        author = self.create_author()
+        Post.objects.create(author=author, title="t", content="x")
+
+        first = self.client.get("/api/posts/")
+        second = self.client.get("/api/posts/")
+
+        assert first["X-Cache"] == second["X-Cache"] == "MISS"
+        assert second.data["count"] == 0
+        assert post_list_cache.get_own_restricted(author) is None
@@ -0,0 +1,88 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from rest_framework.test import APIClient
+
+from posts.models import Post
+
+
+@pytest.mark.django_db
+class TestPostSearch:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.author = self.User.objects.create_user(email="author@test.com", password="123")
+        self.other = self.User.objects.create_user(email="other@test.com", password="123")
+
+    def search(self, text):
+        response = self.client.get("/api/posts/", {"q": text})
+        assert response.status_code == 200
+        return [row["id"] for row in response.data["results"]]
+
+    def test_matches_title_and_content(self):
+
+        in_title = Post.objects.create(author=self.author, title="Django tips", content="misc")
+        in_content = Post.objects.create(author=self.author, title="misc", content="about django")
+        Post.objects.create(author=self.author, title="Flask", content="other")
+
+        assert set(self.search("django")) == {in_title.id, in_content.id}
+
+    def test_title_matches_rank_first(self):
+
+        # Created first, so only the rank can put it ahead of the newer post
+        in_title = Post.objects.create(author=self.author, title="Postgres", content="misc")
+        in_content = Post.objects.create(author=self.author, title="misc", content="postgres indexes")
+
+        assert self.search("postgres") == [in_title.id, in_content.id]
+
+    def test_respects_privacy(self):
+
+        public = Post.objects.create(author=self.author, title="secret plan", content="x")
+        private = Post.objects.create(
+            author=self.author,
+            title="secret notes",
+            content="x",
+            privacy_read=Post.PrivacyChoices.AUTHOR,
+        )
+
+        assert self.search("secret") == [public.id]
+
+        self.client.force_authenticate(self.other)
+        assert self.search("secret") == [public.id]
+
+        self.client.force_authenticate(self.author)
+        assert set(self.search("secret")) == {public.id, private.id}
+
+    def test_update_reindexes(self):
+
+        post = Post.objects.create(author=self.author, title="old words", content="x")
+
+        post.title = "new words"
+        post.save()
+
+        assert self.search("old") == []
+        assert self.search("new") == [post.id]
+
+    def test_delete_removes_from_index(self):
+
+        post = Post.objects.create(author=self.author, title="gone", content="x")
+        post.delete()
+
+        assert self.search("gone") == []
+
+    def test_query_syntax_is_not_interpreted(self):
+
+        post = Post.objects.create(author=self.author, title="AND OR NOT", content="x")
+
+        assert self.search('"AND" (OR* NOT:') == [post.id]
+        assert self.search("*:^") == []
+
+    def test_benchmark_command_runs(self, capsys):
+
+        Post.objects.create(author=self.author, title="bench", content="x")
+
+        call_command("benchmark_search", "bench", "--repeat", "2")
+
+        assert "'bench': 1 rows" in capsys.readouterr().out
@@ -0,0 +1,65 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from posts.models import Post
+
+
+@pytest.mark.django_db
+class TestSparseFieldsets:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.author = self.User.objects.create_user(email="author@test.com", password="123")
+        self.post = Post.objects.create(author=self.author, title="Long", content="é" * 5000)
+
+    def test_list_returns_excerpt_without_content(self):
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/posts/")
+
+        row = response.data["results"][0]
+        assert "content" not in row
+        assert row["excerpt"] == "é" * 200
+        page_sql = ctx.captured_queries[-1]["sql"]
+        # The only reference to the column is inside SUBSTR(...)
+        assert page_sql.count('"posts_post"."content"') == 1
+        assert "SUBSTR(" in page_sql.upper()
+
+    def test_list_can_request_content(self):
+
+        response = self.client.get("/api/posts/?fields=id,content")
+
+        assert response.data["results"][0] == {"id": self.post.id, "content": self.post.content}
+
+    def test_fields_limits_the_representation(self):
+
+        response = self.client.get("/api/posts/?fields=id,title")
+
+        assert response.data["results"][0] == {"id": self.post.id, "title": "Long"}
+
+    def test_omit_removes_fields(self):
+
+        response = self.client.get("/api/posts/?omit=excerpt,author_email")
+
+        row = response.data["results"][0]
+        assert "excerpt" not in row
+        assert "author_email" not in row
+        assert "title" in row
+
+    def test_retrieve_defaults_to_full_representation(self):
+
+        response = self.client.get(f"/api/posts/{self.post.id}/")
+
+        assert response.data["content"] == self.post.content
+        assert response.data["excerpt"] == "é" * 200
+
+    def test_retrieve_supports_fields(self):
+
+        response = self.client.get(f"/api/posts/{self.post.id}/?fields=title")
+
+        assert response.data == {"title": "Long"}
@@ -0,0 +1,125 @@
+import math
+import time
+from datetime import timedelta
+
+import pytest
+from django.contrib.auth import get_user_model
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from comments.models import Comment
+from likes.models import Like
+from posts import trending
+from posts.models import Post, TrendingClock
+from user.models import Team
+
+URL = "/api/posts/trending/"
+
+
+@pytest.mark.django_db
+class TestTrending:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+        self.team = Team.objects.create(name="Team A")
+        self.author = self.User.objects.create_user(email="author@test.com", password="123", team=self.team)
+        self.fans = [
+            self.User.objects.create_user(email=f"fan{i}@test.com", password="123")
+            for i in range(3)
+        ]
+
+    def create(self, **kwargs):
+        return Post.objects.create(author=self.author, title="t", content="x", **kwargs)
+
+    def score(self, post):
+        post.refresh_from_db()
+        return post.trending_score
+
+    # ----------------------------
+    # Scores
+    # ----------------------------
+    def test_likes_and_comments_raise_the_score(self):
+
+        liked = self.create()
+        commented = self.create()
+        Like.objects.create(user=self.fans[0], post=liked)
+        Comment.objects.create(user=self.fans[0], post=commented, content="c")
+
+        assert self.score(liked) > 0
+        assert self.score(commented) == pytest.approx(2 * self.score(liked), rel=1e-3)
+
+    def test_older_events_weigh_less(self):
+
+        post = self.create()
+        now = timezone.now()
+        half_life = timedelta(seconds=trending.get_half_life())
+
+        Post.objects.filter(pk=post.pk).update(trending_score=trending.updated_score("like", now))
+        fresh = self.score(post)
+        Post.objects.filter(pk=post.pk).update(trending_score=0)
+        Post.objects.filter(pk=post.pk).update(trending_score=trending.updated_score("like", now - half_life))
+
+        assert self.score(post) == pytest.approx(fresh / 2)
+
+    def test_unlike_takes_the_term_back(self):
+
+        post = self.create()
+        like = Like.objects.create(user=self.fans[0], post=post)
+        like.delete()
+
+        assert self.score(post) == pytest.approx(0, abs=1e-9)
+
+    def test_rescale_keeps_ranking_and_matches_rebuild(self):
+
+        posts = [self.create() for _ in range(3)]
+        for count, post in enumerate(posts, start=1):
+            for fan in self.fans[:count]:
+                Like.objects.create(user=fan, post=post)
+        before = [self.score(post) for post in posts]
+        origin = TrendingClock.objects.get().origin
+
+        later = origin + 3 * trending.get_half_life()
+        trending.rescale(now=later)
+
+        after = [self.score(post) for post in posts]
+        factor = math.exp(-trending.get_decay() * (later - origin))
+        assert after == pytest.approx([score * factor for score in before])
+
+        trending.rebuild(chunk_size=2)
+        assert [self.score(post) for post in posts] == pytest.approx(after)
+
+    def test_rescale_command(self):
+
+        post = self.create()
+        Like.objects.create(user=self.fans[0], post=post)
+        TrendingClock.objects.update(origin=time.time() - trending.get_half_life())
+
+        call_command("rescale_trending", "--rebuild")
+
+        assert self.score(post) == pytest.approx(1, rel=1e-3)
+
+    # ----------------------------
+    # Endpoint
+    # ----------------------------
+    def test_endpoint_ranks_readable_posts(self):
+
+        quiet = self.create()
+        popular = self.create()
+        hidden = self.create(privacy_read=Post.PrivacyChoices.TEAM)
+        Like.objects.create(user=self.fans[0], post=quiet)
+        for fan in self.fans:
+            Like.objects.create(user=fan, post=popular)
+        for fan in self.fans[:2]:
+            Like.objects.create(user=fan, post=hidden)
+
+        response = self.client.get(URL)
+
+        assert response.status_code == 200
+        assert [row["id"] for row in response.data] == [popular.id, quiet.id]
+
+        self.client.force_authenticate(self.author)
+        response = self.client.get(f"{URL}?limit=2")
+        assert [row["id"] for row in response.data] == [popular.id, hidden.id]
@@ -0,0 +1,87 @@
+import pytest
+from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from rest_framework.test import APIClient
+
+from posts import viewcounts
+from posts.models import Post
+
+
+def is_update(sql):
+    # The batched write is `WITH v(id, n) AS (VALUES ...) UPDATE ...`; a
+    # plain substring test would also match the "updated_at" column
+    sql = sql.lstrip().upper()
+    return sql.startswith("UPDATE") or (sql.startswith("WITH") and ") UPDATE " in sql)
+
+
+@pytest.fixture
+def counter(view_counter):
+    """
+    The process-wide counter, emptied for each test (see conftest.py).
+    """
+    return view_counter
+
+
+@pytest.mark.django_db
+class TestViewCounts:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        author = get_user_model().objects.create_user(email="author@test.com", password="123")
+        self.post = Post.objects.create(author=author, title="t", content="x", privacy_read="public")
+        self.other = Post.objects.create(author=author, title="o", content="x", privacy_read="public")
+
+    def test_views_are_buffered_until_the_batch_is_full(self, settings, counter):
+
+        settings.POSTS_VIEW_FLUSH_EVENTS = 3
+        settings.POSTS_VIEW_FLUSH_INTERVAL = 3600
+
+        for _ in range(2):
+            assert self.client.get(f"/api/posts/{self.post.id}/").status_code == 200
+        self.post.refresh_from_db()
+        assert self.post.views_count == 0
+
+        self.client.get(f"/api/posts/{self.other.id}/")
+        self.post.refresh_from_db()
+        self.other.refresh_from_db()
+        assert (self.post.views_count, self.other.views_count) == (2, 1)
+        assert self.client.get(f"/api/posts/{self.post.id}/").data["views_count"] == 2
+
+    def test_flush_is_one_statement(self, counter):
+
+        for _ in range(5):
+            counter.record(self.post.id)
+        counter.record(self.other.id)
+
+        with CaptureQueriesContext(connection) as ctx:
+            assert counter.flush() == 6
+
+        updates = [q for q in ctx.captured_queries if is_update(q["sql"])]
+        assert len(updates) == 1
+        assert counter.flush() == 0
+        self.post.refresh_from_db()
+        assert self.post.views_count == 5
+
+    def test_reads_do_not_write(self, settings, counter):
+
+        settings.POSTS_VIEW_FLUSH_EVENTS = 1000
+        settings.POSTS_VIEW_FLUSH_INTERVAL = 3600
+
+        with CaptureQueriesContext(connection) as ctx:
+            self.client.get(f"/api/posts/{self.post.id}/")
+
+        assert not any(is_update(q["sql"]) for q in ctx.captured_queries)
+        assert counter.pending[self.post.id] == 1
+
+    def test_failed_flush_keeps_the_counts(self, counter, monkeypatch):
+
+        def fail(counts):
+            raise RuntimeError("database unavailable")
+
+        monkeypatch.setattr(counter, "write", fail)
+        counter.record(self.post.id)
+
+        assert counter.flush() == 0
+        assert counter.pending[self.post.id] == 1
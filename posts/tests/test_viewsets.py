@@ -1,9 +1,13 @@
 import pytest
 from rest_framework.test import APIClient
 from django.contrib.auth import get_user_model
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from posts.models import Post
 from user.models import Team
+from likes.models import Like
+from comments.models import Comment
 
 @pytest.mark.django_db
 class TestPostAPI:
@@ -205,3 +209,132 @@ class TestPostAPI:
 
         assert response.status_code == 200
         assert response.data["title"] == "Private"
+
+
+@pytest.mark.django_db
+class TestPostListQueries:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+
+        self.team = Team.objects.create(name="Team A")
+        self.author = self.User.objects.create_user(
+            email="author@example.com",
+            password="123",
+            team=self.team
+        )
+        self.reader = self.User.objects.create_user(
+            email="reader@example.com",
+            password="123",
+            team=self.team
+        )
+
+    def create_posts(self, total):
+
+        for i in range(total):
+            post = Post.objects.create(author=self.author, title=f"Post {i}", content="x",
+                                       privacy_read=Post.PrivacyChoices.PUBLIC)
+            Like.objects.create(user=self.reader, post=post)
+            Comment.objects.create(user=self.author, post=post, content="c")
+
+    def count_list_queries(self, page_size):
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/api/posts/?page_size={page_size}")
+        assert response.status_code == 200
+        assert len(response.data["results"]) == page_size
+        return len(ctx.captured_queries)
+
+    def test_query_count_does_not_depend_on_page_size(self):
+
+        self.create_posts(20)
+        self.client.force_authenticate(user=self.reader)
+
+        assert self.count_list_queries(2) == self.count_list_queries(20)
+
+    def test_query_count_anonymous(self):
+
+        self.create_posts(20)
+
+        assert self.count_list_queries(2) == self.count_list_queries(20)
+
+    def test_annotated_values(self):
+
+        self.create_posts(1)
+        other = Post.objects.create(author=self.author, title="Other", content="x")
+        self.client.force_authenticate(user=self.reader)
+
+        response = self.client.get("/api/posts/")
+        rows = {row["id"]: row for row in response.data["results"]}
+
+        liked = rows[Like.objects.get().post_id]
+        assert liked["likes_count"] == 1
+        assert liked["comments_count"] == 1
+        assert liked["is_liked"] is True
+        assert liked["author_team"] == "Team A"
+
+        assert rows[other.id]["likes_count"] == 0
+        assert rows[other.id]["comments_count"] == 0
+        assert rows[other.id]["is_liked"] is False
+
+
+@pytest.mark.django_db
+class TestPostRetrieveQueries:
+
+    def setup_method(self):
+
+        self.client = APIClient()
+        self.User = get_user_model()
+
+        self.team = Team.objects.create(name="Team A")
+        self.author = self.User.objects.create_user(
+            email="author@example.com",
+            password="123",
+            team=self.team
+        )
+        self.reader = self.User.objects.create_user(
+            email="reader@example.com",
+            password="123",
+            team=Team.objects.create(name="Team B")
+        )
+
+    def retrieve(self, post_id):
+
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(f"/api/posts/{post_id}/")
+        return response, len(ctx.captured_queries)
+
+    def test_visible_post_in_one_query(self):
+
+        post = Post.objects.create(author=self.author, title="Public", content="x")
+        Like.objects.create(user=self.reader, post=post)
+        self.client.force_authenticate(user=self.reader)
+
+        response, queries = self.retrieve(post.id)
+
+        assert response.status_code == 200
+        assert queries == 1
+        assert response.data["author_email"] == "author@example.com"
+        assert response.data["author_team"] == "Team A"
+        assert response.data["likes_count"] == 1
+        assert response.data["is_liked"] is True
+
+    def test_hidden_post_is_forbidden_in_one_query(self):
+
+        post = Post.objects.create(author=self.author, title="Team", content="x",
+                                   privacy_read=Post.PrivacyChoices.TEAM)
+        self.client.force_authenticate(user=self.reader)
+
+        response, queries = self.retrieve(post.id)
+
+        assert response.status_code == 403
+        assert queries == 1
+
+    def test_missing_post_in_one_query(self):
+
+        response, queries = self.retrieve(999999)
+
+        assert response.status_code == 404
+        assert queries == 1
@@ -0,0 +1,138 @@
+"""
+Trending posts: score = sum of weight * e^(-lambda * age) over a post's likes
+and comments, with lambda = ln 2 / POSTS_TRENDING_HALF_LIFE.
+
+Every term decays at the same rate, so the ranking never changes with time
+and only new events move it. Scores are therefore stored relative to a fixed
+origin t0 (TrendingClock) as sum of weight * e^(lambda * (t - t0)): an event
+adds its term with one relative UPDATE, and nothing has to be recomputed as
+time passes. Those terms grow with t, so `manage.py rescale_trending` moves
+t0 forward from time to time and shrinks every stored score by the same
+factor before they get anywhere near overflowing a double.
+
+The decayed score at `now` is stored * e^(-lambda * (now - t0)). Run the
+rescale when writes are quiet: an event recorded while it runs may be added
+at the old scale.
+"""
+import math
+import time
+from collections import defaultdict
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import F, Subquery, Value
+from django.db.models.functions import Coalesce, Exp, Greatest
+
+from .models import Post, TrendingClock
+
+CLOCK_PK = 1
+
+# Stored scores below this are rounded to zero when rescaling
+NEGLIGIBLE = 1e-12
+
+
+def get_half_life():
+    return getattr(settings, "POSTS_TRENDING_HALF_LIFE", 6 * 3600)  # seconds
+
+
+def get_weights():
+    return {"like": 1.0, "comment": 2.0, **getattr(settings, "POSTS_TRENDING_WEIGHTS", {})}
+
+
+def get_decay():
+    return math.log(2) / get_half_life()
+
+
+def get_origin():
+    clock, _ = TrendingClock.objects.get_or_create(pk=CLOCK_PK, defaults={"origin": time.time()})
+    return clock.origin
+
+
+# ----------------------------
+# Escritura
+# ----------------------------
+def updated_score(kind, at, sign=1):
+    """
+    Expression for trending_score plus (or with sign=-1 minus) the term of
+    one `kind` event that happened at datetime `at`. The origin is read
+    inside the UPDATE, so the term always matches the stored scale.
+    """
+    decay = get_decay()
+    origin = Coalesce(
+        Subquery(TrendingClock.objects.filter(pk=CLOCK_PK).values("origin")[:1]),
+        Value(time.time()),
+    )
+    term = Value(sign * get_weights()[kind]) * Exp(Value(decay * at.timestamp()) - origin * Value(decay))
+    return Greatest(F("trending_score") + term, Value(0.0))
+
+
+def rescale(now=None):
+    """
+    Move the origin to `now` and shrink every stored score to match.
+    Returns the number of posts rescaled.
+    """
+    now = time.time() if now is None else now
+    with transaction.atomic():
+        clock, _ = TrendingClock.objects.select_for_update().get_or_create(
+            pk=CLOCK_PK, defaults={"origin": now}
+        )
+        factor = math.exp(-get_decay() * (now - clock.origin))
+
+        negligible = Post.objects.filter(trending_score__gt=0)
+        if factor > 0:
+            negligible = negligible.filter(trending_score__lt=NEGLIGIBLE / factor)
+        negligible.update(trending_score=0)
+
+        rescaled = Post.objects.filter(trending_score__gt=0).update(
+            trending_score=F("trending_score") * factor
+        )
+
+        clock.origin = now
+        clock.save(update_fields=["origin"])
+    return rescaled
+
+
+def rebuild(chunk_size=1000):
+    """
+    Recompute every stored score from the likes and comments tables, one
+    primary-key chunk of posts per transaction. Returns the number of posts.
+    """
+    from comments.models import Comment
+    from likes.models import Like
+
+    decay = get_decay()
+    weights = get_weights()
+    processed = 0
+    last_pk = 0
+
+    while True:
+        chunk = list(
+            Post.objects.filter(pk__gt=last_pk)
+            .order_by("pk")
+            .values_list("pk", flat=True)[:chunk_size]
+        )
+        if not chunk:
+            return processed
+        last_pk = chunk[-1]
+
+        with transaction.atomic():
+            origin = get_origin()
+            scores = defaultdict(float)
+            for kind, model in (("like", Like), ("comment", Comment)):
+                for post_id, created_at in model.objects.filter(post_id__in=chunk).values_list("post_id", "created_at"):
+                    scores[post_id] += weights[kind] * math.exp(decay * (created_at.timestamp() - origin))
+
+            posts = [Post(pk=pk, trending_score=scores.get(pk, 0.0)) for pk in chunk]
+            Post.objects.bulk_update(posts, ["trending_score"])
+        processed += len(chunk)
+
+
+# ----------------------------
+# Lectura
+# ----------------------------
+def top(queryset, limit):
+    """
+    The `limit` highest scored posts of `queryset`, read along
+    post_trending_idx.
+    """
+    return queryset.filter(trending_score__gt=0).order_by("-trending_score", "-id")[:limit]
@@ -1,14 +1,22 @@
+from django.urls import path
 from rest_framework_nested import routers
-from posts.viewsets import PostViewSet
+from posts.viewsets import FeedViewSet, PostViewSet
+from comments.views import comment_stream
 from comments.viewsets import CommentViewSet
 from likes.viewsets import LikeViewSet
 
 router = routers.DefaultRouter()
 router.register(r'posts', PostViewSet, basename='posts')
+router.register(r'feed', FeedViewSet, basename='feed')
 
 # Nested routers
 posts_router = routers.NestedDefaultRouter(router, r'posts', lookup='post')
 posts_router.register(r'comments', CommentViewSet, basename='post-comments')
 posts_router.register(r'likes', LikeViewSet, basename='post-likes')
 
-urlpatterns = router.urls + posts_router.urls
+# Before the nested routes, whose comment detail pattern would match "stream"
+stream_urls = [
+    path('posts/<int:post_pk>/comments/stream/', comment_stream, name='post-comments-stream'),
+]
+
+urlpatterns = stream_urls + router.urls + posts_router.urls
@@ -0,0 +1,144 @@
+"""
+Buffered post view counts.
+
+`GET /api/posts/{id}/` must stay a read, so a view is only added to an
+in-process tally (a dict increment under a lock). The tally is written
+with one multi-row statement per batch:
+
+    WITH v(id, n) AS (VALUES (id, n), ...)
+    UPDATE posts_post SET views_count = posts_post.views_count + v.n
+    FROM v WHERE posts_post.id = v.id
+
+A flush happens at the end of a request (after the response is built,
+from the `request_finished` signal) once POSTS_VIEW_FLUSH_EVENTS views are
+pending or POSTS_VIEW_FLUSH_INTERVAL seconds have passed since the last
+one, and when the worker process exits. Counts still in memory when a
+worker dies abruptly are lost; views_count is an approximate metric.
+"""
+import atexit
+import logging
+import threading
+import time
+from collections import Counter
+
+from django.conf import settings
+from django.db import connections, router, transaction
+from django.db.models import F
+
+logger = logging.getLogger(__name__)
+
+BATCH_SIZE = 500
+
+
+def is_enabled():
+    return getattr(settings, "POSTS_VIEW_COUNTER_ENABLED", True)
+
+
+def get_flush_interval():
+    return getattr(settings, "POSTS_VIEW_FLUSH_INTERVAL", 10)
+
+
+def get_flush_events():
+    return getattr(settings, "POSTS_VIEW_FLUSH_EVENTS", 1000)
+
+
+def write_counts(counts):
+    """
+    Add {post id: views} to views_count, BATCH_SIZE posts per statement.
+    """
+    from .models import Post
+
+    connection = connections[router.db_for_write(Post)]
+    items = sorted(counts.items())
+
+    if connection.vendor not in ("postgresql", "sqlite"):
+        with transaction.atomic(using=connection.alias):
+            for pk, views in items:
+                Post.objects.filter(pk=pk).update(views_count=F("views_count") + views)
+        return
+
+    table = connection.ops.quote_name(Post._meta.db_table)
+    with transaction.atomic(using=connection.alias), connection.cursor() as cursor:
+        for start in range(0, len(items), BATCH_SIZE):
+            batch = items[start:start + BATCH_SIZE]
+            values = ", ".join(["(CAST(%s AS BIGINT), CAST(%s AS INTEGER))"] * len(batch))
+            # The CTE form of UPDATE ... FROM (VALUES ...) also runs on SQLite
+            cursor.execute(
+                f"WITH v(id, n) AS (VALUES {values}) "
+                f"UPDATE {table} SET views_count = {table}.views_count + v.n "
+                f"FROM v WHERE {table}.id = v.id",
+                [value for item in batch for value in item],
+            )
+
+
+class ViewCounter:
+    """
+    Per-process tally of post views, flushed in batches by `write`.
+    """
+
+    def __init__(self, write=write_counts):
+        self.write = write
+        self.lock = threading.Lock()
+        self.pending = Counter()
+        self.events = 0
+        self.last_flush = time.monotonic()
+
+    def reset(self):
+        """
+        Drop the pending counts without writing them.
+        """
+        with self.lock:
+            self.pending = Counter()
+            self.events = 0
+            self.last_flush = time.monotonic()
+
+    def record(self, post_id):
+        with self.lock:
+            self.pending[post_id] += 1
+            self.events += 1
+
+    def is_due(self):
+        if not self.events:
+            return False
+        return (
+            self.events >= get_flush_events()
+            or time.monotonic() - self.last_flush >= get_flush_interval()
+        )
+
+    def flush(self):
+        """
+        Write and clear the pending counts; returns how many views were
+        written. On failure the counts are put back for the next flush.
+        """
+        with self.lock:
+            pending, self.pending = self.pending, Counter()
+            self.events = 0
+            self.last_flush = time.monotonic()
+        if not pending:
+            return 0
+
+        try:
+            self.write(pending)
+        except Exception:
+            logger.exception("Could not write %d post view counts", len(pending))
+            with self.lock:
+                self.pending.update(pending)
+                self.events += sum(pending.values())
+            return 0
+        return sum(pending.values())
+
+    def flush_if_due(self, *args, **kwargs):
+        # Usable directly as a request_finished receiver
+        if self.is_due():
+            self.flush()
+
+
+counter = ViewCounter()
+
+
+def record(post_id):
+    if is_enabled():
+        counter.record(post_id)
+
+
+atexit.register(counter.flush)
@@ -1,7 +1,9 @@
-from rest_framework import viewsets, status
+from rest_framework import mixins, viewsets, status
+from rest_framework.decorators import action
 from rest_framework.response import Response
-from rest_framework.permissions import IsAuthenticatedOrReadOnly
-from django.db.models import Q
+from rest_framework.permissions import IsAuthenticated, IsAuthenticatedOrReadOnly
+from django.db.models import Exists, OuterRef, Value
+from django.db.models.functions import Substr
 
 from drf_spectacular.utils import (
     extend_schema_view,
@@ -10,14 +12,87 @@ from drf_spectacular.utils import (
     OpenApiParameter,
 )
 
+from . import cache as post_list_cache
+from .asyncviews import AsyncReadMixin
+from . import embed, feed, policy, search, viewcounts
+from . import trending as trending_scores
+from .bulk import BulkPostMixin
+from .conditional import ConditionalGetMixin, make_etag
+from .filters import (
+    ChoiceParam,
+    IntegerParam,
+    QueryParamFilterBackend,
+    TeamNameParam,
+    created_range,
+)
 from .pagination import PostPagination
 from .models import Post
 from .serializers import (
     PostSerializer,
+    PostListSerializer,
     PostWriteSerializer,
     PostValidationErrorSerializer,
+    SparseFieldsMixin,
 )
 from .permissions import CanReadPost, CanEditPost
+from likes.models import Like
+
+
+class PostAnnotationMixin:
+    """
+    Loads posts the way the post serializers read them, plus the
+    `?embed=` rows of list pages; shared by PostViewSet and FeedViewSet.
+    """
+
+    def annotate_queryset(self, queryset):
+        """
+        Load everything PostSerializer needs in the same statement:
+        author and team through joins and `is_liked` as an annotation.
+        Like/comment counts are stored columns on Post.
+        """
+        user = self.request.user
+
+        if user.is_authenticated:
+            is_liked = Exists(Like.objects.filter(post=OuterRef("pk"), user=user))
+        else:
+            is_liked = Value(False)
+
+        queryset = queryset.select_related("author__team").annotate(is_liked=is_liked)
+
+        # Keep large TEXT columns in the database when the response won't show
+        # them: the excerpt is cut in SQL and `content` is deferred.
+        serializer_class = self.get_serializer_class()
+        if not issubclass(serializer_class, SparseFieldsMixin):
+            return queryset
+
+        if not serializer_class.includes_field(self.request, "content"):
+            queryset = queryset.defer("content")
+            if serializer_class.includes_field(self.request, "excerpt"):
+                queryset = queryset.annotate(excerpt_text=Substr("content", 1, 200))
+
+        return queryset
+
+    # ----------------------------
+    # ?embed=comments:N,likers:M
+    # ----------------------------
+    def get_embeds(self):
+        if self.action != "list":
+            return {}
+        return embed.parse(self.request)
+
+    def paginate_queryset(self, queryset):
+        embeds = self.get_embeds()
+        page = super().paginate_queryset(queryset)
+        if page is not None and embeds:
+            embed.attach(page, embeds)
+        return page
+
+    async def apaginate_queryset(self, queryset):
+        embeds = self.get_embeds()
+        page = await super().apaginate_queryset(queryset)
+        if page is not None and embeds:
+            await embed.aattach(page, embeds)
+        return page
 
 
 @extend_schema_view(
@@ -28,27 +103,56 @@ from .permissions import CanReadPost, CanEditPost
             "read access to based on post permissions."
         ),
         parameters=[
-            OpenApiParameter(name="id", type=int, description="Filter by post ID"),
-            OpenApiParameter(name="author", type=int, description="Filter by author ID"),
-            OpenApiParameter(name="team", type=str, description="Filter by author team"),
             OpenApiParameter(
-                name="privacy_read",
+                name="q",
                 type=str,
-                description="Filter by read permission level",
+                description=(
+                    "Full-text search over title and content, best matches first. "
+                    "With pagination=cursor results are ordered newest first instead."
+                ),
             ),
             OpenApiParameter(
-                name="privacy_write",
+                name="fields",
                 type=str,
-                description="Filter by write permission level",
+                description="Comma-separated fields to return (add 'content' to get the full body)",
+            ),
+            OpenApiParameter(name="omit", type=str, description="Comma-separated fields to leave out"),
+            OpenApiParameter(
+                name="pagination",
+                type=str,
+                enum=["page", "cursor"],
+                description="Use 'cursor' for keyset pagination (no count, constant cost per page)",
+            ),
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                description="Opaque cursor taken from the 'next'/'previous' links",
+            ),
+            OpenApiParameter(
+                name="embed",
+                type=str,
+                description=(
+                    "Include each post's latest comments and likes, e.g. "
+                    "'comments:3,likers:5' (up to 10 each). Adds recent_comments "
+                    "and recent_likers to every post, loaded in one query per embed."
+                ),
             ),
         ],
-        responses={200: PostSerializer(many=True)},
+        responses={200: PostListSerializer(many=True)},
     ),
     retrieve=extend_schema(
         summary="Retrieve a blog post",
-        description="Retrieve a single blog post if the user has read access.",
+        description=(
+            "Retrieve a single blog post if the user has read access. "
+            "Visibility, author, team, counts and is_liked come from one query."
+        ),
+        parameters=[
+            OpenApiParameter(name="fields", type=str, description="Comma-separated fields to return"),
+            OpenApiParameter(name="omit", type=str, description="Comma-separated fields to leave out"),
+        ],
         responses={
             200: PostSerializer,
+            403: OpenApiResponse(description="Permission denied"),
             404: OpenApiResponse(description="Post not found"),
         },
     ),
@@ -93,7 +197,7 @@ from .permissions import CanReadPost, CanEditPost
     ),
 )
 
-class PostViewSet(viewsets.ModelViewSet):
+class PostViewSet(PostAnnotationMixin, AsyncReadMixin, BulkPostMixin, ConditionalGetMixin, viewsets.ModelViewSet):
     """
     API endpoints for managing blog posts with fine-grained read and write permissions.
     """
@@ -101,16 +205,37 @@ class PostViewSet(viewsets.ModelViewSet):
     queryset = Post.objects.all()
     pagination_class = PostPagination
 
+    # ----------------------------
+    # Filtros (?id=, ?author=, ?team=, ... y ?ordering=)
+    # ----------------------------
+    filter_backends = [QueryParamFilterBackend]
+    filter_params = {
+        "id": IntegerParam("id", "Filter by post ID"),
+        "author": IntegerParam("author_id", "Filter by author ID"),
+        "team": TeamNameParam("author_team_id", "Filter by author team name"),
+        "privacy_read": ChoiceParam("privacy_read", Post.PrivacyChoices.values, "Filter by read permission level"),
+        "privacy_write": ChoiceParam("privacy_write", Post.PrivacyChoices.values, "Filter by write permission level"),
+        **created_range(),
+    }
+    # Each ordering matches post_created_id_idx / post_trending_idx
+    ordering_columns = {
+        "created_at": ("created_at", "id"),
+        "trending": ("trending_score", "id"),
+    }
+
     # ----------------------------
     # Permisos
     # ----------------------------
     action_permissions = {
         "list": [CanReadPost()],
         "retrieve": [CanReadPost()],
+        "trending": [CanReadPost()],
         "create": [IsAuthenticatedOrReadOnly()],
         "update": [IsAuthenticatedOrReadOnly(), CanEditPost()],
         "partial_update": [IsAuthenticatedOrReadOnly(), CanEditPost()],
         "destroy": [IsAuthenticatedOrReadOnly(), CanEditPost()],
+        # Per-item edit checks run inside the action, in one query
+        "bulk": [IsAuthenticated()],
     }
 
     def get_permissions(self):
@@ -120,9 +245,12 @@ class PostViewSet(viewsets.ModelViewSet):
     # Serializers
     # ----------------------------
     action_serializers = {
+        "list": PostListSerializer,
+        "trending": PostListSerializer,
         "create": PostWriteSerializer,
         "update": PostWriteSerializer,
         "partial_update": PostWriteSerializer,
+        "bulk": PostWriteSerializer,
     }
 
     def get_serializer_class(self):
@@ -131,41 +259,242 @@ class PostViewSet(viewsets.ModelViewSet):
     # ----------------------------
     # Queryset
     # ----------------------------
-    def get_queryset(self):
-        user = self.request.user
+    def get_visible_queryset(self):
+        """
+        Posts the user may see (for list), without ordering, joins or
+        annotations. Query param filters are applied by filter_backends.
+        """
         queryset = Post.objects.all()
 
-        if self.action == "list":
-            if user.is_staff:
-                queryset = Post.objects.all()
-            elif not user.is_authenticated:
-                queryset = queryset.filter(privacy_read=Post.PrivacyChoices.PUBLIC)
-            else:
-                queryset = Post.objects.filter(
-                    Q(privacy_read=Post.PrivacyChoices.PUBLIC)
-                    | Q(privacy_read=Post.PrivacyChoices.AUTHENTICATED)
-                    | Q(privacy_read=Post.PrivacyChoices.AUTHOR, author=user)
-                    | Q(privacy_read=Post.PrivacyChoices.TEAM, author__team=user.team)
-                ).distinct()
-
-        # ----------------------------
-        # Filtros por query params
-        # ----------------------------
-        param_map = {
-            "id": "id",
-            "author": "author_id",
-            "team": "author__team__name",
-            "privacy_read": "privacy_read",
-            "privacy_write": "privacy_write",
-            "created_from": "created_at__date__gte",
-            "created_to": "created_at__date__lte",
-        }
-
-        for param, field in param_map.items():
-            if param in self.request.query_params:
-                queryset = queryset.filter(**{field: self.request.query_params[param]})
-
-        return queryset.order_by("-created_at")
+        # Staff list every post, as before the policy module; retrieve and
+        # the other checks still go through posts.policy
+        if self.action in ("list", "trending") and not self.request.user.is_staff:
+            # One indexed filter per audience branch, compiled by posts.policy
+            queryset = policy.READ.filter(queryset, self.request.user)
+
+        return queryset
+
+    def get_queryset(self):
+        queryset = self.annotate_queryset(self.get_visible_queryset())
+
+        # Retrieve decides visibility in the statement that loads the post,
+        # so CanReadPost answers 403 from the `can_read` column.
+        if self.action == "retrieve":
+            return queryset.annotate(can_read=policy.READ.expression(self.request.user))
+
+        # Whether the user has posts only they can list picks the list
+        # cache entry; found out by the page query instead of another one
+        if self.checks_own_posts():
+            queryset = queryset.annotate(
+                own_restricted=Exists(post_list_cache.own_restricted_posts(self.request.user)),
+            )
+
+        # Full-text search runs on the already visibility-filtered queryset
+        text = self.request.query_params.get("q", "").strip()
+        if text:
+            return search.search(queryset, text).order_by("-search_rank", "-created_at", "-id")
+
+        return queryset.order_by("-created_at", "-id")
+
+    # ----------------------------
+    # Validadores HTTP (ETag / Last-Modified)
+    # ----------------------------
+    def get_shared_row_version(self, obj):
+        version = (
+            obj.pk,
+            obj.updated_at.isoformat(),
+            obj.likes_count,
+            obj.comments_count,
+            # views_count is left out: each batched flush would otherwise
+            # invalidate every client's copy of popular posts
+        )
+        # ?embed= rows, as serialized: an edited comment, or a like swapped
+        # for another, leaves the counts alone
+        embedded = getattr(obj, "embedded", None)
+        if embedded:
+            version += (sorted(embedded.items()),)
+        return version
+
+    def get_row_version(self, obj):
+        return (*self.get_shared_row_version(obj), getattr(obj, "is_liked", None))
+
+    def get_list_validators(self, rows, page_state):
+        # The shared ETag is what the list cache stores for the whole
+        # audience; the user's liked ids on the page make it personal
+        self.shared_etag = make_etag(
+            sorted(self.request.query_params.lists()),
+            page_state,
+            [self.get_shared_row_version(row) for row in rows],
+        )
+        if rows:
+            self.own_restricted_seen = getattr(rows[0], "own_restricted", None)
+        liked = [row.pk for row in rows if getattr(row, "is_liked", False)] if self.lists_likes() else []
+        return self.get_personal_etag(self.shared_etag, liked), self.get_last_modified()
+
+    def get_personal_etag(self, shared_etag, liked_ids):
+        return make_etag(shared_etag, sorted(liked_ids))
+
+    def get_object_response(self, request, instance):
+        # Counted in memory; written in batches by posts.viewcounts
+        viewcounts.record(instance.pk)
+        return super().get_object_response(request, instance)
+
+    # ----------------------------
+    # Listado (cacheado por audiencia)
+    # ----------------------------
+    list_cache_key = None
+    list_generation = None
+    list_entry = None
+    own_restricted_seen = None
+
+    def lists_likes(self):
+        return self.request.user.is_authenticated and PostListSerializer.includes_field(self.request, "is_liked")
+
+    def can_cache_list(self):
+        # is_liked is filled in by post id on a hit
+        return not self.lists_likes() or PostListSerializer.includes_field(self.request, "id")
+
+    def caches_list(self):
+        return self.action == "list" and post_list_cache.is_enabled() and self.can_cache_list()
+
+    def get_list_generation(self):
+        # Read once, before the rows: a write racing with this request
+        # moves the generation past the stored entry
+        if self.list_generation is None:
+            self.list_generation = post_list_cache.get_generation()
+        return self.list_generation
+
+    def get_own_restricted(self):
+        if not post_list_cache.is_member(self.request.user):
+            return False
+        return post_list_cache.get_own_restricted(self.request.user)
+
+    def get_list_cache_key(self, request):
+        """
+        None while it is unknown whether the user has posts only they can
+        list (see get_list_entry).
+        """
+        own_restricted = self.get_own_restricted()
+        if own_restricted is None:
+            return None
+        return post_list_cache.make_key(request, self.get_list_generation(), own_restricted)
+
+    def checks_own_posts(self):
+        return self.caches_list() and self.get_own_restricted() is None
+
+    def list(self, request, *args, **kwargs):
+        if not self.caches_list():
+            return super().list(request, *args, **kwargs)
+
+        entry = self.get_list_entry(request)
+        if entry is not None:
+            return self.get_cached_response(request, entry, self.get_liked_ids(entry))
+        return self.store_list(super().list(request, *args, **kwargs))
+
+    def prepare_read(self, request, *args, **kwargs):
+        super().prepare_read(request, *args, **kwargs)
+        # The lookup may query (get_list_entry), so not from the event loop
+        if self.caches_list():
+            self.list_entry = self.get_list_entry(request)
+
+    async def alist(self, request, *args, **kwargs):
+        if not self.caches_list():
+            return await super().alist(request, *args, **kwargs)
+
+        entry = self.list_entry
+        if entry is not None:
+            return self.get_cached_response(request, entry, await self.aget_liked_ids(entry))
+        return self.store_list(await super().alist(request, *args, **kwargs))
+
+    def get_list_entry(self, request):
+        """
+        A user whose own-posts flag is unknown may still be served the
+        shared entry, after one EXISTS query; without an entry to serve,
+        the page query finds the flag out instead (see get_queryset).
+        """
+        self.list_cache_key = self.get_list_cache_key(request)
+        if self.list_cache_key is None:
+            shared_key = post_list_cache.make_key(request, self.get_list_generation())
+            if not post_list_cache.has_entry(shared_key):
+                post_list_cache.count_miss()
+                return None
+            own_restricted = post_list_cache.own_restricted_posts(request.user).exists()
+            post_list_cache.set_own_restricted(request.user, own_restricted)
+            self.list_cache_key = self.get_list_cache_key(request)
+        return post_list_cache.get_cached(self.list_cache_key)
+
+    def liked_ids_query(self, entry):
+        ids = [row["id"] for row in post_list_cache.result_rows(entry["data"])]
+        if not ids or not self.lists_likes():
+            return None
+        return Like.objects.filter(user=self.request.user, post_id__in=ids).values_list("post_id", flat=True)
+
+    def get_liked_ids(self, entry):
+        query = self.liked_ids_query(entry)
+        return set(query) if query is not None else set()
+
+    async def aget_liked_ids(self, entry):
+        query = self.liked_ids_query(entry)
+        return {pk async for pk in query} if query is not None else set()
+
+    def get_cached_response(self, request, entry, liked_ids):
+        etag = self.get_personal_etag(entry["etag"], liked_ids)
+        last_modified = entry["last_modified"]
+        response = self.get_not_modified_response(request, etag, last_modified)
+        if response is None:
+            data = entry["data"]
+            if liked_ids:
+                data = post_list_cache.with_likes(data, liked_ids)
+            response = self.set_validator_headers(Response(data), etag, last_modified)
+        response["X-Cache"] = "HIT"
+        return response
+
+    def store_list(self, response):
+        if response.status_code == status.HTTP_200_OK:
+            if self.list_cache_key is None and self.own_restricted_seen is not None:
+                post_list_cache.set_own_restricted(self.request.user, self.own_restricted_seen)
+                self.list_cache_key = self.get_list_cache_key(self.request)
+            if self.list_cache_key is not None:
+                _, last_modified = self.list_validators
+                post_list_cache.store(self.list_cache_key, {
+                    "etag": self.shared_etag,
+                    "last_modified": last_modified,
+                    # Shared by the audience: is_liked is filled in per request
+                    "data": post_list_cache.with_likes(response.data, ()),
+                })
+        response["X-Cache"] = "MISS"
+        return response
+
+    # ----------------------------
+    # Tendencias
+    # ----------------------------
+    trending_default_limit = 10
+    trending_max_limit = 50
+
+    @extend_schema(
+        summary="Trending posts",
+        description=(
+            "Readable posts with the highest time-decayed like/comment score, "
+            "best first. Each like and comment counts less as it ages "
+            "(half-life POSTS_TRENDING_HALF_LIFE)."
+        ),
+        parameters=[
+            OpenApiParameter(name="limit", type=int, description="Number of posts (default 10, max 50)"),
+        ],
+        responses={200: PostListSerializer(many=True)},
+    )
+    @action(detail=False, methods=["get"], url_path="trending")
+    def trending(self, request, *args, **kwargs):
+        try:
+            limit = int(request.query_params.get("limit", self.trending_default_limit))
+        except ValueError:
+            limit = self.trending_default_limit
+        limit = min(max(limit, 1), self.trending_max_limit)
+
+        queryset = self.filter_queryset(self.annotate_queryset(self.get_visible_queryset()))
+        posts = trending_scores.top(queryset, limit)
+        serializer = self.get_serializer(posts, many=True)
+        return Response(serializer.data)
 
     # ----------------------------
     # Crear post
@@ -182,3 +511,49 @@ class PostViewSet(viewsets.ModelViewSet):
             context={'request': request}  
     )
         return Response(response_serializer.data, status=status.HTTP_201_CREATED)
+
+
+@extend_schema_view(
+    list=extend_schema(
+        summary="Timeline of readable posts",
+        description=(
+            "Posts the current user may read, newest first: public and "
+            "authenticated posts, their own posts and their team's posts, "
+            "merged from indexed range scans. Paginated with opaque cursors."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="cursor",
+                type=str,
+                description="Opaque cursor taken from the 'next'/'previous' links",
+            ),
+            OpenApiParameter(
+                name="embed",
+                type=str,
+                description=(
+                    "Include each post's latest comments and likes, e.g. "
+                    "'comments:3,likers:5' (up to 10 each). Adds recent_comments "
+                    "and recent_likers to every post, loaded in one query per embed."
+                ),
+            ),
+        ],
+        responses={
+            200: PostListSerializer(many=True),
+            403: OpenApiResponse(description="Authentication required"),
+        },
+    ),
+)
+class FeedViewSet(PostAnnotationMixin, mixins.ListModelMixin, viewsets.GenericViewSet):
+    """
+    `/api/feed/`: the authenticated timeline, built from the team feed table
+    (posts.feed) instead of filtering the whole posts table.
+    """
+
+    serializer_class = PostListSerializer
+    pagination_class = feed.FeedPagination
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        # Visibility is decided by the feed streams; this only loads the page
+        return self.annotate_queryset(Post.objects.all())
+